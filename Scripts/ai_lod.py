@@ -0,0 +1,111 @@
+# Nivel de detalle (LOD) de la IA según la distancia al jugador - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+from scripts.config import Config
+
+class LODBand:
+    """
+    Banda de distancia con sus frecuencias de actualización
+    """
+    
+    def __init__(self, distance, behavior_rate, path_rate, move_interval):
+        self.distance = distance            # Distancia máxima al jugador (píxeles)
+        self.behavior_rate = behavior_rate  # Segundos entre ticks del árbol
+        self.path_rate = path_rate          # Antigüedad mínima del camino para pedir otro
+        self.move_interval = move_interval  # Segundos entre actualizaciones y pasos de movimiento (0 = cada frame)
+
+class AILevelOfDetail:
+    """
+    Asigna a cada enemigo una banda de distancia al jugador
+    
+    Los enemigos lejanos (por ejemplo los que acaban de aparecer fuera de la
+    pantalla) evalúan su árbol, piden caminos y mueven su posición con menos
+    frecuencia; la primera banda usa las frecuencias normales, así que los
+    enemigos cercanos se comportan igual que sin LOD. Para no saltar de una
+    banda a otra en cada frame cerca del borde, un enemigo solo cambia de
+    banda cuando pasa el límite por más de hysteresis píxeles.
+    
+    Las bandas se recalculan cada update_rate segundos y los enemigos nuevos
+    reciben la suya en cuanto se registran.
+    """
+    
+    def __init__(self, bands=None, hysteresis=None, update_rate=None):
+        self.bands = [LODBand(*band) for band in (bands or Config.AI_LOD_BANDS)]
+        self.hysteresis = Config.AI_LOD_HYSTERESIS if hysteresis is None else hysteresis
+        self.update_rate = Config.AI_LOD_UPDATE_RATE if update_rate is None else update_rate
+        self.timer = 0.0
+        
+        # Estadísticas
+        self.counts = [0] * len(self.bands)  # Enemigos en cada banda (última actualización)
+        self.changes = 0                     # Cambios de banda
+    
+    def update(self, dt, enemies, player_pos):
+        """
+        Recalcula las bandas si ya pasó update_rate
+        """
+        self.timer += dt
+        if self.timer < self.update_rate:
+            return
+        self.timer = 0.0
+        
+        counts = [0] * len(self.bands)
+        for enemy in enemies:
+            band = self.band_for(enemy, player_pos)
+            if band != enemy.lod_band:
+                if enemy.lod_band is not None:
+                    self.changes += 1
+                self.apply(enemy, band)
+            counts[band] += 1
+        self.counts = counts
+    
+    def register(self, enemy, player_pos):
+        """
+        Banda inicial de un enemigo nuevo (sin histéresis)
+        """
+        band = self.band_for(enemy, player_pos)
+        self.apply(enemy, band)
+        self.counts[band] += 1
+    
+    def band_for(self, enemy, player_pos):
+        """
+        Banda que le toca al enemigo según su distancia y su banda actual
+        """
+        dx = player_pos[0] - enemy.rect.centerx
+        dy = player_pos[1] - enemy.rect.centery
+        distance = (dx*dx + dy*dy) ** 0.5
+        bands = self.bands
+        last = len(bands) - 1
+        current = enemy.lod_band
+        
+        if current is None:
+            current = 0
+            while current < last and distance > bands[current].distance:
+                current += 1
+            return current
+        
+        hysteresis = self.hysteresis
+        while current < last and distance > bands[current].distance + hysteresis:
+            current += 1
+        while current > 0 and distance < bands[current - 1].distance - hysteresis:
+            current -= 1
+        return current
+    
+    def apply(self, enemy, index):
+        """
+        Pasa al enemigo a la banda index
+        """
+        band = self.bands[index]
+        enemy.lod_band = index
+        enemy.behavior_rate = band.behavior_rate
+        enemy.path_rate = band.path_rate
+        enemy.move_interval = band.move_interval
+    
+    def get_stats(self):
+        """
+        Devuelve los enemigos por banda y los cambios de banda
+        """
+        return {
+            'bands': list(self.counts),
+            'changes': self.changes
+        }
\ No newline at end of file
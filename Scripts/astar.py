@@ -2,8 +2,10 @@
 # Autor: Hensly Manuel Vidal Rosario
 # Matrícula: 23-MISN-2-007
 
+import heapq
 import math
 from scripts.config import Config
+from scripts.line_of_sight import Raycaster
 
 class Node:
     """
@@ -23,13 +25,70 @@ class Node:
     def __lt__(self, other):
         return self.f < other.f
 
+class SearchWorkspace:
+    """
+    Arreglos planos (g, padre, orden, marcas) indexados por y * width + x
+    
+    En lugar de limpiar los arreglos en cada búsqueda se usa un identificador
+    de búsqueda: una casilla solo es válida si su marca coincide con él.
+    """
+    
+    def __init__(self):
+        self.size = 0
+        self.g = []
+        self.parent = []
+        self.order = []
+        self.visited = []
+        self.closed = []
+        self.search_id = 0
+    
+    def prepare(self, size):
+        """
+        Prepara los arreglos para una nueva búsqueda y devuelve su identificador
+        """
+        if self.size != size:
+            self.size = size
+            self.g = [0.0] * size
+            self.parent = [-1] * size
+            self.order = [0] * size
+            self.visited = [0] * size
+            self.closed = [0] * size
+            self.search_id = 0
+        self.search_id += 1
+        return self.search_id
+
 class AStar:
     """
     Implementación del algoritmo A* desde cero
     """
     
-    def __init__(self):
+    # 8 direcciones posibles (en el orden en que se exploran los vecinos)
+    DIRECTIONS = (
+        (-1, -1), (-1, 0), (-1, 1),
+        (0, -1),           (0, 1),
+        (1, -1),  (1, 0),  (1, 1)
+    )
+    
+    # Variantes de búsqueda disponibles
+    MODES = ("astar", "jps", "theta")
+    
+    def __init__(self, cache=None, mode=None):
         self.grid_size = Config.TILE_SIZE
+        self.mode = mode or Config.PATHFINDING_MODE
+        if self.mode not in self.MODES:
+            raise ValueError(f"Modo de pathfinding desconocido: {self.mode}")
+        self.cache = cache  # PathCache opcional delante de find_path
+        self.nodes_expanded = 0  # Nodos expandidos en la última búsqueda
+        self.goals_rejected = 0  # Objetivos inalcanzables descartados sin buscar
+        self.goals_snapped = 0   # Objetivos movidos a la casilla alcanzable más cercana
+        self.raycaster = Raycaster(self.grid_size)
+        
+        # Estado plano para find_path, reutilizado entre llamadas
+        self.workspace = SearchWorkspace()
+        self._open_grid = bytearray()
+        self._padded = bytearray()
+        self._padded_key = None
+        self._padded_source = None
     
     def heuristic(self, pos1, pos2):
         """
@@ -46,14 +105,7 @@ class AStar:
         x, y = position
         neighbors = []
         
-        # 8 direcciones posibles
-        directions = [
-            (-1, -1), (-1, 0), (-1, 1),
-            (0, -1),           (0, 1),
-            (1, -1),  (1, 0),  (1, 1)
-        ]
-        
-        for dx, dy in directions:
+        for dx, dy in self.DIRECTIONS:
             new_x = x + dx * self.grid_size
             new_y = y + dy * self.grid_size
             
@@ -98,123 +150,1002 @@ class AStar:
     
     def find_path(self, start, goal, game_map=None):
         """
-        Encuentra el camino más corto usando A*
+        Encuentra el camino más corto usando A* (o JPS si mode="jps")
+        
+        La lista abierta es un heap binario con decrease-key perezoso y el estado
+        de cada casilla (g, padre, cerrado) vive en arreglos planos indexados por
+        y * width + x. Los empates se resuelven por orden de inserción, igual que
+        la versión original basada en listas, así que los caminos son idénticos.
+        """
+        if self.cache:
+            path = self.cache.get(start, goal, game_map)
+            if path is not None:
+                self.nodes_expanded = 0
+                return path
+        
+        search = self.create_search(start, goal, game_map, self.workspace)
+        path = search.run()
+        self.nodes_expanded = search.nodes_expanded
+        
+        if self.cache:
+            self.cache.put(start, goal, game_map, path)
+        return path
+    
+    def start_search(self, start, goal, game_map=None, workspace=None):
+        """
+        Crea una búsqueda incremental que se puede avanzar por partes con step()
+        
+        Cada búsqueda pendiente necesita su propio SearchWorkspace; si no se
+        indica uno se crea uno nuevo.
+        """
+        return self.create_search(start, goal, game_map, workspace or SearchWorkspace())
+    
+    def create_search(self, start, goal, game_map, workspace):
+        """
+        Crea la búsqueda según el modo ("astar" clásico, "jps" o "theta")
+        """
+        if self.mode == "jps":
+            return JumpPointSearch(self, start, goal, game_map, workspace)
+        if self.mode == "theta":
+            return ThetaStarSearch(self, start, goal, game_map, workspace)
+        return AStarSearch(self, start, goal, game_map, workspace)
+    
+    def resolve_goal(self, start_tile, goal_tile, game_map=None):
         """
+        Revisa con las componentes conexas del mapa si el objetivo es alcanzable
+        
+        Retorna la casilla objetivo a usar: la misma, la alcanzable más cercana
+        (si Config.PATHFINDING_SNAP_GOAL) o None si no hay camino posible.
+        Sin información de componentes el objetivo se deja igual.
+        """
+        if not game_map or not hasattr(game_map, "components"):
+            return goal_tile
+        if start_tile == goal_tile or game_map.is_reachable(start_tile, goal_tile):
+            return goal_tile
+        
+        if Config.PATHFINDING_SNAP_GOAL:
+            snapped = game_map.nearest_reachable(start_tile, goal_tile)
+            if snapped is not None:
+                self.goals_snapped += 1
+                return snapped
+        self.goals_rejected += 1
+        return None
+    
+    def get_padded_grid(self, game_map=None):
+        """
+        Devuelve la rejilla de transitabilidad con un borde de obstáculos
+        alrededor, (width + 2) x (height + 2), para saltar sin comprobar límites
+        """
+        width, height, walkable = self.get_grid(game_map)
+        key = (getattr(game_map, "version", 0), width, height)
+        if self._padded_source is not walkable or self._padded_key != key:
+            padded = bytearray(width + 2)
+            border = b"\x00"
+            for y in range(height):
+                padded += border + walkable[y * width:(y + 1) * width] + border
+            padded += bytearray(width + 2)
+            self._padded = padded
+            self._padded_source = walkable
+            self._padded_key = key
+        return self._padded
+    
+    def get_grid(self, game_map=None):
+        """
+        Devuelve (ancho, alto, transitabilidad) de la rejilla sobre la que se busca
+        """
+        if game_map:
+            return game_map.width, game_map.height, game_map.walkable
+        
+        # Sin mapa todo el área de la pantalla es transitable
+        width = -(-Config.SCREEN_WIDTH // self.grid_size)
+        height = -(-Config.SCREEN_HEIGHT // self.grid_size)
+        if len(self._open_grid) != width * height:
+            self._open_grid = bytearray(b"\x01") * (width * height)
+        return width, height, self._open_grid
+    
+    def line_of_sight(self, start, end, game_map=None):
+        """
+        Verifica si hay línea de vista directa entre dos puntos (DDA por casillas)
+        """
+        return self.raycaster.line_of_sight(start, end, game_map)
+
+class AStarSearch:
+    """
+    Búsqueda A* incremental: expande a lo sumo max_nodes nodos por llamada a
+    step() y continúa en la siguiente llamada
+    
+    Es el núcleo de AStar.find_path, que simplemente la ejecuta completa. Si el
+    mapa cambia entre dos llamadas la búsqueda se reinicia.
+    """
+    
+    # Si acepta la heurística de landmarks (cotas de distancias sobre la rejilla)
+    USE_LANDMARKS = True
+    
+    def __init__(self, astar, start, goal, game_map=None, workspace=None):
+        self.astar = astar
+        self.start = start
+        self.goal = goal
+        self.game_map = game_map
+        self.workspace = workspace or SearchWorkspace()
+        self.restart()
+    
+    def restart(self):
+        """
+        Inicializa (o reinicia) el estado de la búsqueda
+        """
+        gs = self.astar.grid_size
+        
         # Convertir posiciones a coordenadas de grid
-        start_grid = (int(start[0] // self.grid_size) * self.grid_size,
-                     int(start[1] // self.grid_size) * self.grid_size)
-        goal_grid = (int(goal[0] // self.grid_size) * self.grid_size,
-                    int(goal[1] // self.grid_size) * self.grid_size)
+        start_x, start_y = int(self.start[0] // gs), int(self.start[1] // gs)
+        self.goal_x, self.goal_y = int(self.goal[0] // gs), int(self.goal[1] // gs)
+        self.start_grid = (start_x * gs, start_y * gs)
         
-        # Crear nodos de inicio y objetivo
-        start_node = Node(start_grid)
-        goal_node = Node(goal_grid)
+        self.path = []
+        self.done = False
+        self.nodes_expanded = 0
+        self.open_heap = []
+        self.counter = 0
+        self.map_version = getattr(self.game_map, "version", 0)
         
-        # Listas abiertas y cerradas
-        open_list = [start_node]
-        closed_list = []
+        # Objetivo en otra componente: se descarta (o se acerca) sin buscar
+        goal_tile = self.astar.resolve_goal((start_x, start_y), (self.goal_x, self.goal_y),
+                                            self.game_map)
+        if goal_tile is None:
+            self.done = True
+            return
+        self.goal_x, self.goal_y = goal_tile
         
-        # Diccionario para acceso rápido a nodos en open_list
-        open_dict = {start_grid: start_node}
+        if (start_x, start_y) == (self.goal_x, self.goal_y):
+            self.nodes_expanded = 1
+            self.path = [self.start_grid]
+            self.done = True
+            return
         
-        while open_list:
-            # Encontrar el nodo con menor f
-            current_node = min(open_list, key=lambda n: n.f)
+        self.width, self.height, self.walkable = self.astar.get_grid(self.game_map)
+        width, height = self.width, self.height
+        self.search_id = self.workspace.prepare(width * height)
+        
+        if 0 <= self.goal_x < width and 0 <= self.goal_y < height:
+            self.goal_index = self.goal_y * width + self.goal_x
+        else:
+            self.goal_index = -1
+        
+        # Heurística de landmarks (ALT) si el mapa tiene una tabla válida
+        table = getattr(self.game_map, "landmarks", None)
+        if self.USE_LANDMARKS and table and table.is_valid() and self.goal_index != -1:
+            start_index = start_y * width + start_x if 0 <= start_x < width and 0 <= start_y < height else -1
+            self.landmark_heuristic = table.make_heuristic(self.goal_index, start_index)
+        else:
+            self.landmark_heuristic = None
+        
+        # El inicio puede quedar fuera de la rejilla (enemigos recién generados),
+        # así que se expande aparte y sus vecinos cuelgan de un padre -1
+        if 0 <= start_x < width and 0 <= start_y < height:
+            self.start_index = start_y * width + start_x
+            self.push(self.start_index, 0, -1)
+        else:
+            self.start_index = -1
+            self.nodes_expanded = 1
+            gs = self.astar.grid_size
+            for dx, dy in AStar.DIRECTIONS:
+                nx = start_x + dx
+                ny = start_y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                neighbor = ny * width + nx
+                if self.walkable[neighbor]:
+                    self.push(neighbor, math.sqrt((dx * gs) ** 2 + (dy * gs) ** 2), -1)
+    
+    def push(self, index, g, parent):
+        """
+        Agrega una casilla nueva a la lista abierta
+        """
+        ws = self.workspace
+        gs = self.astar.grid_size
+        ws.visited[index] = self.search_id
+        ws.g[index] = g
+        ws.parent[index] = parent
+        ws.order[index] = self.counter
+        hx = (index % self.width - self.goal_x) * gs
+        hy = (index // self.width - self.goal_y) * gs
+        h = math.sqrt(hx * hx + hy * hy)
+        if self.landmark_heuristic:
+            h = self.landmark_heuristic(index, h)
+        heapq.heappush(self.open_heap, (g + h, self.counter, index))
+        self.counter += 1
+    
+    def step(self, max_nodes):
+        """
+        Expande hasta max_nodes nodos. Retorna cuántos expandió
+        """
+        if self.done:
+            return 0
+        if getattr(self.game_map, "version", 0) != self.map_version:
+            self.restart()
+            if self.done:
+                return 0
+        
+        gs = self.astar.grid_size
+        width, height = self.width, self.height
+        walkable = self.walkable
+        goal_x, goal_y = self.goal_x, self.goal_y
+        goal_index = self.goal_index
+        sid = self.search_id
+        ws = self.workspace
+        g_score = ws.g
+        parent = ws.parent
+        order = ws.order
+        visited = ws.visited
+        closed = ws.closed
+        open_heap = self.open_heap
+        counter = self.counter
+        
+        straight = math.sqrt(gs * gs)
+        diagonal = math.sqrt(gs * gs + gs * gs)
+        sqrt = math.sqrt
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        directions = AStar.DIRECTIONS
+        landmark = self.landmark_heuristic
+        expanded = 0
+        
+        while open_heap and expanded < max_nodes:
+            f, _, current = heappop(open_heap)
             
-            # Mover de open a closed
-            open_list.remove(current_node)
-            del open_dict[current_node.position]
-            closed_list.append(current_node)
+            # Entradas obsoletas del decrease-key perezoso
+            if closed[current] == sid:
+                continue
+            closed[current] = sid
+            expanded += 1
             
             # Verificar si llegamos al objetivo
-            if current_node == goal_node:
-                return self.reconstruct_path(current_node)
+            if current == goal_index:
+                path = []
+                while current != -1:
+                    path.append(((current % width) * gs, (current // width) * gs))
+                    current = parent[current]
+                if self.start_index == -1:
+                    path.append(self.start_grid)
+                self.path = path[::-1]
+                self.done = True
+                break
+            
+            cx = current % width
+            cy = current // width
+            current_g = g_score[current]
             
-            # Explorar vecinos
-            for neighbor_pos in self.get_neighbors(current_node.position):
-                # Verificar si el vecino es transitable
-                if not self.is_walkable(neighbor_pos, game_map):
+            # Explorar vecinos (mismo orden que get_neighbors)
+            for dx, dy in directions:
+                nx = cx + dx
+                ny = cy + dy
+                if not (0 <= nx < width and 0 <= ny < height):
                     continue
-                
-                # Verificar si ya está en la lista cerrada
-                if any(node.position == neighbor_pos for node in closed_list):
+                neighbor = ny * width + nx
+                if not walkable[neighbor] or closed[neighbor] == sid:
                     continue
                 
-                # Crear nodo vecino
-                neighbor_node = Node(neighbor_pos, current_node)
-                
-                # Calcular costos
-                neighbor_node.g = current_node.g + self.heuristic(current_node.position, neighbor_pos)
-                neighbor_node.h = self.heuristic(neighbor_pos, goal_grid)
-                neighbor_node.f = neighbor_node.g + neighbor_node.h
+                g = current_g + (straight if dx == 0 or dy == 0 else diagonal)
                 
-                # Verificar si ya está en open_list con mejor costo
-                if neighbor_pos in open_dict:
-                    existing_node = open_dict[neighbor_pos]
-                    if neighbor_node.g < existing_node.g:
-                        # Actualizar el nodo existente
-                        existing_node.parent = current_node
-                        existing_node.g = neighbor_node.g
-                        existing_node.f = neighbor_node.f
+                if visited[neighbor] == sid:
+                    # Ya está en la lista abierta: solo mejorar si el costo es menor
+                    if g < g_score[neighbor]:
+                        g_score[neighbor] = g
+                        parent[neighbor] = current
+                        hx = (nx - goal_x) * gs
+                        hy = (ny - goal_y) * gs
+                        h = sqrt(hx * hx + hy * hy)
+                        if landmark:
+                            h = landmark(neighbor, h)
+                        heappush(open_heap, (g + h, order[neighbor], neighbor))
                 else:
-                    # Agregar a open_list
-                    open_list.append(neighbor_node)
-                    open_dict[neighbor_pos] = neighbor_node
+                    visited[neighbor] = sid
+                    g_score[neighbor] = g
+                    parent[neighbor] = current
+                    order[neighbor] = counter
+                    hx = (nx - goal_x) * gs
+                    hy = (ny - goal_y) * gs
+                    h = sqrt(hx * hx + hy * hy)
+                    if landmark:
+                        h = landmark(neighbor, h)
+                    heappush(open_heap, (g + h, counter, neighbor))
+                    counter += 1
+        
+        self.counter = counter
+        self.nodes_expanded += expanded
         
         # No se encontró camino
-        return []
+        if not open_heap and not self.done:
+            self.done = True
+        
+        return expanded
     
-    def smooth_path(self, path):
+    def run(self):
         """
-        Suaviza el camino eliminando puntos innecesarios
+        Ejecuta la búsqueda hasta terminar y devuelve el camino
         """
-        if len(path) <= 2:
-            return path
+        while not self.done:
+            self.step(math.inf)
+        return self.path
+
+class JumpPointSearch(AStarSearch):
+    """
+    Jump Point Search sobre la misma rejilla uniforme de 8 direcciones
+    
+    En lugar de agregar cada vecino a la lista abierta "salta" en línea recta
+    hasta encontrar una casilla con vecinos forzados (junto a un obstáculo) o
+    el objetivo, así que expande muchos menos nodos que el A* clásico. Igual
+    que AStarSearch permite moverse en diagonal junto a obstáculos, por eso
+    el costo del camino es el mismo (aunque entre caminos de igual costo
+    puede elegir otro). Devuelve el camino casilla por casilla.
+    """
+    
+    def restart(self):
+        """
+        Inicializa la búsqueda y toma la rejilla con borde de obstáculos
+        """
+        super().restart()
+        if not self.done:
+            self.padded = self.astar.get_padded_grid(self.game_map)
+            self.padded_width = self.width + 2
+            self.padded_goal = (self.goal_y + 1) * self.padded_width + self.goal_x + 1
+            if self.goal_index == -1:
+                self.padded_goal = -1
+    
+    def is_free(self, x, y):
+        """
+        Verifica si una casilla está dentro de la rejilla y es transitable
+        """
+        return self.padded[(y + 1) * self.padded_width + x + 1]
+    
+    def prune_directions(self, x, y, parent):
+        """
+        Direcciones a explorar desde (x, y) según de dónde se llegó
+        """
+        if parent == -1:
+            return AStar.DIRECTIONS
+        
+        free = self.is_free
+        px = parent % self.width
+        py = parent // self.width
+        dx = (x > px) - (x < px)
+        dy = (y > py) - (y < py)
+        directions = []
+        
+        if dx and dy:
+            # Vecinos naturales en diagonal
+            if free(x, y + dy):
+                directions.append((0, dy))
+            if free(x + dx, y):
+                directions.append((dx, 0))
+            if free(x + dx, y + dy):
+                directions.append((dx, dy))
+            # Vecinos forzados
+            if not free(x - dx, y):
+                directions.append((-dx, dy))
+            if not free(x, y - dy):
+                directions.append((dx, -dy))
+        elif dx:
+            if free(x + dx, y):
+                directions.append((dx, 0))
+            if not free(x, y + 1):
+                directions.append((dx, 1))
+            if not free(x, y - 1):
+                directions.append((dx, -1))
+        else:
+            if free(x, y + dy):
+                directions.append((0, dy))
+            if not free(x + 1, y):
+                directions.append((1, dy))
+            if not free(x - 1, y):
+                directions.append((-1, dy))
+        
+        return directions
+    
+    def jump_straight(self, p, step, side):
+        """
+        Salto en horizontal o vertical sobre la rejilla con borde
+        
+        step es el desplazamiento por casilla y side el desplazamiento hacia
+        los lados. Retorna el índice (con borde) del punto de salto o -1.
+        """
+        grid = self.padded
+        goal = self.padded_goal
+        while True:
+            if not grid[p]:
+                return -1
+            if p == goal:
+                return p
+            if ((grid[p + step + side] and not grid[p + side]) or
+                    (grid[p + step - side] and not grid[p - side])):
+                return p
+            p += step
+    
+    def jump(self, x, y, dx, dy):
+        """
+        Avanza en la dirección (dx, dy) hasta el siguiente punto de salto
+        
+        Retorna el índice del punto de salto o -1 si se choca con un obstáculo.
+        """
+        padded_width = self.padded_width
+        p = (y + 1) * padded_width + x + 1
+        
+        if dx and dy:
+            grid = self.padded
+            goal = self.padded_goal
+            step_y = dy * padded_width
+            while True:
+                if not grid[p]:
+                    return -1
+                if p == goal:
+                    break
+                if ((grid[p - dx + step_y] and not grid[p - dx]) or
+                        (grid[p + dx - step_y] and not grid[p - step_y])):
+                    break
+                # En diagonal también se salta en horizontal y en vertical
+                if (self.jump_straight(p + dx, dx, padded_width) >= 0 or
+                        self.jump_straight(p + step_y, step_y, 1) >= 0):
+                    break
+                p += dx + step_y
+        else:
+            side = 1 if dx == 0 else padded_width
+            p = self.jump_straight(p, dx + dy * padded_width, side)
+            if p < 0:
+                return -1
+        
+        return (p // padded_width - 1) * self.width + p % padded_width - 1
+    
+    def step(self, max_nodes):
+        """
+        Expande hasta max_nodes puntos de salto. Retorna cuántos expandió
+        """
+        if self.done:
+            return 0
+        if getattr(self.game_map, "version", 0) != self.map_version:
+            self.restart()
+            if self.done:
+                return 0
+        
+        gs = self.astar.grid_size
+        width = self.width
+        goal_x, goal_y = self.goal_x, self.goal_y
+        sid = self.search_id
+        ws = self.workspace
+        g_score = ws.g
+        parent = ws.parent
+        order = ws.order
+        visited = ws.visited
+        closed = ws.closed
+        open_heap = self.open_heap
         
-        smoothed = [path[0]]
+        straight = math.sqrt(gs * gs)
+        diagonal = math.sqrt(gs * gs + gs * gs)
+        sqrt = math.sqrt
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        expanded = 0
         
-        for i in range(1, len(path) - 1):
-            current = path[i]
-            prev = smoothed[-1]
-            next_point = path[i + 1]
+        while open_heap and expanded < max_nodes:
+            f, _, current = heappop(open_heap)
+            if closed[current] == sid:
+                continue
+            closed[current] = sid
+            expanded += 1
             
-            # Verificar si podemos ir directamente de prev a next
-            if not self.line_of_sight(prev, next_point):
-                smoothed.append(current)
+            if current == self.goal_index:
+                self.path = self.expand_path(current)
+                self.done = True
+                break
+            
+            cx = current % width
+            cy = current // width
+            current_g = g_score[current]
+            
+            for dx, dy in self.prune_directions(cx, cy, parent[current]):
+                jump_point = self.jump(cx + dx, cy + dy, dx, dy)
+                if jump_point < 0 or closed[jump_point] == sid:
+                    continue
+                
+                jx = jump_point % width
+                jy = jump_point // width
+                steps = max(abs(jx - cx), abs(jy - cy))
+                g = current_g + steps * (straight if dx == 0 or dy == 0 else diagonal)
+                
+                if visited[jump_point] == sid:
+                    if g < g_score[jump_point]:
+                        g_score[jump_point] = g
+                        parent[jump_point] = current
+                        hx = (jx - goal_x) * gs
+                        hy = (jy - goal_y) * gs
+                        heappush(open_heap, (g + sqrt(hx * hx + hy * hy), order[jump_point], jump_point))
+                else:
+                    visited[jump_point] = sid
+                    g_score[jump_point] = g
+                    parent[jump_point] = current
+                    order[jump_point] = self.counter
+                    hx = (jx - goal_x) * gs
+                    hy = (jy - goal_y) * gs
+                    heappush(open_heap, (g + sqrt(hx * hx + hy * hy), self.counter, jump_point))
+                    self.counter += 1
         
-        smoothed.append(path[-1])
-        return smoothed
+        self.nodes_expanded += expanded
+        
+        # No se encontró camino
+        if not open_heap and not self.done:
+            self.done = True
+        
+        return expanded
     
-    def line_of_sight(self, start, end, game_map=None):
+    def expand_path(self, index):
+        """
+        Reconstruye el camino completando las casillas entre puntos de salto
+        """
+        gs = self.astar.grid_size
+        width = self.width
+        parent = self.workspace.parent
+        
+        jump_points = []
+        while index != -1:
+            jump_points.append((index % width, index // width))
+            index = parent[index]
+        if self.start_index == -1:
+            jump_points.append((self.start_grid[0] // gs, self.start_grid[1] // gs))
+        jump_points.reverse()
+        
+        x, y = jump_points[0]
+        path = [(x * gs, y * gs)]
+        for next_x, next_y in jump_points[1:]:
+            dx = (next_x > x) - (next_x < x)
+            dy = (next_y > y) - (next_y < y)
+            while (x, y) != (next_x, next_y):
+                x += dx
+                y += dy
+                path.append((x * gs, y * gs))
+        return path
+
+class ThetaStarSearch(AStarSearch):
+    """
+    Lazy Theta*: A* "any-angle" sobre la misma rejilla
+    
+    Una casilla puede tener como padre a cualquier casilla visible desde ella
+    y no solo a una vecina, así que el camino sale directamente como una lista
+    corta de puntos de giro y no hace falta suavizarlo después. La línea de
+    vista (DDA entre centros de casilla) se comprueba de forma perezosa: solo
+    al expandir una casilla, y si falla se toma el mejor vecino cerrado.
+    """
+    
+    # Las cotas de los landmarks son de caminos sobre la rejilla, más largos
+    # que los any-angle, así que no son admisibles aquí
+    USE_LANDMARKS = False
+    
+    def visible(self, a, b):
+        """
+        Verifica la línea de vista entre los centros de dos casillas
+        """
+        width = self.width
+        gs = self.astar.grid_size
+        half = gs / 2
+        return self.astar.raycaster.cast((a % width) * gs + half, (a // width) * gs + half,
+                                         (b % width) * gs + half, (b // width) * gs + half,
+                                         width, self.height, self.walkable)
+    
+    def step(self, max_nodes):
         """
-        Verifica si hay línea de vista directa entre dos puntos
+        Expande hasta max_nodes nodos. Retorna cuántos expandió
         """
-        x0, y0 = start
-        x1, y1 = end
+        if self.done:
+            return 0
+        if getattr(self.game_map, "version", 0) != self.map_version:
+            self.restart()
+            if self.done:
+                return 0
         
-        # Algoritmo de Bresenham para verificar línea de vista
-        dx = abs(x1 - x0)
-        dy = abs(y1 - y0)
-        sx = 1 if x0 < x1 else -1
-        sy = 1 if y0 < y1 else -1
-        err = dx - dy
+        gs = self.astar.grid_size
+        width, height = self.width, self.height
+        walkable = self.walkable
+        goal_x, goal_y = self.goal_x, self.goal_y
+        goal_index = self.goal_index
+        sid = self.search_id
+        ws = self.workspace
+        g_score = ws.g
+        parent = ws.parent
+        order = ws.order
+        visited = ws.visited
+        closed = ws.closed
+        open_heap = self.open_heap
+        counter = self.counter
         
-        x, y = x0, y0
+        straight = math.sqrt(gs * gs)
+        diagonal = math.sqrt(gs * gs + gs * gs)
+        sqrt = math.sqrt
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        directions = AStar.DIRECTIONS
+        expanded = 0
         
-        while True:
-            # Verificar si la posición actual es transitable
-            if not self.is_walkable((x, y), game_map):
-                return False
+        while open_heap and expanded < max_nodes:
+            f, _, current = heappop(open_heap)
+            if closed[current] == sid:
+                continue
+            closed[current] = sid
+            expanded += 1
+            
+            cx = current % width
+            cy = current // width
             
-            if x == x1 and y == y1:
+            # Comprobar el padre supuesto; si no se ve, el mejor vecino cerrado
+            source = parent[current]
+            if source != -1 and not self.visible(source, current):
+                best_g = math.inf
+                for dx, dy in directions:
+                    nx = cx + dx
+                    ny = cy + dy
+                    if not (0 <= nx < width and 0 <= ny < height):
+                        continue
+                    neighbor = ny * width + nx
+                    if closed[neighbor] == sid:
+                        g = g_score[neighbor] + (straight if dx == 0 or dy == 0 else diagonal)
+                        if g < best_g:
+                            best_g = g
+                            source = neighbor
+                g_score[current] = best_g
+                parent[current] = source
+            
+            if current == goal_index:
+                path = []
+                while current != -1:
+                    path.append(((current % width) * gs, (current // width) * gs))
+                    current = parent[current]
+                if self.start_index == -1:
+                    path.append(self.start_grid)
+                self.path = path[::-1]
+                self.done = True
                 break
             
-            e2 = 2 * err
-            if e2 > -dy:
-                err -= dy
-                x += sx
-            if e2 < dx:
-                err += dx
-                y += sy
-        
-        return True
\ No newline at end of file
+            # Los vecinos cuelgan directamente del padre de la casilla actual
+            if source == -1:
+                source = current
+            sx = source % width
+            sy = source // width
+            source_g = g_score[source]
+            
+            for dx, dy in directions:
+                nx = cx + dx
+                ny = cy + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                neighbor = ny * width + nx
+                if not walkable[neighbor] or closed[neighbor] == sid:
+                    continue
+                
+                ex = (nx - sx) * gs
+                ey = (ny - sy) * gs
+                g = source_g + sqrt(ex * ex + ey * ey)
+                hx = (nx - goal_x) * gs
+                hy = (ny - goal_y) * gs
+                
+                if visited[neighbor] == sid:
+                    if g < g_score[neighbor]:
+                        g_score[neighbor] = g
+                        parent[neighbor] = source
+                        heappush(open_heap, (g + sqrt(hx * hx + hy * hy), order[neighbor], neighbor))
+                else:
+                    visited[neighbor] = sid
+                    g_score[neighbor] = g
+                    parent[neighbor] = source
+                    order[neighbor] = counter
+                    heappush(open_heap, (g + sqrt(hx * hx + hy * hy), counter, neighbor))
+                    counter += 1
+        
+        self.counter = counter
+        self.nodes_expanded += expanded
+        
+        # No se encontró camino
+        if not open_heap and not self.done:
+            self.done = True
+        
+        return expanded
+
+class DStarLite:
+    """
+    Replanificador incremental D* Lite para perseguir un objetivo que se mueve
+    
+    Cada enemigo guarda su propia instancia. La raíz de la búsqueda es la
+    casilla donde el enemigo empezó a perseguir y el foco es la casilla del
+    objetivo: cuando el objetivo se mueve (o cambian casillas del mapa) solo
+    se reparan los valores afectados en lugar de buscar desde cero. Mientras
+    el enemigo siga sobre el camino su tramo restante también es óptimo; si
+    se sale de él la búsqueda se reinicia desde su casilla actual.
+    """
+    
+    def __init__(self, astar=None):
+        self.astar = astar or AStar()
+        self.grid_size = self.astar.grid_size
+        self.nodes_expanded = 0  # Nodos expandidos en la última llamada
+        self.resets = 0          # Búsquedas reiniciadas desde cero
+        
+        self.game_map = None
+        self.map_version = -1
+        self.width = 0
+        self.height = 0
+        self.root = -1
+        self.focus = -1
+        self.km = 0.0
+        self.g = []
+        self.rhs = []
+        self.open_key = []       # Clave actual de cada casilla en la cola (None si no está)
+        self.open_heap = []
+        self.passable = bytearray()  # Copia de la rejilla (la raíz siempre transitable)
+        self.path_indices = set()    # Casillas del último camino
+        
+        gs = self.grid_size
+        self.straight = math.sqrt(gs * gs)
+        self.diagonal = math.sqrt(gs * gs + gs * gs)
+    
+    def reset(self, root, focus, walkable):
+        """
+        Descarta el estado y empieza una búsqueda nueva con raíz en root
+        """
+        size = self.width * self.height
+        self.root = root
+        self.focus = focus
+        self.km = 0.0
+        self.g = [math.inf] * size
+        self.rhs = [math.inf] * size
+        self.open_key = [None] * size
+        self.open_heap = []
+        self.passable = bytearray(walkable)
+        self.passable[root] = 1
+        self.path_indices = set()
+        self.resets += 1
+        
+        self.rhs[root] = 0.0
+        self.update_vertex(root)
+    
+    def heuristic(self, a, b):
+        """
+        Distancia euclidiana (en píxeles) entre dos casillas
+        """
+        width = self.width
+        dx = (a % width - b % width) * self.grid_size
+        dy = (a // width - b // width) * self.grid_size
+        return math.sqrt(dx * dx + dy * dy)
+    
+    def calculate_key(self, index):
+        """
+        Clave de prioridad de una casilla
+        """
+        m = min(self.g[index], self.rhs[index])
+        return (m + self.heuristic(self.focus, index) + self.km, m)
+    
+    def neighbors(self, index):
+        """
+        Vecinos transitables de una casilla con el costo para llegar a ellos
+        """
+        width = self.width
+        x = index % width
+        y = index // width
+        passable = self.passable
+        result = []
+        for dx, dy in AStar.DIRECTIONS:
+            nx = x + dx
+            ny = y + dy
+            if 0 <= nx < width and 0 <= ny < self.height:
+                neighbor = ny * width + nx
+                if passable[neighbor]:
+                    result.append((neighbor, self.straight if dx == 0 or dy == 0 else self.diagonal))
+        return result
+    
+    def best_rhs(self, index):
+        """
+        Menor costo hacia la raíz pasando por algún vecino
+        """
+        if not self.passable[index]:
+            return math.inf
+        g = self.g
+        best = math.inf
+        for neighbor, cost in self.neighbors(index):
+            value = cost + g[neighbor]
+            if value < best:
+                best = value
+        return best
+    
+    def update_vertex(self, index):
+        """
+        Mete, actualiza o saca una casilla de la cola según sea inconsistente
+        """
+        if self.g[index] != self.rhs[index]:
+            key = self.calculate_key(index)
+            if self.open_key[index] != key:
+                self.open_key[index] = key
+                heapq.heappush(self.open_heap, (key[0], key[1], index))
+        else:
+            self.open_key[index] = None
+    
+    def top(self):
+        """
+        Primera entrada válida de la cola (descarta las obsoletas) o None
+        """
+        open_heap = self.open_heap
+        open_key = self.open_key
+        while open_heap:
+            k1, k2, index = open_heap[0]
+            key = open_key[index]
+            if key is not None and key[0] == k1 and key[1] == k2:
+                return open_heap[0]
+            heapq.heappop(open_heap)
+        return None
+    
+    def compute_shortest_path(self):
+        """
+        Repara los valores hasta que el foco sea consistente
+        """
+        g = self.g
+        rhs = self.rhs
+        root = self.root
+        focus = self.focus
+        passable = self.passable
+        open_heap = self.open_heap
+        expanded = 0
+        
+        while True:
+            entry = self.top()
+            if entry is None:
+                break
+            k_old = (entry[0], entry[1])
+            if not (k_old < self.calculate_key(focus) or rhs[focus] != g[focus]):
+                break
+            
+            index = entry[2]
+            expanded += 1
+            k_new = self.calculate_key(index)
+            if k_old < k_new:
+                # La clave quedó vieja por el movimiento del foco
+                self.open_key[index] = k_new
+                heapq.heapreplace(open_heap, (k_new[0], k_new[1], index))
+            elif g[index] > rhs[index]:
+                # Sobreconsistente: se fija su costo y se propaga
+                g[index] = rhs[index]
+                self.open_key[index] = None
+                heapq.heappop(open_heap)
+                if passable[index]:
+                    for neighbor, cost in self.neighbors(index):
+                        if neighbor != root and g[index] + cost < rhs[neighbor]:
+                            rhs[neighbor] = g[index] + cost
+                            self.update_vertex(neighbor)
+            else:
+                # Subconsistente: se invalida y se recalculan los que dependían de ella
+                g_old = g[index]
+                g[index] = math.inf
+                affected = [index]
+                if passable[index]:
+                    affected += [neighbor for neighbor, cost in self.neighbors(index)
+                                 if rhs[neighbor] == g_old + cost]
+                for vertex in affected:
+                    if vertex != root:
+                        rhs[vertex] = self.best_rhs(vertex)
+                    self.update_vertex(vertex)
+        
+        self.nodes_expanded += expanded
+    
+    def sync_map(self, walkable):
+        """
+        Aplica las casillas que cambiaron desde la última llamada
+        """
+        width = self.width
+        passable = self.passable
+        root = self.root
+        changed = []
+        
+        # Comparar por filas para recorrer solo las que tienen cambios
+        for y in range(self.height):
+            row = y * width
+            if walkable[row:row + width] != passable[row:row + width]:
+                for index in range(row, row + width):
+                    if index != root and walkable[index] != passable[index]:
+                        changed.append(index)
+        
+        for index in changed:
+            passable[index] = walkable[index]
+        for index in changed:
+            x = index % width
+            y = index // width
+            for dx, dy in ((0, 0),) + AStar.DIRECTIONS:
+                nx = x + dx
+                ny = y + dy
+                if 0 <= nx < width and 0 <= ny < self.height:
+                    vertex = ny * width + nx
+                    if vertex != root:
+                        self.rhs[vertex] = self.best_rhs(vertex)
+                        self.update_vertex(vertex)
+    
+    def extract_path(self):
+        """
+        Camino desde el foco hasta la raíz (índices) bajando por g, o [] si no hay
+        
+        Entre vecinos de igual costo se prefiere el camino anterior para que el
+        enemigo siga sobre él.
+        """
+        g = self.g
+        current = self.focus
+        if g[current] == math.inf:
+            return []
+        
+        previous = self.path_indices
+        path = [current]
+        while current != self.root:
+            best = None
+            best_value = math.inf
+            for neighbor, cost in self.neighbors(current):
+                value = cost + g[neighbor]
+                if (value < best_value - 1e-6 or
+                        (value < best_value + 1e-6 and neighbor in previous and best not in previous)):
+                    best = neighbor
+                    best_value = value
+            if best is None or len(path) > len(g):
+                return []
+            current = best
+            path.append(current)
+        return path
+    
+    def find_path(self, start, goal, game_map=None):
+        """
+        Encuentra el camino con la misma forma que AStar.find_path reutilizando
+        el estado de la llamada anterior
+        """
+        gs = self.grid_size
+        start_x, start_y = int(start[0] // gs), int(start[1] // gs)
+        goal_x, goal_y = int(goal[0] // gs), int(goal[1] // gs)
+        self.nodes_expanded = 0
+        
+        goal_tile = self.astar.resolve_goal((start_x, start_y), (goal_x, goal_y), game_map)
+        if goal_tile is None:
+            return []
+        goal_x, goal_y = goal_tile
+        
+        if (start_x, start_y) == (goal_x, goal_y):
+            self.nodes_expanded = 1
+            return [(start_x * gs, start_y * gs)]
+        
+        width, height, walkable = self.astar.get_grid(game_map)
+        if not (0 <= start_x < width and 0 <= start_y < height):
+            # Fuera de la rejilla (recién generado): búsqueda normal sin estado
+            path = self.astar.find_path(start, goal, game_map)
+            self.nodes_expanded = self.astar.nodes_expanded
+            return path
+        if not (0 <= goal_x < width and 0 <= goal_y < height) or not walkable[goal_y * width + goal_x]:
+            return []
+        
+        start_index = start_y * width + start_x
+        goal_index = goal_y * width + goal_x
+        
+        version = getattr(game_map, "version", 0)
+        if (self.root == -1 or game_map is not self.game_map or
+                (width, height) != (self.width, self.height)):
+            self.game_map = game_map
+            self.width, self.height = width, height
+            self.reset(start_index, goal_index, walkable)
+        elif version != self.map_version:
+            self.sync_map(walkable)
+        self.map_version = version
+        
+        if goal_index != self.focus:
+            self.km += self.heuristic(self.focus, goal_index)
+            self.focus = goal_index
+        
+        self.compute_shortest_path()
+        path = self.extract_path()
+        
+        if path and start_index not in path:
+            # El enemigo ya no está sobre el camino: buscar desde su casilla
+            self.reset(start_index, goal_index, walkable)
+            self.compute_shortest_path()
+            path = self.extract_path()
+        
+        self.path_indices = set(path)
+        if not path:
+            return []
+        
+        # Del enemigo al objetivo
+        path = path[:path.index(start_index) + 1]
+        path.reverse()
+        return [((index % width) * gs, (index // width) * gs) for index in path]
\ No newline at end of file
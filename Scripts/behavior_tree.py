@@ -2,6 +2,151 @@
 # Autor: Hensly Manuel Vidal Rosario
 # Matrícula: 23-MISN-2-007
 
+# Estados como enteros para el intérprete compilado (CompiledTree)
+FAILURE = 0
+SUCCESS = 1
+RUNNING = 2
+
+# Nombre de cada estado entero y código de cada estado (texto o entero)
+STATUS_NAMES = ("FAILURE", "SUCCESS", "RUNNING")
+STATUS_CODES = {
+    "FAILURE": FAILURE, "SUCCESS": SUCCESS, "RUNNING": RUNNING,
+    FAILURE: FAILURE, SUCCESS: SUCCESS, RUNNING: RUNNING
+}
+
+class Blackboard:
+    """
+    Estado de un agente que recibe como contexto un árbol compartido. Los
+    árboles no guardan al agente, así que todos los agentes de un tipo usan
+    la misma instancia del árbol y cada uno solo tiene su blackboard
+    """
+    
+    __slots__ = ('agent', 'player_pos', 'game_map', 'dt', 'inputs', 'dirty', 'memory', 'ticks', 'time')
+    
+    def __init__(self, agent):
+        self.agent = agent
+        self.player_pos = None
+        self.game_map = None
+        self.dt = 0.0
+        self.inputs = None  # Entradas del árbol en el último tick (DirtyTracker)
+        self.dirty = True   # Re-evaluar en el próximo tick aunque no cambien
+        self.memory = {}    # Estado de los nodos con memoria de este agente (nodo -> valor)
+        self.ticks = 0      # Ticks ejecutados de árboles con memoria
+        self.time = 0.0     # Reloj del agente en segundos (para Cooldown)
+    
+    def mark_dirty(self):
+        """
+        Fuerza la re-evaluación por un evento que las entradas no ven
+        (p. ej. el agente llegó al final de su camino)
+        """
+        self.dirty = True
+
+def agent_method(method):
+    """
+    Adapta un método del agente, method(agent, blackboard), a la función de
+    un nodo compartido: el agente se toma del blackboard en cada tick
+    """
+    def call(blackboard):
+        return method(blackboard.agent, blackboard)
+    call.__name__ = method.__name__
+    call.agent_method = method  # CompiledTree lo llama directamente
+    return call
+
+class DirtyTracker:
+    """
+    Re-evaluación por eventos: decide si un agente necesita un tick
+    
+    Las condiciones y hojas declaran qué entradas del blackboard leen (reads)
+    y el árbol junta todas en inputs. sources tiene una función por entrada que
+    calcula su valor actual desde el blackboard; si ninguna cambió desde el
+    último tick del agente (y nadie lo marcó con mark_dirty), el árbol daría
+    el mismo resultado y el tick se salta.
+    
+    Leer las entradas tiene que costar menos que el árbol, así que se genera
+    una sola función que las calcula todas (como CompiledTree) y los métodos
+    del agente (agent_method) se llaman sin la función intermedia.
+    """
+    
+    def __init__(self, tree, sources, enabled=True):
+        missing = [key for key in tree.inputs if key not in sources]
+        if missing:
+            raise ValueError(f"Entradas del árbol sin fuente: {', '.join(sorted(missing))}")
+        self.keys = tuple(sorted(tree.inputs))
+        self.enabled = enabled
+        
+        functions = []
+        calls = []
+        for key in self.keys:
+            method = getattr(sources[key], 'agent_method', None)
+            functions.append(method or sources[key])
+            arguments = "agent, blackboard" if method else "blackboard"
+            calls.append(f"f{len(functions) - 1}({arguments}), ")
+        parameters = "".join(f", f{i}=functions[{i}]" for i in range(len(functions)))
+        source = (
+            f"def read_inputs(blackboard{parameters}):\n"
+            f"    agent = blackboard.agent\n"
+            f"    return ({''.join(calls)})\n"
+        )
+        namespace = {'functions': functions}
+        exec(compile(source, "<behavior inputs>", "exec"), namespace)
+        self.read_inputs = namespace['read_inputs']
+        
+        # Estadísticas
+        self.executed = 0  # Ticks ejecutados
+        self.skipped = 0   # Ticks saltados porque nada cambió
+    
+    def needs_tick(self, blackboard):
+        """
+        Retorna si hay que ejecutar el árbol para este agente y guarda sus
+        entradas actuales
+        """
+        if self.enabled:
+            inputs = self.read_inputs(blackboard)
+            if not blackboard.dirty and inputs == blackboard.inputs:
+                self.skipped += 1
+                return False
+            blackboard.inputs = inputs
+            blackboard.dirty = False
+        self.executed += 1
+        return True
+    
+    def get_stats(self):
+        """
+        Devuelve los contadores de ticks
+        """
+        total = self.executed + self.skipped
+        return {
+            'executed': self.executed,
+            'skipped': self.skipped,
+            'skip_rate': self.skipped / total if total else 0.0
+        }
+
+def walk(node):
+    """
+    Recorre el árbol desde node (incluye a los hijos de los decoradores)
+    """
+    yield node
+    for child in node.children:
+        yield from walk(child)
+    child = getattr(node, 'child', None)
+    if child is not None:
+        yield from walk(child)
+
+def collect_inputs(node):
+    """
+    Entradas del blackboard que leen las condiciones y hojas del árbol
+    """
+    inputs = set()
+    for current in walk(node):
+        inputs.update(getattr(current, 'reads', ()))
+    return frozenset(inputs)
+
+def is_stateful(node):
+    """
+    Si algún nodo del árbol guarda estado por agente en el blackboard
+    """
+    return any(getattr(current, 'stateful', False) for current in walk(node))
+
 class BehaviorTree:
     """
     Implementación de Árbol de Comportamiento desde cero
@@ -9,11 +154,15 @@ class BehaviorTree:
     
     def __init__(self, root):
         self.root = root
+        self.inputs = collect_inputs(root)  # Entradas que leen sus nodos
+        self.stateful = is_stateful(root)   # Tiene nodos con memoria (cuentan los ticks)
     
     def tick(self, context):
         """
         Ejecuta el árbol de comportamiento
         """
+        if self.stateful:
+            context.ticks += 1
         return self.root.execute(context)
 
 class Node:
@@ -67,24 +216,28 @@ class Sequence(Node):
 
 class Leaf(Node):
     """
-    Nodo hoja que ejecuta una función específica
+    Nodo hoja que ejecuta una función específica. reads son las entradas
+    del blackboard con las que calcula su resultado (para DirtyTracker)
     """
     
-    def __init__(self, action_func):
+    def __init__(self, action_func, reads=()):
         super().__init__()
         self.action_func = action_func
+        self.reads = tuple(reads)
     
     def execute(self, context):
         return self.action_func(context)
 
 class Condition(Node):
     """
-    Nodo condición que evalúa una función booleana
+    Nodo condición que evalúa una función booleana. reads son las entradas
+    del blackboard de las que depende (para DirtyTracker)
     """
     
-    def __init__(self, condition_func):
+    def __init__(self, condition_func, reads=()):
         super().__init__()
         self.condition_func = condition_func
+        self.reads = tuple(reads)
     
     def execute(self, context):
         if self.condition_func(context):
@@ -108,4 +261,90 @@ class Inverter(Node):
         elif result == "FAILURE":
             return "SUCCESS"
         else:
-            return result  # RUNNING permanece igual
\ No newline at end of file
+            return result  # RUNNING permanece igual
+
+class MemorySequence(Node):
+    """
+    Secuencia con memoria: si un hijo retornó RUNNING, el siguiente tick
+    continúa desde ese hijo sin volver a evaluar los anteriores
+    
+    La memoria es por agente (en el blackboard) y solo vale si el nodo se
+    ejecutó en el tick anterior del agente; si otra rama tomó el control
+    mientras tanto, vuelve a empezar desde el primer hijo.
+    """
+    
+    stateful = True
+    keep = "SUCCESS"  # Estado con el que se pasa al siguiente hijo
+    
+    def execute(self, context):
+        memory = context.memory
+        saved = memory.pop(self, None)
+        start = saved[1] if saved and saved[0] == context.ticks - 1 else 0
+        children = self.children
+        for index in range(start, len(children)):
+            result = children[index].execute(context)
+            if result == "RUNNING":
+                memory[self] = (context.ticks, index)
+                return "RUNNING"
+            if result != self.keep:
+                return result
+        return self.keep
+
+class MemorySelector(MemorySequence):
+    """
+    Selector con memoria: si un hijo retornó RUNNING, el siguiente tick
+    continúa desde ese hijo sin volver a probar los anteriores
+    """
+    
+    keep = "FAILURE"
+
+class Parallel(Node):
+    """
+    Ejecuta todos los hijos en cada tick. Retorna SUCCESS cuando al menos
+    success_threshold hijos terminan en SUCCESS, FAILURE cuando ya no pueden
+    llegar a ese número y RUNNING en otro caso
+    """
+    
+    def __init__(self, success_threshold=None):
+        super().__init__()
+        self.success_threshold = success_threshold  # None = todos los hijos
+    
+    def execute(self, context):
+        required = self.success_threshold or len(self.children)
+        successes = 0
+        failures = 0
+        for child in self.children:
+            result = child.execute(context)
+            if result == "SUCCESS":
+                successes += 1
+            elif result == "FAILURE":
+                failures += 1
+        if successes >= required:
+            return "SUCCESS"
+        if failures > len(self.children) - required:
+            return "FAILURE"
+        return "RUNNING"
+
+class Cooldown(Node):
+    """
+    Decorador que, después de que su hijo termina en SUCCESS, retorna
+    FAILURE sin ejecutarlo durante duration segundos (según blackboard.time)
+    
+    El fin de la espera no es una entrada del árbol: con DirtyTracker el
+    agente tiene que declarar alguna entrada que cambie con el tiempo.
+    """
+    
+    stateful = True
+    
+    def __init__(self, child, duration):
+        super().__init__()
+        self.child = child
+        self.duration = duration
+    
+    def execute(self, context):
+        if context.time < context.memory.get(self, 0.0):
+            return "FAILURE"
+        result = self.child.execute(context)
+        if result == "SUCCESS":
+            context.memory[self] = context.time + self.duration
+        return result
\ No newline at end of file
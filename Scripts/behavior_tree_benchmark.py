@@ -0,0 +1,464 @@
+# Benchmark del árbol de comportamiento - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+"""
+Compara el árbol de comportamiento original (nodos que se llaman de forma
+recursiva y estados de texto) con el árbol compilado a una sola función
+(CompiledTree). Mide ticks por segundo del árbol de los enemigos con
+contextos variados y de árboles con hojas triviales, donde solo cuenta el
+costo de recorrer el árbol. Verifica además que ambos dan el mismo estado.
+
+También mide lo que cuesta al aparecer un enemigo crear su propio árbol
+frente a crear solo el blackboard con el que usa el árbol compartido, y el
+tick enemigo por enemigo frente al lote vectorizado con NumPy y frente a
+re-evaluar solo los enemigos con entradas cambiadas (DirtyTracker), y la
+actualización completa de los enemigos con y sin bandas de distancia (LOD).
+run_loader mide la carga de muchos arquetipos de árbol desde archivos y
+run_pool el movimiento de los enemigos objeto por objeto frente a EnemyPool.
+run_profile muestra el perfil por nodo del árbol de los enemigos.
+
+Uso:
+    python -m scripts.behavior_tree_benchmark
+"""
+
+import os
+
+# Sin pantalla ni audio: solo se usa la lógica de los enemigos
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import random
+import tempfile
+import time
+import tracemalloc
+from scripts.config import Config
+from scripts.behavior_tree import (
+    BehaviorTree, Blackboard, DirtyTracker, Selector, Sequence, Leaf, Condition, Inverter, STATUS_CODES
+)
+from scripts.bt_compiler import CompiledTree
+from scripts.bt_batch import BatchBehavior
+from scripts.ai_lod import AILevelOfDetail
+from scripts.bt_profiler import BehaviorProfiler
+from scripts.bt_loader import BehaviorLibrary, read_definition, build_tree
+from scripts.enemy_pool import EnemyPool
+from scripts.enemy import Enemy, PROJECT_DIR
+from scripts.game_map import GameMap
+
+def build_enemies(count, seed, pool=None):
+    """
+    Enemigos en posiciones al azar con salud y visibilidad variadas, para que
+    cada tick recorra ramas distintas del árbol (en el pool si se indica)
+    """
+    rng = random.Random(seed)
+    enemies = []
+    for _ in range(count):
+        x, y = rng.randrange(Config.SCREEN_WIDTH), rng.randrange(Config.SCREEN_HEIGHT)
+        enemy = pool.spawn(x, y, None) if pool else Enemy(x, y, None)
+        enemy.health = rng.choice((Config.ENEMY_HEALTH, Config.ENEMY_HEALTH * 0.2))
+        enemy.player_visible = rng.random() < 0.5
+        enemies.append(enemy)
+    return enemies
+
+def time_ticks(trees, contexts, repeats):
+    """
+    Segundos que tardan repeats pasadas de tick sobre todos los árboles
+    """
+    begin = time.perf_counter()
+    for _ in range(repeats):
+        for tree, context in zip(trees, contexts):
+            tree.tick(context)
+    return time.perf_counter() - begin
+
+def run_enemy_tree(enemy_counts=(10, 100, 500), repeats=200, seed=7):
+    """
+    Ticks por segundo del árbol de los enemigos, interpretado y compilado
+    """
+    print(f"{'enemigos':>9} {'árbol ticks/s':>14} {'compilado ticks/s':>18} {'mejora':>7} {'iguales':>8}")
+    game_map = GameMap(Config.MAP_WIDTH, Config.MAP_HEIGHT)
+    player_pos = (Config.SCREEN_WIDTH // 2, Config.SCREEN_HEIGHT // 2)
+    for count in enemy_counts:
+        enemies = build_enemies(count, seed)
+        contexts = []
+        for enemy in enemies:
+            blackboard = enemy.blackboard
+            blackboard.player_pos = player_pos
+            blackboard.game_map = game_map
+            blackboard.dt = 0.1
+            contexts.append(blackboard)
+        
+        # Un solo árbol para todos, como en el juego
+        tree = Enemy.create_behavior_tree()
+        trees = [tree] * count
+        compiled = [CompiledTree(tree)] * count
+        
+        # Mismo estado y misma decisión del enemigo con ambos intérpretes
+        same = True
+        for tree, program, context in zip(trees, compiled, contexts):
+            enemy = context.agent
+            expected = STATUS_CODES[tree.tick(context)]
+            state = enemy.state
+            if program.tick(context) != expected or enemy.state != state:
+                same = False
+        
+        interpreted = time_ticks(trees, contexts, repeats)
+        flattened = time_ticks(compiled, contexts, repeats)
+        ticks = count * repeats
+        print(f"{count:>9} {ticks / interpreted:14.0f} {ticks / flattened:18.0f} "
+              f"{interpreted / flattened:6.2f}x {'sí' if same else 'NO':>8}")
+
+def run_spawn(count=1000):
+    """
+    Costo por enemigo de crear su propio árbol (como antes de compartirlo)
+    frente a crear solo su blackboard: tiempo y memoria que queda asignada
+    """
+    print(f"{'por enemigo':>22} {'us':>8} {'bytes':>8}")
+    enemy = Enemy(0, 0, None)
+    # Sin la caché de BehaviorLibrary: cada enemigo lee y construye el árbol
+    registry = Enemy.behavior_registry()
+    path = enemy_behavior_file()
+    rows = (
+        ("árbol propio", lambda: BehaviorLibrary(registry).load(path)),
+        ("árbol propio compilado", lambda: CompiledTree(BehaviorLibrary(registry).load(path))),
+        ("blackboard", lambda: Blackboard(enemy))
+    )
+    for name, spawn in rows:
+        begin = time.perf_counter()
+        kept = [spawn() for _ in range(count)]
+        elapsed = time.perf_counter() - begin
+        del kept
+        
+        tracemalloc.start()
+        kept = [spawn() for _ in range(count)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        print(f"{name:>22} {elapsed * 1e6 / count:8.1f} {size / count:8.0f}")
+
+def run_batch(enemy_counts=(10, 100, 1000, 5000), frames=120, seed=7):
+    """
+    Parte del árbol de Enemy.update (temporizador, DirtyTracker y tick) de
+    todos los enemigos, objeto por objeto, frente a BatchBehavior sobre
+    EnemyPool, con el jugador caminando entre ellos. También con un árbol
+    de otra forma (un arquetipo cargado de archivo), que el lote no evalúa
+    en forma vectorizada pero sí decide en lote a quién le toca. Verifica
+    que dejan el mismo estado y objetivo en cada enemigo y los mismos ticks
+    ejecutados
+    """
+    print(f"{'árbol':>9} {'enemigos':>9} {'objetos us/enemigo':>19} {'lote us/enemigo':>16} "
+          f"{'mejora':>7} {'ejecutados':>11} {'iguales':>8}")
+    # Arquetipo: el árbol del enemigo con perseguir antes que atacar
+    definition = read_definition(enemy_behavior_file())
+    children = definition['root']['children']
+    children[1], children[2] = children[2], children[1]
+    trees = (
+        ('enemigo', Enemy.get_behavior_tree()),
+        ('arquetipo', CompiledTree(build_tree(definition, Enemy.behavior_registry())))
+    )
+    for name, tree in trees:
+        for count in enemy_counts:
+            times, ticks, same = batch_frames(tree, count, frames, seed)
+            print(f"{name:>9} {count:>9} {times[0] * 1e6 / (count * frames):19.2f} "
+                  f"{times[1] * 1e6 / (count * frames):16.2f} {times[0] / times[1]:6.2f}x "
+                  f"{ticks:11d} {'sí' if same else 'NO':>8}")
+
+def batch_frames(tree, count, frames, seed):
+    """
+    frames frames de los enemigos objeto por objeto y en lote. Retorna los
+    segundos de cada uno, los ticks ejecutados y si terminaron iguales
+    """
+    game_map = GameMap(Config.MAP_WIDTH, Config.MAP_HEIGHT)
+    dt = 1 / 60
+    # El jugador cruza la pantalla: 2 píxeles por frame
+    path = [(100 + 2 * (frame % 400), Config.SCREEN_HEIGHT // 2) for frame in range(frames)]
+    
+    pool = EnemyPool()
+    # Mismos puntos de patrulla (usan random) en los dos grupos
+    random.seed(seed)
+    objects = build_enemies(count, seed)
+    random.seed(seed)
+    groups = (objects, build_enemies(count, seed, pool))
+    rng = random.Random(seed)
+    for a, b in zip(*groups):
+        # Temporizadores desfasados, como enemigos que aparecieron en momentos distintos
+        a.behavior_timer = b.behavior_timer = rng.uniform(0, a.behavior_rate)
+    trackers = (DirtyTracker(tree, Enemy.behavior_inputs()), DirtyTracker(tree, Enemy.behavior_inputs()))
+    batch = BatchBehavior(pool, tree, trackers[1], pool.behavior_inputs())
+    
+    times = [0.0, 0.0]
+    tracker = trackers[0]
+    begin = time.perf_counter()
+    for player_pos in path:
+        for enemy in groups[0]:
+            enemy.behavior_timer += dt
+            blackboard = enemy.blackboard
+            blackboard.time += dt
+            if enemy.behavior_timer >= enemy.behavior_rate:
+                blackboard.player_pos = player_pos
+                blackboard.game_map = game_map
+                blackboard.dt = dt
+                if tracker.needs_tick(blackboard):
+                    tree.tick(blackboard)
+                enemy.behavior_timer = 0
+    times[0] = time.perf_counter() - begin
+    
+    for player_pos in path:
+        # Los temporizadores del pool (paso de cada fila) no se miden
+        pool.advance_timers(dt)
+        begin = time.perf_counter()
+        batch.tick(player_pos, game_map)
+        times[1] += time.perf_counter() - begin
+    
+    same = trackers[0].executed == trackers[1].executed and all(
+        (a.state, a.target_pos, a.current_patrol_index, a.player_detected) ==
+        (b.state, b.target_pos, b.current_patrol_index, b.player_detected)
+        for a, b in zip(*groups)
+    )
+    return times, trackers[1].executed, same
+
+def run_dirty(enemy_counts=(100, 1000), ticks=50, seed=7):
+    """
+    Ticks con el jugador caminando entre los enemigos: el árbol de todos en
+    cada tick frente a solo los enemigos con alguna entrada cambiada
+    """
+    print(f"{'enemigos':>9} {'siempre us/tick':>16} {'sucios us/tick':>15} {'mejora':>7} "
+          f"{'ejecutados':>11} {'saltados':>9}")
+    game_map = GameMap(Config.MAP_WIDTH, Config.MAP_HEIGHT)
+    tree = CompiledTree(Enemy.create_behavior_tree())
+    # El jugador cruza la pantalla: 4 píxeles por tick
+    path = [(100 + 4 * step, Config.SCREEN_HEIGHT // 2) for step in range(ticks)]
+    for count in enemy_counts:
+        times = []
+        for enabled in (False, True):
+            enemies = build_enemies(count, seed)
+            tracker = DirtyTracker(tree, Enemy.behavior_inputs(), enabled)
+            begin = time.perf_counter()
+            for player_pos in path:
+                for enemy in enemies:
+                    blackboard = enemy.blackboard
+                    blackboard.player_pos = player_pos
+                    blackboard.game_map = game_map
+                    if tracker.needs_tick(blackboard):
+                        tree.tick(blackboard)
+            times.append(time.perf_counter() - begin)
+        print(f"{count:>9} {times[0] * 1e6 / ticks:16.0f} {times[1] * 1e6 / ticks:15.0f} "
+              f"{times[0] / times[1]:6.2f}x {tracker.executed:11d} {tracker.skipped:9d}")
+
+def run_lod(enemy_counts=(100, 300), size=(64, 48), frames=600, seed=7):
+    """
+    Enemy.update de una oleada repartida por un mapa más grande que la
+    pantalla, con las mismas frecuencias para todos frente a bandas de
+    distancia (AILevelOfDetail)
+    """
+    print(f"{'enemigos':>9} {'sin LOD ms/frame':>17} {'con LOD ms/frame':>17} {'mejora':>7} "
+          f"{'por banda':>15}")
+    dt = 1 / 60
+    player_pos = (size[0] * Config.TILE_SIZE // 2, size[1] * Config.TILE_SIZE // 2)
+    for count in enemy_counts:
+        times = []
+        for use_lod in (False, True):
+            random.seed(seed)
+            game_map = GameMap(size[0], size[1])
+            enemies = []
+            for _ in range(count):
+                x, y = game_map.get_random_walkable_position()
+                enemies.append(Enemy(x, y, None))
+            lod = AILevelOfDetail() if use_lod else None
+            if lod:
+                for enemy in enemies:
+                    lod.register(enemy, player_pos)
+            
+            begin = time.perf_counter()
+            for _ in range(frames):
+                if lod:
+                    lod.update(dt, enemies, player_pos)
+                for enemy in enemies:
+                    enemy.update(dt, player_pos, game_map)
+            times.append(time.perf_counter() - begin)
+        bands = "/".join(str(band) for band in lod.get_stats()['bands'])
+        print(f"{count:>9} {times[0] * 1000 / frames:17.2f} {times[1] * 1000 / frames:17.2f} "
+              f"{times[0] / times[1]:6.2f}x {bands:>15}")
+
+def run_pool(enemy_counts=(500, 2000, 5000), frames=300, seed=7):
+    """
+    Temporizadores y movimiento por caminos al azar, con los intervalos de
+    movimiento de las bandas del LOD: Enemy.advance_timers y Enemy.move de
+    cada enemigo frente a EnemyPool en lote. Verifica que las posiciones
+    finales son las mismas
+    """
+    print(f"{'enemigos':>9} {'objetos ms/frame':>17} {'pool ms/frame':>14} {'mejora':>7} {'iguales':>8}")
+    dt = 1 / 60
+    for count in enemy_counts:
+        rng = random.Random(seed)
+        paths = [[(rng.uniform(0, Config.SCREEN_WIDTH), rng.uniform(0, Config.SCREEN_HEIGHT))
+                  for _ in range(20)] for _ in range(count)]
+        pool = EnemyPool()
+        groups = (
+            [Enemy(path[0][0], path[0][1], None) for path in paths],
+            [pool.spawn(path[0][0], path[0][1], None) for path in paths]
+        )
+        times = []
+        for enemies in groups:
+            for i, (enemy, path) in enumerate(zip(enemies, paths)):
+                enemy.move_interval = Config.AI_LOD_BANDS[i % len(Config.AI_LOD_BANDS)][3]
+                enemy.set_path(path)
+            begin = time.perf_counter()
+            if enemies is groups[0]:
+                for _ in range(frames):
+                    for enemy in enemies:
+                        step = enemy.movement_step(dt)
+                        if step is not None:
+                            enemy.advance_timers(step)
+                            enemy.move(step)
+            else:
+                for _ in range(frames):
+                    pool.advance_timers(dt)
+                    pool.integrate(dt)
+            times.append(time.perf_counter() - begin)
+        same = all(a.x == b.x and a.y == b.y and a.rect == b.rect and
+                   a.facing_direction == b.facing_direction and a.path_age == b.path_age
+                   for a, b in zip(*groups))
+        print(f"{count:>9} {times[0] * 1000 / frames:17.2f} {times[1] * 1000 / frames:14.2f} "
+              f"{times[0] / times[1]:6.2f}x {'sí' if same else 'NO':>8}")
+
+def run_profile(count=500, repeats=20, seed=7):
+    """
+    Perfil por nodo del árbol de los enemigos (BehaviorProfiler) y costo de
+    la instrumentación frente al árbol sin instrumentar
+    """
+    game_map = GameMap(Config.MAP_WIDTH, Config.MAP_HEIGHT)
+    player_pos = (Config.SCREEN_WIDTH // 2, Config.SCREEN_HEIGHT // 2)
+    enemies = build_enemies(count, seed)
+    contexts = []
+    for enemy in enemies:
+        blackboard = enemy.blackboard
+        blackboard.player_pos = player_pos
+        blackboard.game_map = game_map
+        contexts.append(blackboard)
+    
+    plain = Enemy.create_behavior_tree()
+    profiler = BehaviorProfiler()
+    profiled = profiler.instrument(Enemy.create_behavior_tree())
+    base = time_ticks([plain] * count, contexts, repeats)
+    measured = time_ticks([profiled] * count, contexts, repeats)
+    print(profiler.format_table())
+    print(f"instrumentado: {measured / base:.2f}x el tiempo del árbol sin instrumentar")
+
+def enemy_behavior_file():
+    """
+    Ruta del archivo del árbol de los enemigos
+    """
+    return os.path.join(PROJECT_DIR, Config.ENEMY_BEHAVIOR_FILE)
+
+def run_loader(archetypes=50, spawns=1000):
+    """
+    Carga de archetypes arquetipos (copias del árbol de los enemigos en una
+    carpeta temporal) con BehaviorLibrary: una lectura por archivo, y después
+    el costo de pedir el árbol al aparecer cada enemigo
+    """
+    library = BehaviorLibrary(Enemy.behavior_registry())
+    with open(enemy_behavior_file(), "r", encoding="utf-8") as file:
+        definition = file.read()
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(archetypes):
+            path = os.path.join(directory, f"enemy_{i}.json")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(definition)
+            paths.append(path)
+        
+        begin = time.perf_counter()
+        library.load_directory(directory)
+        loading = time.perf_counter() - begin
+        
+        begin = time.perf_counter()
+        for i in range(spawns):
+            library.load(paths[i % archetypes])
+        spawning = time.perf_counter() - begin
+    
+    print(f"arquetipos: {archetypes}, lecturas: {library.parses}, "
+          f"carga: {loading * 1000:.2f} ms ({loading * 1e6 / archetypes:.0f} us por archivo)")
+    print(f"apariciones: {spawns}, lecturas después de cargar: {library.parses - archetypes}, "
+          f"{spawning * 1e6 / spawns:.2f} us por aparición")
+
+def build_trivial_tree(branches, depth):
+    """
+    Selector de branches secuencias con depth condiciones que siempre se
+    cumplen y una acción que falla: el tick recorre el árbol completo sin
+    que las hojas cuesten casi nada
+    """
+    selector = Selector()
+    for _ in range(branches):
+        sequence = Sequence()
+        for _ in range(depth):
+            sequence.add_child(Condition(lambda context: True))
+        sequence.add_child(Leaf(lambda context: "FAILURE"))
+        selector.add_child(sequence)
+    return BehaviorTree(selector)
+
+def run_overhead(shapes=((4, 2), (8, 4), (16, 8)), repeats=20000):
+    """
+    Costo de recorrer el árbol con hojas triviales (sin trabajo de la IA)
+    """
+    print(f"{'ramas':>6} {'prof.':>6} {'nodos':>6} {'árbol ticks/s':>14} "
+          f"{'compilado ticks/s':>18} {'mejora':>7}")
+    for branches, depth in shapes:
+        tree = build_trivial_tree(branches, depth)
+        program = CompiledTree(tree)
+        nodes = 1 + branches * (depth + 2)
+        contexts = [{}]
+        interpreted = time_ticks([tree], contexts, repeats)
+        flattened = time_ticks([program], contexts, repeats)
+        print(f"{branches:>6} {depth:>6} {nodes:>6} {repeats / interpreted:14.0f} "
+              f"{repeats / flattened:18.0f} {interpreted / flattened:6.2f}x")
+
+def build_random_node(rng, depth):
+    """
+    Nodo al azar con todos los tipos que traduce el compilador
+    """
+    if depth == 0 or rng.random() < 0.3:
+        if rng.random() < 0.5:
+            value = rng.random() < 0.5
+            return Condition(lambda context, value=value: value)
+        status = rng.choice(("SUCCESS", "FAILURE", "RUNNING"))
+        return Leaf(lambda context, status=status: status)
+    if rng.random() < 0.2:
+        return Inverter(build_random_node(rng, depth - 1))
+    node = Selector() if rng.random() < 0.5 else Sequence()
+    for _ in range(rng.randrange(4)):
+        node.add_child(build_random_node(rng, depth - 1))
+    return node
+
+def run_equivalence(trees=2000, depth=5, seed=7):
+    """
+    Compara el estado de árboles al azar interpretados y compilados
+    """
+    rng = random.Random(seed)
+    mismatches = 0
+    for _ in range(trees):
+        tree = BehaviorTree(build_random_node(rng, depth))
+        if STATUS_CODES[tree.tick({})] != CompiledTree(tree).tick({}):
+            mismatches += 1
+    print(f"árboles al azar: {trees}, diferencias: {mismatches}")
+
+if __name__ == "__main__":
+    run_enemy_tree()
+    print()
+    run_spawn()
+    print()
+    run_loader()
+    print()
+    run_batch()
+    print()
+    run_dirty()
+    print()
+    run_lod()
+    print()
+    run_pool()
+    print()
+    run_profile()
+    print()
+    run_overhead()
+    print()
+    run_equivalence()
\ No newline at end of file
@@ -0,0 +1,238 @@
+# Árbol de comportamiento de los enemigos evaluado en lote con NumPy - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+import numpy as np
+from scripts.config import Config
+from scripts.behavior_tree import walk
+
+# Árbol que reproduce evaluate: tipo, función y número de hijos de cada nodo
+# en orden de recorrido (assets/behaviors/enemy.json)
+BATCH_TREE = (
+    ('Selector', None, 4),
+    ('MemorySequence', None, 2),
+    ('Condition', 'is_health_low', 0),
+    ('Leaf', 'retreat_action', 0),
+    ('Sequence', None, 2),
+    ('Condition', 'is_player_in_attack_range', 0),
+    ('Leaf', 'attack_player_action', 0),
+    ('Sequence', None, 2),
+    ('Condition', 'is_player_in_sight', 0),
+    ('Leaf', 'chase_player_action', 0),
+    ('Leaf', 'patrol_action', 0)
+)
+
+def tree_signature(tree):
+    """
+    Forma del árbol (o de su raíz) comparable con BATCH_TREE
+    """
+    signature = []
+    for node in walk(getattr(tree, 'root', tree)):
+        function = getattr(node, 'condition_func', None) or getattr(node, 'action_func', None)
+        signature.append((type(node).__name__, getattr(function, '__name__', None), len(node.children)))
+    return tuple(signature)
+
+class BatchBehavior:
+    """
+    Evalúa el árbol de comportamiento de los enemigos de un EnemyPool a la vez
+    
+    El temporizador del árbol, el reloj y la marca de re-evaluación de cada
+    enemigo son columnas del pool, igual que las entradas del árbol que
+    guarda DirtyTracker (una columna por entrada). Cada frame, con unas pocas
+    operaciones de NumPy sobre todas las filas, se decide a quién le toca el
+    árbol y cuáles de esos tienen alguna entrada cambiada; en Python solo se
+    recorren esos últimos.
+    
+    Si el árbol es el de assets/behaviors/enemy.json (BATCH_TREE) también se
+    evalúa en lote: se juntan en arreglos las entradas de sus condiciones
+    (distancia al jugador, proporción de salud, rangos y visibilidad), se
+    calcula cada condición para todos con una operación y se resuelve la rama
+    de cada enemigo con máscaras, en el mismo orden de prioridad que el árbol:
+        
+        retirarse (salud baja) > atacar (en rango) > perseguir (a la vista) > patrullar
+    
+    La distancia al jugador se calcula una sola vez por enemigo. Después solo
+    queda escribir el estado y el objetivo de cada enemigo, que es lo mismo
+    que hacen las acciones del árbol (chase_player_action, etc.). Cualquier
+    otro árbol (por ejemplo de un arquetipo cargado de archivo) se ejecuta
+    enemigo por enemigo, pero solo para las filas que lo necesitan.
+    """
+    
+    def __init__(self, pool, tree, tracker, sources):
+        self.pool = pool
+        self.tree = tree
+        self.tracker = tracker
+        self.vectorized = tree_signature(tree) == BATCH_TREE
+        
+        # Fuente por lotes y columna del último valor de cada entrada del árbol
+        self.sources = [sources[key] for key in tracker.keys]
+        self.columns = [f"input_{key}" for key in tracker.keys]
+        for name in self.columns:
+            pool.add_column(name, np.float64)
+        
+        # Estadísticas
+        self.batches = 0   # Lotes evaluados
+        self.ticks = 0     # Enemigos evaluados en total
+    
+    @staticmethod
+    def supports(tree, sources):
+        """
+        Si todas las entradas del árbol tienen fuente por lotes
+        """
+        return all(key in sources for key in tree.inputs)
+    
+    def tick(self, player_pos, game_map):
+        """
+        Avanza el temporizador del árbol de cada fila y ejecuta el árbol de
+        las que les toca y tienen alguna entrada cambiada. Se llama después de
+        EnemyPool.advance_timers: cada fila avanza el tiempo de su paso (cero
+        si el LOD la deja esperar), como en Enemy.update. Retorna los enemigos
+        evaluados
+        """
+        pool = self.pool
+        count = pool.count
+        step = pool.step[:count]
+        timer = pool.behavior_timer[:count]
+        timer += step
+        pool.clock[:count] += step
+        due = pool.due[:count] & (timer >= pool.behavior_rate[:count])
+        timer[due] = 0.0
+        rows = np.flatnonzero(due)
+        
+        # Solo los enemigos con alguna entrada del árbol cambiada (DirtyTracker)
+        tracker = self.tracker
+        if tracker.enabled and len(rows):
+            changed = pool.dirty[rows]
+            for source, name in zip(self.sources, self.columns):
+                values = source(rows, player_pos)
+                column = getattr(pool, name)
+                changed |= values != column[rows]
+                column[rows] = values
+            skipped = len(rows) - int(np.count_nonzero(changed))
+            tracker.skipped += skipped
+            rows = rows[changed]
+            pool.dirty[rows] = False
+        tracker.executed += len(rows)
+        
+        views = pool.views
+        enemies = []
+        for i, dt in zip(rows.tolist(), step[rows].tolist()):
+            enemy = views[i]
+            blackboard = enemy.blackboard
+            blackboard.player_pos = player_pos
+            blackboard.game_map = game_map
+            blackboard.dt = dt
+            enemies.append(enemy)
+        
+        if self.vectorized and len(enemies) >= Config.BATCH_BEHAVIOR_MIN_SIZE:
+            self.evaluate(enemies, rows, player_pos, game_map)
+        else:
+            # Con pocos enemigos preparar los arreglos cuesta más que el árbol
+            tree = self.tree
+            for enemy in enemies:
+                tree.tick(enemy.blackboard)
+        return enemies
+    
+    def evaluate(self, enemies, rows, player_pos, game_map):
+        """
+        Un tick del árbol para los enemigos de la lista (rows son sus filas)
+        """
+        count = len(enemies)
+        pool = self.pool
+        self.batches += 1
+        self.ticks += count
+        
+        # Un tick que no pasa por los nodos: la memoria de los nodos
+        # (MemorySequence) deja de valer como en cualquier tick sin ellos
+        for enemy in enemies:
+            enemy.blackboard.ticks += 1
+        
+        # Entradas de todas las condiciones, tomadas de las columnas del pool
+        centers = np.empty((count, 2), dtype=np.float64)
+        centers[:, 0], centers[:, 1] = pool.centers(rows)
+        health = pool.health[rows]
+        max_health = pool.max_health[rows]
+        sight_range = pool.sight_range[rows]
+        attack_range = pool.attack_range[rows]
+        
+        dx = player_pos[0] - centers[:, 0]
+        dy = player_pos[1] - centers[:, 1]
+        distance = np.sqrt(dx * dx + dy * dy)
+        
+        # Ramas en orden de prioridad: cada una solo con los que no tomaron una anterior
+        retreat = health < max_health * 0.3
+        attack = ~retreat & (distance <= attack_range)
+        candidates = ~retreat & ~attack & (distance <= sight_range)
+        
+        # Visibilidad del lote del frame; sin él se traza la línea de vista
+        visible = pool.player_visible[rows]
+        chase = candidates & (visible > 0)
+        for i in np.flatnonzero(candidates & (visible < 0)).tolist():
+            enemy = enemies[i]
+            chase[i] = bool(enemy.astar.line_of_sight(enemy.rect.center, player_pos, game_map))
+        patrol = ~retreat & ~attack & ~chase
+        
+        for i in np.flatnonzero(attack).tolist():
+            enemies[i].state = "ATTACK"
+        
+        for i in np.flatnonzero(chase).tolist():
+            enemy = enemies[i]
+            enemy.player_detected = True
+            enemy.last_player_pos = player_pos
+            enemy.state = "CHASE"
+            enemy.target_pos = player_pos
+        
+        if retreat.any():
+            self.retreat(enemies, np.flatnonzero(retreat), centers, -dx, -dy, distance)
+        if patrol.any():
+            self.patrol(enemies, np.flatnonzero(patrol), centers)
+    
+    def retreat(self, enemies, indices, centers, dx, dy, distance):
+        """
+        Acción de retirada: objetivo a 100 píxeles en dirección opuesta al
+        jugador, dentro de la pantalla
+        """
+        length = distance[indices]
+        moving = length > 0
+        safe = np.where(moving, length, 1.0)
+        retreat_x = centers[indices, 0] + dx[indices] / safe * 100
+        retreat_y = centers[indices, 1] + dy[indices] / safe * 100
+        retreat_x = np.clip(retreat_x, 50, Config.SCREEN_WIDTH - 50)
+        retreat_y = np.clip(retreat_y, 50, Config.SCREEN_HEIGHT - 50)
+        
+        for i, x, y, move in zip(indices.tolist(), retreat_x.tolist(), retreat_y.tolist(),
+                                 moving.tolist()):
+            enemy = enemies[i]
+            enemy.state = "RETREAT"
+            if move:
+                enemy.target_pos = (x, y)
+    
+    def patrol(self, enemies, indices, centers):
+        """
+        Acción de patrulla: pasar al siguiente punto al llegar al actual (o
+        si no hay objetivo)
+        """
+        count = len(indices)
+        targets = [enemies[i].target_pos or (np.nan, np.nan) for i in indices.tolist()]
+        dx = np.fromiter([target[0] for target in targets], np.float64, count) - centers[indices, 0]
+        dy = np.fromiter([target[1] for target in targets], np.float64, count) - centers[indices, 1]
+        # NaN (sin objetivo) nunca es >= 20, así que también avanza; igual
+        # que patrol_action, también si el camino al punto ya terminó
+        finished = np.fromiter([enemies[i].finished_path_to_target() for i in indices.tolist()], bool, count)
+        advance = ~(np.sqrt(dx * dx + dy * dy) >= 20) | finished
+        
+        for i, step in zip(indices.tolist(), advance.tolist()):
+            enemy = enemies[i]
+            enemy.state = "PATROL"
+            if step:
+                enemy.current_patrol_index = (enemy.current_patrol_index + 1) % len(enemy.patrol_points)
+                enemy.target_pos = enemy.patrol_points[enemy.current_patrol_index]
+    
+    def get_stats(self):
+        """
+        Devuelve los contadores del lote
+        """
+        return {
+            'batches': self.batches,
+            'ticks': self.ticks
+        }
\ No newline at end of file
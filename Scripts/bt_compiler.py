@@ -0,0 +1,90 @@
+# Compilador del árbol de comportamiento - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+from scripts.behavior_tree import (
+    BehaviorTree, Selector, Sequence, Leaf, Condition, Inverter,
+    FAILURE, SUCCESS, RUNNING, STATUS_CODES, collect_inputs, is_stateful
+)
+
+# Estado invertido por un Inverter (RUNNING no cambia)
+INVERTED = (SUCCESS, FAILURE, RUNNING)
+
+class CompiledTree:
+    """
+    Árbol de comportamiento traducido a una sola función de Python
+    
+    Cada nodo se convierte en una expresión que deja su estado (un entero) en
+    la variable status: las condiciones y hojas llaman a su función, y las
+    Sequence y los Selector son cadenas de "or" que se cortan en el primer
+    hijo que no termina en SUCCESS o en FAILURE respectivamente. El resultado
+    es el mismo que el del árbol original, pero un tick es una sola llamada
+    sin recursión, sin buscar el método de cada nodo y sin comparar textos.
+    
+    tick() tiene la misma forma que BehaviorTree.tick pero retorna el estado
+    entero (STATUS_NAMES lo convierte a texto). Los nodos que el compilador
+    no traduce (los de memoria, Parallel, los propios) se ejecutan llamando a
+    su execute.
+    """
+    
+    def __init__(self, tree):
+        self.root = tree.root if isinstance(tree, BehaviorTree) else tree  # Árbol original
+        self.inputs = collect_inputs(self.root)  # Entradas que leen sus nodos
+        self.stateful = is_stateful(self.root)   # Tiene nodos con memoria (cuentan los ticks)
+        self.functions = []  # Funciones de hojas y condiciones (o nodos sin traducción)
+        expression = self.emit(self.root)
+        
+        # Las funciones entran como argumentos por defecto para que dentro
+        # del tick sean variables locales
+        arguments = ["codes=codes", "inverted=inverted"]
+        arguments += [f"f{i}=functions[{i}]" for i in range(len(self.functions))]
+        self.source = (
+            f"def tick(context, {', '.join(arguments)}):\n"
+            + ("    context.ticks += 1\n" if self.stateful else "")
+            + f"    return {expression}\n"
+        )
+        namespace = {
+            'functions': self.functions,
+            'codes': STATUS_CODES,
+            'inverted': INVERTED
+        }
+        exec(compile(self.source, "<behavior tree>", "exec"), namespace)
+        self.tick = namespace['tick']
+    
+    def add_function(self, function):
+        """
+        Registra una función y retorna su nombre dentro del tick
+        """
+        self.functions.append(function)
+        return f"f{len(self.functions) - 1}"
+    
+    def call(self, function):
+        """
+        Llamada a la función de un nodo con el contexto. Los métodos del
+        agente (agent_method) se llaman sin la función intermedia
+        """
+        method = getattr(function, 'agent_method', None)
+        if method is not None:
+            return f"{self.add_function(method)}(context.agent, context)"
+        return f"{self.add_function(function)}(context)"
+    
+    def emit(self, node):
+        """
+        Expresión de Python que evalúa el nodo (y sus hijos) y vale su estado
+        """
+        if isinstance(node, Condition):
+            return f"({SUCCESS} if {self.call(node.condition_func)} else {FAILURE})"
+        if isinstance(node, Leaf):
+            return f"codes[{self.call(node.action_func)}]"
+        if isinstance(node, Inverter):
+            return f"inverted[{self.emit(node.child)}]"
+        if type(node) in (Sequence, Selector):
+            # Sequence sigue mientras los hijos terminan en SUCCESS y Selector
+            # mientras terminan en FAILURE; si se recorren todos, ese es el
+            # estado. La cadena solo asigna status, su valor se descarta
+            keep = SUCCESS if type(node) is Sequence else FAILURE
+            terms = [f"(status := {self.emit(child)}) != {keep}" for child in node.children]
+            terms.append(f"(status := {keep})")
+            return f"(({' or '.join(terms)}) and status or status)"
+        # Nodo propio sin traducción: se ejecuta tal cual
+        return f"codes[{self.add_function(node)}.execute(context)]"
\ No newline at end of file
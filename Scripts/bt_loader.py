@@ -0,0 +1,208 @@
+# Árboles de comportamiento definidos en archivos (JSON o TOML) - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+import os
+import json
+from scripts.behavior_tree import (
+    BehaviorTree, Selector, Sequence, MemorySequence, MemorySelector, Parallel,
+    Inverter, Cooldown, Leaf, Condition
+)
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    tomllib = None
+
+# Nodos con hijos que se pueden usar en un archivo
+COMPOSITES = {
+    'Selector': Selector,
+    'Sequence': Sequence,
+    'MemorySelector': MemorySelector,
+    'MemorySequence': MemorySequence,
+    'Parallel': Parallel
+}
+
+# Campos permitidos en cada tipo de nodo
+FIELDS = {
+    'Condition': {'type', 'name'},
+    'Action': {'type', 'name'},
+    'Inverter': {'type', 'child'},
+    'Cooldown': {'type', 'child', 'duration'},
+    'Parallel': {'type', 'children', 'success_threshold'}
+}
+
+class BehaviorRegistry:
+    """
+    Condiciones, acciones y entradas con nombre que pueden usar los árboles
+    definidos en archivos
+    
+    Las funciones reciben el blackboard, como las de Condition y Leaf. Las
+    entradas que lee cada una (para DirtyTracker) se registran aquí junto con
+    la función, no en el archivo.
+    """
+    
+    def __init__(self):
+        self.conditions = {}  # Nombre -> (función, entradas que lee)
+        self.actions = {}     # Nombre -> (función, entradas que lee)
+        self.inputs = {}      # Nombre de la entrada -> función que la calcula
+    
+    def condition(self, name, function, reads=()):
+        """
+        Registra una condición
+        """
+        self.conditions[name] = (function, tuple(reads))
+    
+    def action(self, name, function, reads=()):
+        """
+        Registra una acción (hoja)
+        """
+        self.actions[name] = (function, tuple(reads))
+    
+    def input(self, name, function):
+        """
+        Registra la fuente de una entrada del blackboard
+        """
+        self.inputs[name] = function
+
+def read_definition(path):
+    """
+    Lee la definición de un árbol de un archivo .json o .toml
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    if extension == ".toml":
+        if tomllib is None:
+            raise ValueError(f"{path}: leer TOML requiere Python 3.11 o posterior")
+        with open(path, "rb") as file:
+            return tomllib.load(file)
+    raise ValueError(f"{path}: formato de árbol desconocido (se espera .json o .toml)")
+
+def build_tree(definition, registry, source="<árbol>"):
+    """
+    Valida la definición completa y construye el árbol. Los errores indican
+    el archivo y la posición del nodo (por ejemplo root.children[1].child)
+    """
+    if not isinstance(definition, dict) or 'root' not in definition:
+        raise ValueError(f"{source}: falta el nodo 'root'")
+    builder = TreeBuilder(registry, source)
+    tree = BehaviorTree(builder.build(definition['root'], "root"))
+    
+    # Cada entrada que leen los nodos necesita una fuente registrada
+    missing = tree.inputs - set(registry.inputs)
+    if missing:
+        raise ValueError(f"{source}: entradas sin fuente en el registro: {', '.join(sorted(missing))}")
+    return tree
+
+class TreeBuilder:
+    """
+    Convierte la definición de cada nodo en el nodo del árbol
+    """
+    
+    def __init__(self, registry, source):
+        self.registry = registry
+        self.source = source
+    
+    def error(self, path, message):
+        return ValueError(f"{self.source}: {path}: {message}")
+    
+    def build(self, spec, path):
+        """
+        Construye el nodo de spec y sus hijos
+        """
+        if not isinstance(spec, dict):
+            raise self.error(path, "cada nodo debe ser un objeto")
+        kind = spec.get('type')
+        if kind in COMPOSITES:
+            allowed = FIELDS.get(kind, {'type', 'children'})
+        elif kind in FIELDS:
+            allowed = FIELDS[kind]
+        else:
+            raise self.error(path, f"tipo de nodo desconocido: {kind!r}")
+        unknown = set(spec) - allowed
+        if unknown:
+            raise self.error(path, f"campos desconocidos en {kind}: {', '.join(sorted(unknown))}")
+        
+        if kind == 'Condition':
+            function, reads = self.lookup(self.registry.conditions, spec, path, "condición")
+            return Condition(function, reads)
+        if kind == 'Action':
+            function, reads = self.lookup(self.registry.actions, spec, path, "acción")
+            return Leaf(function, reads)
+        if kind in ('Inverter', 'Cooldown'):
+            if 'child' not in spec:
+                raise self.error(path, f"{kind} necesita 'child'")
+            child = self.build(spec['child'], f"{path}.child")
+            if kind == 'Inverter':
+                return Inverter(child)
+            duration = spec.get('duration')
+            if isinstance(duration, bool) or not isinstance(duration, (int, float)) or duration < 0:
+                raise self.error(path, "Cooldown necesita 'duration' (segundos, >= 0)")
+            return Cooldown(child, float(duration))
+        
+        # Nodos con hijos
+        children = spec.get('children')
+        if not isinstance(children, list) or not children:
+            raise self.error(path, f"{kind} necesita una lista 'children' no vacía")
+        if kind == 'Parallel':
+            threshold = spec.get('success_threshold')
+            if threshold is not None and (isinstance(threshold, bool) or not isinstance(threshold, int)
+                                          or not 1 <= threshold <= len(children)):
+                raise self.error(path, f"success_threshold debe estar entre 1 y {len(children)}")
+            node = Parallel(threshold)
+        else:
+            node = COMPOSITES[kind]()
+        # Tupla: el árbol cargado es compartido y no se modifica
+        node.children = tuple(self.build(child, f"{path}.children[{i}]")
+                              for i, child in enumerate(children))
+        return node
+    
+    def lookup(self, table, spec, path, what):
+        """
+        Función y entradas registradas con el nombre del nodo
+        """
+        name = spec.get('name')
+        if name not in table:
+            raise self.error(path, f"{what} no registrada: {name!r}")
+        return table[name]
+
+class BehaviorLibrary:
+    """
+    Caché de árboles cargados de archivos
+    
+    Cada archivo se lee, se valida y se construye una sola vez; después todos
+    los agentes que lo usan reciben el mismo árbol (compartido, con su estado
+    en el blackboard de cada uno). load_directory carga de una vez todos los
+    arquetipos de una carpeta.
+    """
+    
+    def __init__(self, registry):
+        self.registry = registry
+        self.trees = {}  # Ruta absoluta -> árbol
+        self.parses = 0  # Archivos leídos
+    
+    def load(self, path):
+        """
+        Devuelve el árbol del archivo, leyéndolo solo la primera vez
+        """
+        key = os.path.abspath(path)
+        tree = self.trees.get(key)
+        if tree is None:
+            definition = read_definition(path)
+            self.parses += 1
+            tree = build_tree(definition, self.registry, path)
+            self.trees[key] = tree
+        return tree
+    
+    def load_directory(self, directory):
+        """
+        Carga todos los árboles de la carpeta. Retorna {nombre del archivo sin extensión: árbol}
+        """
+        trees = {}
+        for filename in sorted(os.listdir(directory)):
+            name, extension = os.path.splitext(filename)
+            if extension.lower() in (".json", ".toml"):
+                trees[name] = self.load(os.path.join(directory, filename))
+        return trees
\ No newline at end of file
@@ -0,0 +1,161 @@
+# Perfilado del árbol de comportamiento por nodo - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+import copy
+import json
+import time
+import pygame
+from scripts.config import Config
+from scripts.behavior_tree import BehaviorTree, Node, Leaf, Condition, STATUS_NAMES
+
+class ProfiledNode(Node):
+    """
+    Envoltorio de un nodo que cuenta sus ejecuciones, sus resultados y el
+    tiempo acumulado (incluye el de sus hijos)
+    """
+    
+    def __init__(self, node, path, depth):
+        super().__init__()
+        self.child = node   # Nodo envuelto (como en Inverter)
+        self.path = path    # Posición en el árbol ("0.2.1")
+        self.depth = depth
+        self.label = node_label(node)
+        self.executions = 0
+        self.counts = {name: 0 for name in STATUS_NAMES}
+        self.time = 0.0     # Segundos acumulados
+    
+    def execute(self, context):
+        begin = time.perf_counter()
+        result = self.child.execute(context)
+        self.time += time.perf_counter() - begin
+        self.executions += 1
+        # Los nodos propios pueden devolver el estado entero
+        name = result if isinstance(result, str) else STATUS_NAMES[result]
+        self.counts[name] += 1
+        return result
+    
+    def to_dict(self):
+        """
+        Estadísticas del nodo para el volcado en JSON
+        """
+        return {
+            'path': self.path,
+            'node': self.label,
+            'executions': self.executions,
+            'counts': dict(self.counts),
+            'total_ms': self.time * 1000,
+            'us_per_execution': self.time * 1e6 / self.executions if self.executions else 0.0
+        }
+
+def node_label(node):
+    """
+    Nombre legible de un nodo: su clase y, en hojas y condiciones, su función
+    """
+    name = type(node).__name__
+    function = None
+    if isinstance(node, Condition):
+        function = node.condition_func
+    elif isinstance(node, Leaf):
+        function = node.action_func
+    if function is not None:
+        return f"{name} {getattr(function, '__name__', type(function).__name__)}"
+    return name
+
+class BehaviorProfiler:
+    """
+    Instrumentación opcional del árbol de comportamiento
+    
+    instrument() envuelve cada nodo del árbol en un ProfiledNode; el árbol
+    sin instrumentar no cambia en nada, así que con el perfilado apagado no
+    hay ningún costo. Las estadísticas se pueden volcar a JSON o a una tabla
+    de texto y dibujar encima del juego.
+    """
+    
+    def __init__(self):
+        self.nodes = []  # ProfiledNode en orden de recorrido
+        self.font = None
+    
+    def instrument(self, tree):
+        """
+        Envuelve todos los nodos del árbol y retorna el árbol instrumentado
+        """
+        root = tree.root if isinstance(tree, BehaviorTree) else tree
+        return BehaviorTree(self.wrap(root, "0", 0))
+    
+    def wrap(self, node, path, depth):
+        """
+        Envuelve una copia de node y, antes, a sus hijos. El árbol original
+        (compartido, por ejemplo el de BehaviorLibrary) no se modifica
+        """
+        node = copy.copy(node)
+        profiled = ProfiledNode(node, path, depth)
+        self.nodes.append(profiled)
+        node.children = [self.wrap(child, f"{path}.{i}", depth + 1)
+                         for i, child in enumerate(node.children)]
+        if getattr(node, 'child', None) is not None:
+            node.child = self.wrap(node.child, f"{path}.0", depth + 1)
+        return profiled
+    
+    def reset(self):
+        """
+        Pone en cero los contadores de todos los nodos
+        """
+        for node in self.nodes:
+            node.executions = 0
+            node.counts = {name: 0 for name in STATUS_NAMES}
+            node.time = 0.0
+    
+    def report(self):
+        """
+        Estadísticas de cada nodo en orden de recorrido
+        """
+        return [node.to_dict() for node in self.nodes]
+    
+    def format_table(self):
+        """
+        Tabla de texto con una fila por nodo (sangrada según la profundidad)
+        """
+        lines = [f"{'nodo':<44} {'ejec':>8} {'SUCCESS':>8} {'FAILURE':>8} {'RUNNING':>8} "
+                 f"{'total ms':>9} {'us/ejec':>8}"]
+        for node in self.nodes:
+            per_execution = node.time * 1e6 / node.executions if node.executions else 0.0
+            label = "  " * node.depth + node.label
+            lines.append(f"{label:<44} {node.executions:>8} {node.counts['SUCCESS']:>8} "
+                         f"{node.counts['FAILURE']:>8} {node.counts['RUNNING']:>8} "
+                         f"{node.time * 1000:9.2f} {per_execution:8.2f}")
+        return "\n".join(lines)
+    
+    def dump(self, path):
+        """
+        Guarda las estadísticas en path: JSON si termina en .json, si no la
+        tabla de texto
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            if path.endswith(".json"):
+                json.dump(self.report(), file, indent=2, ensure_ascii=False)
+            else:
+                file.write(self.format_table() + "\n")
+    
+    def render(self, screen, position=(10, 190)):
+        """
+        Dibuja la tabla sobre el juego
+        """
+        if self.font is None:
+            # Monoespaciada para que las columnas queden alineadas
+            self.font = pygame.font.SysFont("couriernew,dejavusansmono,monospace", 13)
+        
+        lines = self.format_table().split("\n")
+        line_height = self.font.get_linesize()
+        width = max(self.font.size(line)[0] for line in lines) + 20
+        height = line_height * len(lines) + 10
+        
+        panel = pygame.Surface((width, height))
+        panel.set_alpha(200)
+        panel.fill(Config.BLACK)
+        screen.blit(panel, position)
+        
+        x, y = position[0] + 10, position[1] + 5
+        for line in lines:
+            screen.blit(self.font.render(line, True, Config.WHITE), (x, y))
+            y += line_height
\ No newline at end of file
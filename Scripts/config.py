@@ -48,7 +48,42 @@ class Config:
     
     # Configuración de la IA
     BEHAVIOR_TREE_UPDATE_RATE = 0.1  # segundos
-    PATHFINDING_UPDATE_RATE = 0.5    # segundos
+    ENEMY_BEHAVIOR_FILE = "assets/behaviors/enemy.json"  # Árbol del enemigo (JSON o TOML)
+    USE_COMPILED_BEHAVIOR_TREE = True  # Ejecutar el árbol compilado a una sola función
+    USE_BATCH_BEHAVIOR_TREE = True   # Evaluar el árbol de todos los enemigos en lote (NumPy, requiere USE_ENEMY_POOL)
+    BATCH_BEHAVIOR_MIN_SIZE = 32     # Con menos enemigos por tick se usa el árbol de cada uno
+    USE_DIRTY_BEHAVIOR_TREE = True   # Saltar el tick si no cambió ninguna entrada de las condiciones
+    BEHAVIOR_TREE_PROFILING = False  # Contar ejecuciones, resultados y tiempo de cada nodo (sin compilar ni lote)
+    BEHAVIOR_TREE_PROFILE_FILE = "behavior_profile.json"  # Volcado al salir (.json o tabla de texto)
+    PATHFINDING_UPDATE_RATE = 0.5    # Antigüedad mínima del camino para volver a pedirlo
+    PATHFINDING_NODE_BUDGET = 400    # Nodos A* expandidos por frame (todos los enemigos)
+    PATHFINDING_SLICE_NODES = 64     # Nodos por búsqueda en cada turno
+    PATHFINDING_MAX_PENDING = 64     # Solicitudes en cola antes de descartar
+    PATHFINDING_STALENESS_WEIGHT = 200  # Píxeles de prioridad por segundo de antigüedad
+    PATHFINDING_WORKERS = 0          # Procesos para A* (0 = búsquedas por frames en el game loop)
+    PATHFINDING_JOBS_PER_WORKER = 4  # Búsquedas en vuelo por proceso
+    PATHFINDING_WORKER_MAX_EDITS = 256  # Casillas cambiadas que se envían a los procesos antes de reiniciarlos
+    PATH_CACHE_SIZE = 256            # Caminos guardados en la caché LRU
+    PATHFINDING_MODE = "theta"       # "astar", "jps" (Jump Point Search) o "theta" (Lazy Theta*)
+    HPA_CLUSTER_SIZE = 16            # Casillas por lado de cada cluster (HPA*)
+    HPA_WIDE_ENTRANCE = 6            # Entradas con más casillas usan dos transiciones
+    PATHFINDING_SNAP_GOAL = True     # Objetivo inalcanzable: ir a la casilla alcanzable más cercana
+    USE_LANDMARKS = False            # Precalcular la heurística de landmarks (ALT) del mapa
+    LANDMARK_COUNT = 8               # Landmarks por mapa
+    LANDMARK_ACTIVE = 3              # Landmarks usados en cada búsqueda (los de mejor cota)
+    USE_NAV_MESH = False             # Caminos sobre la malla de navegación de rectángulos
+    CHASE_PATHFINDING = "dstar_lite" # Al perseguir: "dstar_lite", "flow_field", "cooperative" (WHCA*) o "astar"
+    COOPERATIVE_WINDOW = 8           # Pasos de tiempo que planifica y reserva cada enemigo
+    COOPERATIVE_NODE_LIMIT = 128     # Nodos espacio-tiempo por búsqueda
+    USE_AI_LOD = True                # Actualizar con menos frecuencia a los enemigos lejanos
+    USE_ENEMY_POOL = True            # Posiciones y temporizadores de los enemigos en arreglos de NumPy
+    AI_LOD_BANDS = (                 # (distancia máxima, árbol s, camino s, movimiento s)
+        (320, BEHAVIOR_TREE_UPDATE_RATE, PATHFINDING_UPDATE_RATE, 0),
+        (640, 0.25, 1.0, 1 / 30),
+        (float("inf"), 0.5, 2.0, 1 / 15)
+    )
+    AI_LOD_HYSTERESIS = 32           # Píxeles más allá del límite para cambiar de banda
+    AI_LOD_UPDATE_RATE = 0.25        # Segundos entre recálculos de las bandas
     ENEMY_SIGHT_RANGE = 150
     ENEMY_ATTACK_RANGE = 100
     
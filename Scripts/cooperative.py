@@ -0,0 +1,269 @@
+# Pathfinding cooperativo (WHCA*) para los enemigos que persiguen - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+import heapq
+import math
+from scripts.config import Config
+from scripts.flow_field import FlowField
+
+class ReservationTable:
+    """
+    Tabla espacio-tiempo compartida: qué enemigo ocupa cada casilla en cada
+    paso de tiempo
+    """
+    
+    def __init__(self):
+        self.steps = {}   # paso -> {índice de casilla: dueño}
+        self.owned = {}   # dueño -> [(paso, índice)] para liberar sus reservas
+    
+    def owner(self, step, index):
+        """
+        Devuelve quién reservó la casilla en ese paso (None si está libre)
+        """
+        cells = self.steps.get(step)
+        return cells.get(index) if cells else None
+    
+    def reserve(self, owner, step, index):
+        """
+        Reserva la casilla para owner en ese paso si nadie la tiene.
+        Retorna si quedó reservada
+        """
+        cells = self.steps.setdefault(step, {})
+        if cells.setdefault(index, owner) is not owner:
+            return False
+        self.owned.setdefault(owner, []).append((step, index))
+        return True
+    
+    def release(self, owner):
+        """
+        Libera todas las reservas de owner
+        """
+        for step, index in self.owned.pop(owner, ()):
+            cells = self.steps.get(step)
+            if cells and cells.get(index) is owner:
+                del cells[index]
+    
+    def expire(self, step):
+        """
+        Descarta los pasos anteriores a step
+        """
+        for old in [old for old in self.steps if old < step]:
+            del self.steps[old]
+    
+    def __len__(self):
+        return sum(len(cells) for cells in self.steps.values())
+
+class CooperativePlanner:
+    """
+    A* cooperativo con ventana (WHCA*) para los enemigos que persiguen
+    
+    Cada enemigo planifica solo los próximos window pasos en el espacio-tiempo
+    (casilla, paso), esquivando las casillas que otros ya reservaron y sin
+    cruzarse de frente con ellos, y luego reserva su propio plan. Más allá de
+    la ventana se usa como heurística la distancia del campo de flujo hacia el
+    jugador, que es exacta sobre la rejilla. Cada búsqueda expande como máximo
+    node_limit nodos y se repite cada window / 2 pasos, así que el costo por
+    frame crece de forma lineal con la cantidad de enemigos.
+    
+    Un paso de tiempo es lo que tarda un enemigo en cruzar una casilla.
+    """
+    
+    # 8 direcciones del A* y esperar en el lugar
+    MOVES = (
+        (-1, -1), (-1, 0), (-1, 1),
+        (0, -1),  (0, 0),  (0, 1),
+        (1, -1),  (1, 0),  (1, 1)
+    )
+    
+    def __init__(self, flow_field=None, window=None, node_limit=None):
+        self.flow_field = flow_field or FlowField()
+        self.owns_field = flow_field is None  # Si es propio hay que actualizarlo aquí
+        self.window = window or Config.COOPERATIVE_WINDOW
+        self.node_limit = node_limit or Config.COOPERATIVE_NODE_LIMIT
+        self.grid_size = Config.TILE_SIZE
+        self.step_time = Config.TILE_SIZE / Config.ENEMY_SPEED
+        
+        self.table = ReservationTable()
+        self.plans = {}  # enemigo -> (paso inicial, [índices por paso], versión del mapa)
+        self.time = 0.0
+        self.step = 0
+        
+        # Estadísticas
+        self.replans = 0
+        self.nodes_expanded = 0
+        self.waits = 0  # Pasos de espera planificados
+    
+    def update(self, dt, target_pos=None, game_map=None):
+        """
+        Avanza el reloj y descarta las reservas de pasos ya pasados
+        """
+        if self.owns_field and target_pos is not None and game_map is not None:
+            self.flow_field.update(target_pos, game_map)
+        
+        self.time += dt
+        step = int(self.time / self.step_time + 1e-9)
+        if step != self.step:
+            self.step = step
+            self.table.expire(step)
+    
+    def next_step(self, requester, position, game_map):
+        """
+        Devuelve la posición (en píxeles) a la que debe ir el enemigo en el
+        siguiente paso; si es su misma casilla le toca esperar
+        
+        Retorna None si la posición está fuera del campo de flujo o no puede
+        llegar al jugador.
+        """
+        field = self.flow_field
+        gs = self.grid_size
+        width = field.width
+        x = int(position[0] // gs)
+        y = int(position[1] // gs)
+        if field.game_map is not game_map or not (0 <= x < width and 0 <= y < field.height):
+            return None
+        index = y * width + x
+        if field.next_index[index] < 0:
+            return None
+        
+        # El enemigo avanza de forma continua, así que puede ir un paso
+        # adelantado o atrasado respecto al reloj; con más diferencia (o con el
+        # plan a medio consumir) se vuelve a planificar. Si el jugador cambia de
+        # casilla el plan se conserva: la ventana es corta
+        plan = self.plans.get(requester)
+        if plan and plan[2] == game_map.version:
+            start, tiles = plan[0], plan[1]
+            k = self.step - start
+            for j in (k, k + 1, k - 1):
+                if 0 <= j < len(tiles) and tiles[j] == index:
+                    if j < len(tiles) - self.window // 2:
+                        target = tiles[j + 1]
+                        return ((target % width) * gs, (target // width) * gs)
+                    break
+        
+        target = self.plan(requester, index, game_map)[1]
+        return ((target % width) * gs, (target // width) * gs)
+    
+    def plan(self, requester, index, game_map):
+        """
+        A* espacio-tiempo desde index durante window pasos. Reserva el plan y
+        retorna la casilla de cada paso
+        """
+        self.table.release(requester)
+        self.replans += 1
+        
+        field = self.flow_field
+        width, height = field.width, field.height
+        distance = field.distance
+        goal_x, goal_y = field.goal_tile
+        goal = goal_y * width + goal_x
+        walkable = game_map.walkable
+        owner = self.table.owner
+        window = self.window
+        start_step = self.step
+        diagonal = math.sqrt(2)
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        # Nodos (casilla, t) con t relativo al paso actual
+        root = (index, 0)
+        g_score = {root: 0.0}
+        parent = {root: None}
+        closed = set()
+        counter = 0
+        open_heap = [(distance[index], counter, root)]
+        best = root
+        best_key = (0, -distance[index])
+        expanded = 0
+        
+        while open_heap and expanded < self.node_limit:
+            _, _, node = heappop(open_heap)
+            if node in closed:
+                continue
+            closed.add(node)
+            expanded += 1
+            
+            current, t = node
+            if t == window:
+                best = node
+                break
+            # Si se acaba el presupuesto se usa el nodo más profundo y cercano
+            key = (t, -distance[current])
+            if key > best_key:
+                best, best_key = node, key
+            
+            cx = current % width
+            cy = current // width
+            step = start_step + t
+            g = g_score[node]
+            for dx, dy in self.MOVES:
+                nx = cx + dx
+                ny = cy + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                neighbor = ny * width + nx
+                if not walkable[neighbor] or distance[neighbor] == math.inf:
+                    continue
+                
+                # Casilla reservada por otro en el paso siguiente
+                other = owner(step + 1, neighbor)
+                if other is not None and other is not requester:
+                    continue
+                # Intercambio de casillas de frente con otro enemigo
+                if neighbor != current:
+                    other = owner(step, neighbor)
+                    if (other is not None and other is not requester and
+                            owner(step + 1, current) is other):
+                        continue
+                
+                child = (neighbor, t + 1)
+                if child in closed:
+                    continue
+                if dx == 0 and dy == 0:
+                    cost = 0.0 if current == goal else 1.0
+                else:
+                    cost = 1.0 if dx == 0 or dy == 0 else diagonal
+                new_g = g + cost
+                if new_g < g_score.get(child, math.inf):
+                    g_score[child] = new_g
+                    parent[child] = node
+                    counter += 1
+                    heappush(open_heap, (new_g + distance[neighbor], counter, child))
+        
+        self.nodes_expanded += expanded
+        
+        tiles = []
+        node = best
+        while node is not None:
+            tiles.append(node[0])
+            node = parent[node]
+        tiles.reverse()
+        if len(tiles) == 1:
+            tiles.append(index)  # Sin movimientos posibles: esperar
+        
+        reserve = self.table.reserve
+        for t, tile in enumerate(tiles):
+            reserve(requester, start_step + t, tile)
+            if t and tile == tiles[t - 1]:
+                self.waits += 1
+        self.plans[requester] = (start_step, tiles, game_map.version)
+        return tiles
+    
+    def release(self, requester):
+        """
+        Olvida el plan y las reservas de un enemigo (p. ej. al morir)
+        """
+        self.plans.pop(requester, None)
+        self.table.release(requester)
+    
+    def get_stats(self):
+        """
+        Devuelve los contadores del planificador
+        """
+        return {
+            'planned': len(self.plans),
+            'reservations': len(self.table),
+            'replans': self.replans,
+            'nodes_expanded': self.nodes_expanded,
+            'waits': self.waits
+        }
\ No newline at end of file
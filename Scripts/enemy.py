@@ -5,17 +5,34 @@
 import pygame
 import math
 import random
+import os
 from scripts.config import Config
 from scripts.bullet import Bullet
-from scripts.behavior_tree import BehaviorTree, Selector, Sequence, Leaf, Condition
-from scripts.astar import AStar
+from scripts.behavior_tree import Blackboard, DirtyTracker, agent_method
+from scripts.bt_compiler import CompiledTree
+from scripts.bt_loader import BehaviorRegistry, BehaviorLibrary
+from scripts.bt_profiler import BehaviorProfiler
+from scripts.astar import AStar, DStarLite
+
+# Carpeta del proyecto: las rutas de Config son relativas a ella
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 class Enemy:
     """
     Clase que representa un enemigo con IA avanzada
     """
     
-    def __init__(self, x, y, sprite_manager, skin_manager=None):
+    # Formas de perseguir al jugador (Config.CHASE_PATHFINDING)
+    CHASE_MODES = ("cooperative", "flow_field", "dstar_lite", "astar")
+    
+    # Estados de la IA (EnemyPool guarda el índice)
+    STATES = ("PATROL", "CHASE", "ATTACK", "RETREAT")
+    STATE_CODES = {state: code for code, state in enumerate(STATES)}
+    
+    # Blackboard de cada enemigo (PooledEnemy guarda parte en el pool)
+    blackboard_class = Blackboard
+    
+    def __init__(self, x, y, sprite_manager, skin_manager=None, game_map=None):
         self.x = x
         self.y = y
         self.sprite_manager = sprite_manager
@@ -30,54 +47,29 @@ class Enemy:
         # IA y comportamiento
         self.target_pos = None
         self.state = "PATROL"  # PATROL, CHASE, ATTACK, RETREAT
-        self.behavior_tree = self.create_behavior_tree()
+        self.behavior_tree = self.get_behavior_tree()  # Compartido por todos los enemigos
+        self.blackboard = self.blackboard_class(self)   # Contexto propio para el árbol
+        self.behavior_tracker = self.get_behavior_tracker()  # Salta ticks sin cambios
         self.behavior_timer = 0
         
-        # Pathfinding A*
-        self.astar = AStar()
-        self.path = []
-        self.current_path_index = 0
-        self.pathfinding_timer = 0
-        
-        # Sistema de disparo
-        self.shoot_cooldown = 0
-        self.shoot_delay = 1.5  # Segundos entre disparos
-        self.last_shot_time = 0
-        
-        # Detección del jugador
-        self.sight_range = Config.ENEMY_SIGHT_RANGE
-        self.attack_range = Config.ENEMY_ATTACK_RANGE
-        self.player_detected = False
-        self.last_player_pos = None
-        
-        # Patrullaje
-        self.patrol_points = self.generate_patrol_points()
-        self.current_patrol_index = 0
-        
-        # Sprites y animación
-        self.sprite = None
-        self.facing_direction = 0  # 0=Norte, 1=Este, 2=Sur, 3=Oeste
-        self.animation_frame = 0
-        self.animation_timer = 0
-        
-        self.load_sprite()
-        
-        # Estadísticas
-        self.health = Config.ENEMY_HEALTH
-        self.max_health = Config.ENEMY_HEALTH
-        self.speed = Config.ENEMY_SPEED
-        
-        # IA y comportamiento
-        self.target_pos = None
-        self.state = "PATROL"  # PATROL, CHASE, ATTACK, RETREAT
-        self.behavior_tree = self.create_behavior_tree()
-        self.behavior_timer = 0
+        # Nivel de detalle de la IA (AILevelOfDetail cambia las frecuencias según la distancia)
+        self.lod_band = None
+        self.behavior_rate = Config.BEHAVIOR_TREE_UPDATE_RATE
+        self.path_rate = Config.PATHFINDING_UPDATE_RATE
+        self.move_interval = 0  # Segundos entre actualizaciones (0 = cada frame)
+        self.move_timer = 0
         
         # Pathfinding A*
         self.astar = AStar()
         self.path = []
         self.current_path_index = 0
-        self.pathfinding_timer = 0
+        self.path_goal_tile = None  # Casilla objetivo del camino actual (o pedido)
+        self.path_tile = None       # Casilla objetivo del camino recibido
+        self.path_pending = False   # Hay una solicitud en el planificador
+        self.path_age = 0           # Segundos desde que se recibió el camino
+        self.following_flow_field = False
+        self.following_reservations = False  # Pasos del planificador cooperativo (WHCA*)
+        self.replanner = None  # D* Lite; se crea al perseguir por primera vez si es el modo elegido
         
         # Sistema de disparo
         self.shoot_cooldown = 0
@@ -89,9 +81,10 @@ class Enemy:
         self.attack_range = Config.ENEMY_ATTACK_RANGE
         self.player_detected = False
         self.last_player_pos = None
+        self.player_visible = None  # Resultado del lote de visibilidad del frame (None = calcularlo)
         
         # Patrullaje
-        self.patrol_points = self.generate_patrol_points()
+        self.patrol_points = self.generate_patrol_points(game_map)
         self.current_patrol_index = 0
         
         # Sprites y animación
@@ -116,96 +109,337 @@ class Enemy:
         pygame.draw.rect(self.sprite, Config.GRAY,
                         (Config.ENEMY_SIZE//2 - 2, Config.ENEMY_SIZE//2, 4, 8))
     
-    def generate_patrol_points(self):
+    def generate_patrol_points(self, game_map=None):
         """
-        Genera puntos de patrullaje aleatorios
+        Genera puntos de patrullaje aleatorios (centrados en una casilla para
+        que el camino A* termine sobre el punto y se reutilice en la caché).
+        Con el mapa solo se eligen casillas transitables: en un obstáculo el
+        camino terminaría en una vecina y el enemigo nunca llegaría al punto
         """
+        ts = Config.TILE_SIZE
+        tiles = [(x, y)
+                 for y in range(50 // ts, (Config.SCREEN_HEIGHT - 50) // ts + 1)
+                 for x in range(50 // ts, (Config.SCREEN_WIDTH - 50) // ts + 1)]
+        if game_map is not None:
+            tiles = [(x, y) for x, y in tiles if game_map.is_walkable(x, y)] or tiles
+        
+        half = ts // 2
         points = []
         for i in range(3):
-            x = random.randint(50, Config.SCREEN_WIDTH - 50)
-            y = random.randint(50, Config.SCREEN_HEIGHT - 50)
-            points.append((x, y))
+            x, y = random.choice(tiles)
+            points.append((x * ts + half, y * ts + half))
         return points
     
-    def create_behavior_tree(self):
+    # Árbol de comportamiento compartido por los enemigos de la clase
+    shared_behavior_tree = None
+    shared_behavior_tracker = None
+    shared_behavior_profiler = None
+    shared_behavior_library = None
+    
+    @classmethod
+    def get_behavior_tree(cls):
+        """
+        Devuelve el árbol de la clase; se crea (y compila) con el primer enemigo.
+        Con el perfilado activo se instrumenta y se deja sin compilar
+        """
+        tree = cls.__dict__.get('shared_behavior_tree')
+        if tree is None:
+            tree = cls.create_behavior_tree()
+            if Config.BEHAVIOR_TREE_PROFILING:
+                cls.shared_behavior_profiler = BehaviorProfiler()
+                tree = cls.shared_behavior_profiler.instrument(tree)
+            elif Config.USE_COMPILED_BEHAVIOR_TREE:
+                tree = CompiledTree(tree)
+            cls.shared_behavior_tree = tree
+        return tree
+    
+    @classmethod
+    def get_behavior_profiler(cls):
         """
-        Crea el árbol de comportamiento del enemigo
+        Devuelve el perfilador del árbol de la clase (None si está apagado)
         """
+        cls.get_behavior_tree()
+        return cls.__dict__.get('shared_behavior_profiler')
+    
+    @classmethod
+    def get_behavior_tracker(cls):
+        """
+        Devuelve el DirtyTracker de la clase, con sus contadores de ticks
+        ejecutados y saltados
+        """
+        tracker = cls.__dict__.get('shared_behavior_tracker')
+        if tracker is None:
+            tracker = DirtyTracker(cls.get_behavior_tree(), cls.behavior_inputs(),
+                                   Config.USE_DIRTY_BEHAVIOR_TREE)
+            cls.shared_behavior_tracker = tracker
+        return tracker
+    
+    @classmethod
+    def behavior_inputs(cls):
+        """
+        Fuente de cada entrada que leen las condiciones del árbol
+        """
+        return {
+            'player_range': agent_method(cls.player_range_input),
+            'engaged_player_tile': agent_method(cls.engaged_player_tile_input),
+            'health_bucket': agent_method(cls.health_bucket_input),
+            'player_visible': agent_method(cls.player_visible_input)
+        }
+    
+    @classmethod
+    def behavior_registry(cls):
+        """
+        Condiciones, acciones y entradas que pueden usar los archivos de
+        árboles del enemigo
+        """
+        registry = BehaviorRegistry()
+        
         # Condiciones
-        player_in_sight = Condition(self.is_player_in_sight)
-        player_in_attack_range = Condition(self.is_player_in_attack_range)
-        health_low = Condition(self.is_health_low)
+        registry.condition('player_in_sight', agent_method(cls.is_player_in_sight),
+                           ('player_range', 'player_visible'))
+        registry.condition('player_in_attack_range', agent_method(cls.is_player_in_attack_range),
+                           ('player_range',))
+        # La salud no se recupera: una MemorySequence puede no volver a
+        # comprobarla mientras la retirada sigue (RUNNING)
+        registry.condition('health_low', agent_method(cls.is_health_low), ('health_bucket',))
         
         # Acciones
-        chase_player = Leaf(self.chase_player_action)
-        attack_player = Leaf(self.attack_player_action)
-        patrol = Leaf(self.patrol_action)
-        retreat = Leaf(self.retreat_action)
-        
-        # Estructura del árbol
-        attack_sequence = Sequence()
-        attack_sequence.add_child(player_in_attack_range)
-        attack_sequence.add_child(attack_player)
-        
-        chase_sequence = Sequence()
-        chase_sequence.add_child(player_in_sight)
-        chase_sequence.add_child(chase_player)
-        
-        retreat_sequence = Sequence()
-        retreat_sequence.add_child(health_low)
-        retreat_sequence.add_child(retreat)
-        
-        main_selector = Selector()
-        main_selector.add_child(retreat_sequence)
-        main_selector.add_child(attack_sequence)
-        main_selector.add_child(chase_sequence)
-        main_selector.add_child(patrol)
-        
-        return BehaviorTree(main_selector)
+        registry.action('chase_player', agent_method(cls.chase_player_action), ('engaged_player_tile',))
+        registry.action('attack_player', agent_method(cls.attack_player_action))
+        registry.action('patrol', agent_method(cls.patrol_action))
+        registry.action('retreat', agent_method(cls.retreat_action), ('engaged_player_tile',))
+        
+        for name, source in cls.behavior_inputs().items():
+            registry.input(name, source)
+        return registry
     
-    def update(self, dt, player_pos, game_map):
+    @classmethod
+    def get_behavior_library(cls):
         """
-        Actualiza el enemigo
+        Devuelve la caché de árboles cargados de archivos de la clase
         """
+        library = cls.__dict__.get('shared_behavior_library')
+        if library is None:
+            library = BehaviorLibrary(cls.behavior_registry())
+            cls.shared_behavior_library = library
+        return library
+    
+    @classmethod
+    def create_behavior_tree(cls):
+        """
+        Carga (y valida) el árbol del enemigo de Config.ENEMY_BEHAVIOR_FILE.
+        No guarda ningún enemigo: cada nodo toma el suyo del blackboard que
+        recibe como contexto
+        """
+        return cls.get_behavior_library().load(os.path.join(PROJECT_DIR, Config.ENEMY_BEHAVIOR_FILE))
+    
+    def update(self, dt, player_pos, game_map, flow_field=None, path_scheduler=None,
+               cooperative=None, behavior_batched=False):
+        """
+        Actualiza el enemigo. Con behavior_batched el árbol ya se evaluó en
+        lote (BatchBehavior) y aquí no se ejecuta
+        """
+        dt = self.movement_step(dt)
+        if dt is None:
+            return
+        
         # Actualizar timers
-        self.behavior_timer += dt
-        self.pathfinding_timer += dt
-        self.shoot_cooldown -= dt
+        if not behavior_batched:
+            self.behavior_timer += dt
+            self.blackboard.time += dt
+        self.advance_timers(dt)
         
         # Ejecutar árbol de comportamiento
-        if self.behavior_timer >= Config.BEHAVIOR_TREE_UPDATE_RATE:
-            context = {
-                'enemy': self,
-                'player_pos': player_pos,
-                'game_map': game_map,
-                'dt': dt
-            }
-            self.behavior_tree.tick(context)
+        if not behavior_batched and self.behavior_timer >= self.behavior_rate:
+            blackboard = self.blackboard
+            blackboard.player_pos = player_pos
+            blackboard.game_map = game_map
+            blackboard.dt = dt
+            if self.behavior_tracker.needs_tick(blackboard):
+                self.behavior_tree.tick(blackboard)
             self.behavior_timer = 0
         
-        # Actualizar pathfinding
-        if self.pathfinding_timer >= Config.PATHFINDING_UPDATE_RATE:
-            if self.target_pos and self.state in ["CHASE", "RETREAT"]:
+        # Actualizar pathfinding (al perseguir, el juego pasa solo el planificador
+        # cooperativo o el campo de flujo de Config.CHASE_PATHFINDING; si no puede
+        # guiar al enemigo, por ejemplo fuera de la rejilla, se usa A*)
+        if self.state == "CHASE" and cooperative and self.follow_reservations(cooperative, game_map):
+            pass
+        elif self.state == "CHASE" and flow_field and self.follow_flow_field(flow_field):
+            pass
+        elif self.target_pos and self.state in ["CHASE", "RETREAT", "PATROL"] and self.needs_path():
+            if self.state == "CHASE" and Config.CHASE_PATHFINDING == "dstar_lite":
+                # D* Lite repara su búsqueda anterior: es barato hacerlo aquí mismo
+                self.update_pathfinding(game_map)
+            elif path_scheduler and not getattr(game_map, "nav_mesh", None):
+                self.request_path(path_scheduler, game_map, player_pos)
+            else:
                 self.update_pathfinding(game_map)
-            self.pathfinding_timer = 0
         
         # Mover según el path actual
+        self.move(dt)
+    
+    def movement_step(self, dt):
+        """
+        Tiempo que avanza el enemigo este frame. Los enemigos lejanos (LOD) se
+        actualizan en pasos más largos con el tiempo acumulado; retorna None
+        mientras no les toca
+        """
+        if self.move_interval:
+            self.move_timer += dt
+            if self.move_timer < self.move_interval:
+                return None
+            dt = self.move_timer
+            self.move_timer = 0
+        return dt
+    
+    def advance_timers(self, dt):
+        """
+        Avanza la antigüedad del camino y la espera del disparo
+        """
+        self.path_age += dt
+        self.shoot_cooldown -= dt
+    
+    def move(self, dt):
+        """
+        Sigue el camino y actualiza la posición del rectángulo
+        """
         self.follow_path(dt)
-        
-        # Actualizar posición del rectángulo
         self.rect.x = int(self.x)
         self.rect.y = int(self.y)
     
     def update_pathfinding(self, game_map):
         """
-        Actualiza el pathfinding usando A*
+        Actualiza el pathfinding usando A* (o D* Lite al perseguir, o la malla
+        de navegación del mapa si tiene una)
         """
         if self.target_pos:
             start = (int(self.x), int(self.y))
             goal = (int(self.target_pos[0]), int(self.target_pos[1]))
+            if self.state == "CHASE" and Config.CHASE_PATHFINDING == "dstar_lite":
+                planner = self.get_replanner()
+            else:
+                planner = getattr(game_map, "nav_mesh", None) or self.astar
             
-            self.path = self.astar.find_path(start, goal, game_map)
+            self.path_goal_tile = self.get_target_tile()
+            self.set_path(planner.find_path(start, goal, game_map))
+    
+    def get_replanner(self):
+        """
+        D* Lite del enemigo: solo lo crean los que llegan a perseguir con él
+        """
+        if self.replanner is None:
+            self.replanner = DStarLite(self.astar)
+        return self.replanner
+    
+    def get_target_tile(self):
+        """
+        Casilla del objetivo actual
+        """
+        return (int(self.target_pos[0] // Config.TILE_SIZE),
+                int(self.target_pos[1] // Config.TILE_SIZE))
+    
+    def needs_path(self):
+        """
+        Verifica si hay que pedir camino: no hay camino o el actual ya tiene
+        cierta antigüedad. Con el mismo objetivo no se pide mientras haya un
+        camino reciente hacia él o una solicitud en curso; un camino vacío o
+        terminado antes del objetivo se vuelve a pedir cada path_rate
+        """
+        if self.get_target_tile() != self.path_goal_tile:
+            return not self.path or self.path_age >= self.path_rate
+        return not self.path_pending and self.path_age >= self.path_rate
+    
+    def request_path(self, path_scheduler, game_map, player_pos):
+        """
+        Pide el camino al planificador; mientras tanto se sigue el camino anterior
+        """
+        start = (int(self.x), int(self.y))
+        goal = (int(self.target_pos[0]), int(self.target_pos[1]))
+        self.path_goal_tile = self.get_target_tile()
+        self.path_pending = True
+        path_scheduler.submit(self, start, goal, game_map,
+                              self.distance_to_player(player_pos), self.path_age)
+    
+    def set_path(self, path):
+        """
+        Recibe un camino calculado por A* o por el planificador
+        """
+        self.path = path
+        self.current_path_index = 0
+        self.path_age = 0
+        self.path_tile = self.path_goal_tile
+        self.path_pending = False
+        self.following_flow_field = False
+        self.following_reservations = False
+        if not path:
+            # Sin camino no habrá fin de camino que avise al árbol
+            self.blackboard.mark_dirty()
+    
+    def path_request_dropped(self):
+        """
+        El planificador descartó la solicitud por carga: se volverá a pedir
+        
+        Si todavía tiene un camino que seguir espera un path_rate más antes de
+        reintentar, para no volver a llenar la cola el siguiente fotograma.
+        """
+        self.path_goal_tile = None
+        self.path_pending = False
+        self.path_age = max(0, self.path_age - self.path_rate)
+    
+    def follow_flow_field(self, flow_field):
+        """
+        Toma el siguiente paso del campo de flujo hacia el jugador
+        
+        Retorna False si el enemigo está fuera del campo (por ejemplo recién
+        generado fuera de la pantalla) para que use A* como respaldo.
+        """
+        if not self.following_flow_field:
+            # Descartar el camino anterior al empezar a seguir el campo
+            self.path = []
             self.current_path_index = 0
+        elif self.current_path_index < len(self.path):
+            return True  # Aún va hacia el paso anterior
+        
+        # Consultar desde la casilla del último paso alcanzado
+        position = self.path[-1] if self.path else (self.x, self.y)
+        step = flow_field.next_step(position)
+        if step is None:
+            self.following_flow_field = False
+            return False
+        
+        self.path = [step]
+        self.current_path_index = 0
+        self.path_goal_tile = self.path_tile = None
+        self.following_flow_field = True
+        self.following_reservations = False
+        return True
+    
+    def follow_reservations(self, cooperative, game_map):
+        """
+        Toma el siguiente paso del plan cooperativo (WHCA*) hacia el jugador
+        
+        Igual que follow_flow_field, pero los pasos respetan las casillas que
+        reservaron los demás enemigos, así que no se amontonan. Retorna False
+        si el planificador no puede guiar al enemigo.
+        """
+        if not self.following_reservations:
+            self.path = []
+            self.current_path_index = 0
+        elif self.current_path_index < len(self.path):
+            return True  # Aún va hacia el paso anterior
+        
+        position = self.path[-1] if self.path else (self.x, self.y)
+        step = cooperative.next_step(self, position, game_map)
+        if step is None:
+            self.following_reservations = False
+            return False
+        
+        self.path = [step]
+        self.current_path_index = 0
+        self.path_goal_tile = self.path_tile = None
+        self.following_reservations = True
+        self.following_flow_field = False
+        return True
     
     def follow_path(self, dt):
         """
@@ -220,14 +454,16 @@ class Enemy:
         distance = math.sqrt(dx*dx + dy*dy)
         
         if distance < 10:  # Llegó al punto
-            self.current_path_index += 1
+            self.reach_waypoint()
         else:
             # Mover hacia el punto
             dx /= distance
             dy /= distance
             
-            self.x += dx * self.speed * dt
-            self.y += dy * self.speed * dt
+            # Un paso largo no pasa de largo el punto
+            step = min(self.speed * dt, distance)
+            self.x += dx * step
+            self.y += dy * step
             
             # Actualizar dirección de cara
             if abs(dx) > abs(dy):
@@ -235,15 +471,31 @@ class Enemy:
             else:
                 self.facing_direction = 2 if dy > 0 else 0
     
+    def reach_waypoint(self):
+        """
+        Pasa al siguiente punto del camino
+        """
+        self.current_path_index += 1
+        if self.current_path_index == len(self.path):
+            # Fin del camino: el árbol decide el siguiente objetivo
+            self.blackboard.mark_dirty()
+    
     # Condiciones para el árbol de comportamiento
     def is_player_in_sight(self, context):
         """
         Verifica si el jugador está a la vista
         """
-        player_pos = context['player_pos']
+        player_pos = context.player_pos
         distance = self.distance_to_player(player_pos)
         
-        if distance <= self.sight_range:
+        if distance > self.sight_range:
+            return False
+        
+        visible = self.player_visible
+        if visible is None:
+            visible = self.astar.line_of_sight(self.rect.center, player_pos, context.game_map)
+        
+        if visible:
             self.player_detected = True
             self.last_player_pos = player_pos
             return True
@@ -254,7 +506,7 @@ class Enemy:
         """
         Verifica si el jugador está en rango de ataque
         """
-        player_pos = context['player_pos']
+        player_pos = context.player_pos
         distance = self.distance_to_player(player_pos)
         return distance <= self.attack_range
     
@@ -264,6 +516,41 @@ class Enemy:
         """
         return self.health < self.max_health * 0.3
     
+    # Entradas del árbol para DirtyTracker
+    def player_range_input(self, context):
+        """
+        Zona del jugador: 0 en rango de ataque, 1 en rango de visión, 2 fuera
+        """
+        # Distancias al cuadrado: se llama en cada tick y evita la raíz
+        dx = context.player_pos[0] - self.rect.centerx
+        dy = context.player_pos[1] - self.rect.centery
+        squared = dx*dx + dy*dy
+        if squared <= self.attack_range * self.attack_range:
+            return 0
+        return 1 if squared <= self.sight_range * self.sight_range else 2
+    
+    def engaged_player_tile_input(self, context):
+        """
+        Casilla del jugador mientras se le persigue o se huye de él (las
+        acciones calculan su objetivo con ella); None en otro estado
+        """
+        if self.state != "CHASE" and self.state != "RETREAT":
+            return None
+        return (int(context.player_pos[0] // Config.TILE_SIZE),
+                int(context.player_pos[1] // Config.TILE_SIZE))
+    
+    def health_bucket_input(self, context):
+        """
+        Salud en décimos de la máxima
+        """
+        return int(self.health * 10 // self.max_health)
+    
+    def player_visible_input(self, context):
+        """
+        Resultado del lote de visibilidad del frame
+        """
+        return self.player_visible
+    
     def distance_to_player(self, player_pos):
         """
         Calcula la distancia al jugador
@@ -277,7 +564,7 @@ class Enemy:
         """
         Persigue al jugador
         """
-        player_pos = context['player_pos']
+        player_pos = context.player_pos
         self.state = "CHASE"
         self.target_pos = player_pos
         return "SUCCESS"
@@ -286,7 +573,7 @@ class Enemy:
         """
         Ataca al jugador
         """
-        player_pos = context['player_pos']
+        player_pos = context.player_pos
         self.state = "ATTACK"
         
         if self.can_shoot():
@@ -301,18 +588,22 @@ class Enemy:
         """
         self.state = "PATROL"
         
-        if not self.target_pos or self.distance_to_point(self.target_pos) < 20:
+        # También se pasa al siguiente punto si el camino hacia este ya
+        # terminó (o no existe) sin llegar, para no quedarse quieto
+        if (not self.target_pos or self.distance_to_point(self.target_pos) < 20 or
+                self.finished_path_to_target()):
             # Cambiar al siguiente punto de patrulla
             self.current_patrol_index = (self.current_patrol_index + 1) % len(self.patrol_points)
             self.target_pos = self.patrol_points[self.current_patrol_index]
         
-        return "SUCCESS"
+        # Patrullar no termina: siempre va hacia algún punto
+        return "RUNNING"
     
     def retreat_action(self, context):
         """
         Se retira del jugador
         """
-        player_pos = context['player_pos']
+        player_pos = context.player_pos
         self.state = "RETREAT"
         
         # Calcular posición opuesta al jugador
@@ -333,7 +624,15 @@ class Enemy:
             
             self.target_pos = (retreat_x, retreat_y)
         
-        return "SUCCESS"
+        # Sigue alejándose mientras tenga la salud baja
+        return "RUNNING"
+    
+    def finished_path_to_target(self):
+        """
+        Si el camino recibido lleva al objetivo actual y ya se recorrió entero
+        """
+        return (self.target_pos is not None and self.path_tile is not None and
+                self.path_tile == self.get_target_tile() and self.current_path_index >= len(self.path))
     
     def distance_to_point(self, point):
         """
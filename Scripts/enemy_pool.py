@@ -0,0 +1,454 @@
+# Enemigos guardados por columnas (estructura de arreglos) con NumPy - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+import numpy as np
+from scripts.config import Config
+from scripts.behavior_tree import Blackboard
+from scripts.enemy import Enemy
+
+# Columnas del pool y su tipo
+COLUMNS = (
+    ('x', np.float64),
+    ('y', np.float64),
+    ('vx', np.float64),              # Velocidad del último frame (píxeles/s)
+    ('vy', np.float64),
+    ('speed', np.float64),
+    ('health', np.float64),
+    ('shoot_cooldown', np.float64),
+    ('path_age', np.float64),
+    ('facing', np.int64),            # 0=Norte, 1=Este, 2=Sur, 3=Oeste
+    ('waypoint_x', np.float64),      # Punto actual del camino
+    ('waypoint_y', np.float64),
+    ('has_waypoint', np.bool_),
+    ('move_interval', np.float64),   # Segundos entre pasos (LOD, 0 = cada frame)
+    ('move_timer', np.float64),      # Tiempo acumulado desde el último paso
+    ('step', np.float64),            # Tiempo que avanza la fila este frame
+    ('due', np.bool_),               # Si la fila avanza este frame
+    ('behavior_timer', np.float64),  # Segundos desde el último tick del árbol
+    ('behavior_rate', np.float64),   # Segundos entre ticks del árbol (LOD)
+    ('clock', np.float64),           # Reloj del blackboard (Cooldown)
+    ('dirty', np.bool_),             # Blackboard marcado para re-evaluar
+    ('state', np.int8),              # Índice en Enemy.STATES
+    ('player_visible', np.int8),     # Lote de visibilidad: -1 sin calcular, 0 no, 1 sí
+    ('sight_range', np.float64),
+    ('attack_range', np.float64),
+    ('max_health', np.float64)
+)
+
+class EnemyPool:
+    """
+    Posiciones, velocidades, salud, temporizadores y punto actual del camino
+    de todos los enemigos en arreglos de NumPy
+    
+    Cada frame advance_timers avanza los temporizadores e integrate mueve a
+    todos los enemigos hacia su punto del camino, con unas pocas operaciones
+    sobre los arreglos en lugar de la raíz y la normalización de cada
+    Enemy.follow_path. Los enemigos son PooledEnemy: el resto de su estado
+    (árbol, camino, rect) sigue en el objeto y sus atributos numéricos leen y
+    escriben la fila del pool, así que el resto del juego no cambia.
+    
+    Las filas ocupadas son siempre las primeras: al quitar un enemigo el
+    último pasa a su fila.
+    
+    Como en Enemy.update, las filas con move_interval (enemigos lejanos del
+    LOD) solo avanzan cuando su move_timer llega al intervalo, y entonces con
+    todo el tiempo acumulado.
+    
+    Otros sistemas pueden guardar su propio estado por enemigo con
+    add_column (BatchBehavior guarda así las entradas del árbol).
+    """
+    
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.count = 0    # Filas ocupadas
+        self.views = []   # Enemigo de cada fila
+        self.columns = list(COLUMNS)
+        for name, dtype in self.columns:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+    
+    def add_column(self, name, dtype):
+        """
+        Agrega una columna (en cero para los enemigos actuales) si no existe
+        """
+        if any(name == existing for existing, _ in self.columns):
+            return
+        self.columns.append((name, dtype))
+        setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+    
+    def spawn(self, x, y, sprite_manager, skin_manager=None, game_map=None):
+        """
+        Crea un enemigo guardado en el pool
+        """
+        return PooledEnemy(self, x, y, sprite_manager, skin_manager, game_map)
+    
+    def add(self, enemy):
+        """
+        Reserva la fila de un enemigo nuevo y retorna su índice
+        """
+        if self.count == self.capacity:
+            self.grow()
+        slot = self.count
+        for name, dtype in self.columns:
+            getattr(self, name)[slot] = 0
+        self.views.append(enemy)
+        self.count += 1
+        return slot
+    
+    def grow(self):
+        """
+        Duplica la capacidad de todas las columnas
+        """
+        self.capacity *= 2
+        for name, dtype in self.columns:
+            column = np.zeros(self.capacity, dtype=dtype)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+    
+    def release(self, enemy):
+        """
+        Quita al enemigo del pool (al morir); el último ocupa su fila
+        """
+        slot = enemy.slot
+        last = self.count - 1
+        if slot != last:
+            for name, dtype in self.columns:
+                column = getattr(self, name)
+                column[slot] = column[last]
+            moved = self.views[last]
+            moved.slot = slot
+            self.views[slot] = moved
+        self.views.pop()
+        self.count -= 1
+        enemy.slot = None
+    
+    def aim(self, slot, path, index):
+        """
+        Punto del camino hacia el que va la fila (ninguno al terminar el camino)
+        """
+        if index < len(path):
+            self.waypoint_x[slot], self.waypoint_y[slot] = path[index][0], path[index][1]
+            self.has_waypoint[slot] = True
+        else:
+            self.waypoint_x[slot] = self.waypoint_y[slot] = 0.0
+            self.has_waypoint[slot] = False
+    
+    def advance_timers(self, dt):
+        """
+        Decide qué filas avanzan este frame y con cuánto tiempo, y avanza la
+        antigüedad del camino y la espera del disparo de esas filas
+        """
+        count = self.count
+        interval = self.move_interval[:count]
+        timer = self.move_timer[:count]
+        spaced = interval > 0
+        timer[spaced] += dt
+        
+        due = ~spaced | (timer >= interval)
+        step = np.where(spaced, timer, dt)
+        step[~due] = 0.0
+        timer[spaced & due] = 0.0
+        self.due[:count] = due
+        self.step[:count] = step
+        
+        self.path_age[:count] += step
+        self.shoot_cooldown[:count] -= step
+    
+    def integrate(self, dt):
+        """
+        Mueve a los enemigos que avanzan este frame hacia su punto del camino
+        (como Enemy.follow_path, con el tiempo de su fila), actualiza su
+        dirección y su rect, y pasa al siguiente punto a los que llegaron.
+        dt ya está repartido por fila en advance_timers
+        """
+        count = self.count
+        if not count:
+            return
+        x = self.x[:count]
+        y = self.y[:count]
+        due = self.due[:count]
+        active = self.has_waypoint[:count] & due
+        
+        dx = self.waypoint_x[:count] - x
+        dy = self.waypoint_y[:count] - y
+        distance = np.sqrt(dx * dx + dy * dy)
+        arrived = active & (distance < 10)
+        moving = active & ~arrived
+        
+        # Dirección unitaria (cero para los que no se mueven)
+        safe = np.where(moving, distance, 1.0)
+        ux = np.where(moving, dx / safe, 0.0)
+        uy = np.where(moving, dy / safe, 0.0)
+        
+        # Un paso largo no pasa de largo el punto
+        speed = self.speed[:count]
+        step = np.minimum(speed * self.step[:count], distance)
+        x += ux * step
+        y += uy * step
+        # Las filas que esperan conservan la velocidad de su último paso
+        self.vx[:count] = np.where(due, ux * speed, self.vx[:count])
+        self.vy[:count] = np.where(due, uy * speed, self.vy[:count])
+        
+        facing = np.where(np.abs(ux) > np.abs(uy), np.where(ux > 0, 1, 3), np.where(uy > 0, 2, 0))
+        self.facing[:count] = np.where(moving, facing, self.facing[:count])
+        
+        # Solo los rect de los que se movieron
+        views = self.views
+        indices = np.flatnonzero(moving)
+        for i, rect_x, rect_y in zip(indices.tolist(), x[indices].astype(np.int64).tolist(),
+                                     y[indices].astype(np.int64).tolist()):
+            rect = views[i].rect
+            rect.x = rect_x
+            rect.y = rect_y
+        
+        for i in np.flatnonzero(arrived).tolist():
+            views[i].reach_waypoint()
+    
+    def behavior_inputs(self):
+        """
+        Entradas del árbol del enemigo (Enemy.behavior_inputs) calculadas para
+        varias filas a la vez. Cada fuente recibe los índices de las filas y
+        la posición del jugador, y retorna un valor numérico por fila que
+        cambia cuando cambia la entrada del enemigo
+        """
+        return {
+            'player_range': self.player_range_input,
+            'engaged_player_tile': self.engaged_player_tile_input,
+            'health_bucket': self.health_bucket_input,
+            'player_visible': self.player_visible_input
+        }
+    
+    def centers(self, rows):
+        """
+        Centro del rect de las filas (el rect está en la parte entera de x, y)
+        """
+        half = Config.ENEMY_SIZE // 2
+        return np.trunc(self.x[rows]) + half, np.trunc(self.y[rows]) + half
+    
+    def player_range_input(self, rows, player_pos):
+        """
+        Zona del jugador: 0 en rango de ataque, 1 en rango de visión, 2 fuera
+        """
+        center_x, center_y = self.centers(rows)
+        dx = player_pos[0] - center_x
+        dy = player_pos[1] - center_y
+        squared = dx * dx + dy * dy
+        attack = self.attack_range[rows]
+        sight = self.sight_range[rows]
+        return np.where(squared <= attack * attack, 0, np.where(squared <= sight * sight, 1, 2))
+    
+    def engaged_player_tile_input(self, rows, player_pos):
+        """
+        Casilla del jugador (como índice) para los que persiguen o huyen; -1 para el resto
+        """
+        tile = (player_pos[1] // Config.TILE_SIZE) * 65536 + player_pos[0] // Config.TILE_SIZE
+        state = self.state[rows]
+        engaged = (state == Enemy.STATE_CODES["CHASE"]) | (state == Enemy.STATE_CODES["RETREAT"])
+        return np.where(engaged, tile, -1)
+    
+    def health_bucket_input(self, rows, player_pos):
+        """
+        Salud en décimos de la máxima
+        """
+        return np.floor_divide(self.health[rows] * 10, self.max_health[rows])
+    
+    def player_visible_input(self, rows, player_pos):
+        """
+        Resultado del lote de visibilidad del frame
+        """
+        return self.player_visible[rows]
+    
+    def update_visibility(self, player_pos, game_map, raycaster):
+        """
+        Visibilidad del jugador para todas las filas (como Game.update_visibility):
+        las que lo tienen en su rango de visión trazan la línea de vista en un
+        solo lote y el resto no lo ve
+        """
+        count = self.count
+        rows = np.arange(count)
+        center_x, center_y = self.centers(rows)
+        dx = player_pos[0] - center_x
+        dy = player_pos[1] - center_y
+        nearby = np.flatnonzero(np.sqrt(dx * dx + dy * dy) <= self.sight_range[:count])
+        
+        visible = self.player_visible[:count]
+        visible[:] = 0
+        if len(nearby):
+            points = list(zip(center_x[nearby].astype(np.int64).tolist(),
+                              center_y[nearby].astype(np.int64).tolist()))
+            visible[nearby] = raycaster.visible_from(points, player_pos, game_map)
+    
+    def ready_to_shoot(self):
+        """
+        Enemigos que ya pueden disparar
+        """
+        views = self.views
+        return [views[i] for i in np.flatnonzero(self.shoot_cooldown[:self.count] <= 0).tolist()]
+
+def column(name, convert=None):
+    """
+    Atributo de PooledEnemy guardado en la columna name del pool
+    """
+    if convert is None:
+        def get(self):
+            return getattr(self.pool, name)[self.slot]
+    else:
+        def get(self):
+            return convert(getattr(self.pool, name)[self.slot])
+    
+    def put(self, value):
+        getattr(self.pool, name)[self.slot] = value
+    return property(get, put)
+
+class mirror:
+    """
+    Atributo de PooledEnemy que se lee del objeto (sin pasar por NumPy) y al
+    escribirse se copia también en la columna name del pool, codificado con
+    encode. Sirve para lo que solo el pool lee en lote
+    """
+    
+    def __init__(self, name, encode=None):
+        self.name = name
+        self.encode = encode
+    
+    def __set_name__(self, owner, attribute):
+        self.attribute = attribute
+    
+    def __set__(self, enemy, value):
+        # Sin __get__ la lectura toma el valor del __dict__ del objeto
+        enemy.__dict__[self.attribute] = value
+        getattr(enemy.pool, self.name)[enemy.slot] = value if self.encode is None else self.encode(value)
+
+class PooledBlackboard(Blackboard):
+    """
+    Blackboard de un PooledEnemy: el reloj y la marca de re-evaluación viven
+    en la fila del agente, para que BatchBehavior los lea en lote
+    """
+    
+    __slots__ = ()
+    
+    @property
+    def dirty(self):
+        agent = self.agent
+        return bool(agent.pool.dirty[agent.slot])
+    
+    @dirty.setter
+    def dirty(self, value):
+        agent = self.agent
+        agent.pool.dirty[agent.slot] = value
+    
+    @property
+    def time(self):
+        agent = self.agent
+        return float(agent.pool.clock[agent.slot])
+    
+    @time.setter
+    def time(self, value):
+        agent = self.agent
+        agent.pool.clock[agent.slot] = value
+
+class PooledEnemy(Enemy):
+    """
+    Enemigo cuyos atributos numéricos viven en una fila de EnemyPool
+    
+    Se usa igual que Enemy. La diferencia es que el pool avanza sus
+    temporizadores (también los del LOD) y lo mueve en lote, así que update
+    solo ejecuta la IA (árbol y caminos). Lo que BatchBehavior lee en lote
+    (estado, rangos, temporizador del árbol, visibilidad) también está en el
+    pool; lo que solo se escribe de vez en cuando se lee del objeto (mirror).
+    """
+    
+    x = column('x')
+    y = column('y')
+    speed = column('speed')
+    health = column('health')
+    shoot_cooldown = column('shoot_cooldown')
+    path_age = column('path_age')
+    facing_direction = column('facing', int)
+    move_interval = column('move_interval')
+    move_timer = column('move_timer')
+    behavior_timer = column('behavior_timer')
+    behavior_rate = mirror('behavior_rate')
+    sight_range = mirror('sight_range')
+    attack_range = mirror('attack_range')
+    max_health = mirror('max_health')
+    state = mirror('state', Enemy.STATE_CODES.__getitem__)
+    
+    blackboard_class = PooledBlackboard
+    
+    _path = ()
+    _path_index = 0
+    
+    def __init__(self, pool, x, y, sprite_manager, skin_manager=None, game_map=None):
+        self.pool = pool
+        self.slot = pool.add(self)
+        super().__init__(x, y, sprite_manager, skin_manager, game_map)
+    
+    # Mismo comportamiento que Enemy: comparte su árbol, su DirtyTracker y su perfilador
+    @classmethod
+    def get_behavior_tree(cls):
+        return Enemy.get_behavior_tree()
+    
+    @classmethod
+    def get_behavior_tracker(cls):
+        return Enemy.get_behavior_tracker()
+    
+    @classmethod
+    def get_behavior_profiler(cls):
+        return Enemy.get_behavior_profiler()
+    
+    @property
+    def path(self):
+        return self._path
+    
+    @path.setter
+    def path(self, path):
+        self._path = path
+        self.pool.aim(self.slot, path, self._path_index)
+    
+    @property
+    def current_path_index(self):
+        return self._path_index
+    
+    @current_path_index.setter
+    def current_path_index(self, index):
+        self._path_index = index
+        self.pool.aim(self.slot, self._path, index)
+    
+    @property
+    def player_visible(self):
+        """
+        Resultado del lote de visibilidad del frame (None = calcularlo)
+        """
+        visible = self.pool.player_visible[self.slot]
+        return None if visible < 0 else bool(visible)
+    
+    @player_visible.setter
+    def player_visible(self, visible):
+        self.pool.player_visible[self.slot] = -1 if visible is None else int(bool(visible))
+    
+    @property
+    def velocity(self):
+        """
+        Velocidad del último frame (píxeles/s)
+        """
+        return (float(self.pool.vx[self.slot]), float(self.pool.vy[self.slot]))
+    
+    def movement_step(self, dt):
+        """
+        EnemyPool.advance_timers ya decidió si la fila avanza y con cuánto tiempo
+        """
+        pool = self.pool
+        if not pool.due[self.slot]:
+            return None
+        return float(pool.step[self.slot])
+    
+    def advance_timers(self, dt):
+        """
+        EnemyPool.advance_timers los avanza para todos los enemigos
+        """
+    
+    def move(self, dt):
+        """
+        EnemyPool.integrate mueve a todos los enemigos
+        """
\ No newline at end of file
@@ -0,0 +1,131 @@
+# Campo de flujo compartido hacia el jugador - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+import heapq
+import math
+from scripts.config import Config
+
+class FlowField:
+    """
+    Campo de flujo: un único Dijkstra desde la casilla del jugador
+    
+    Guarda para cada casilla alcanzable cuál es la siguiente casilla hacia el
+    jugador, así que todos los enemigos que persiguen comparten una sola
+    búsqueda y consultan su siguiente paso en O(1).
+    """
+    
+    # Mismas 8 direcciones y costos que el A*
+    DIRECTIONS = (
+        (-1, -1), (-1, 0), (-1, 1),
+        (0, -1),           (0, 1),
+        (1, -1),  (1, 0),  (1, 1)
+    )
+    
+    def __init__(self):
+        self.grid_size = Config.TILE_SIZE
+        self.width = 0
+        self.height = 0
+        self.goal_tile = None
+        self.distance = []      # Costo hasta el jugador (en casillas)
+        self.next_index = []    # Índice de la siguiente casilla, -1 si no alcanzable
+        
+        # Para saber cuándo hay que reconstruir
+        self.game_map = None
+        self.map_version = -1
+        self.rebuilds = 0
+    
+    def update(self, target_pos, game_map):
+        """
+        Reconstruye el campo solo si el jugador cambió de casilla o cambió el mapa
+        """
+        goal_tile = (int(target_pos[0] // self.grid_size),
+                     int(target_pos[1] // self.grid_size))
+        
+        if (goal_tile == self.goal_tile and game_map is self.game_map and
+                game_map.version == self.map_version):
+            return False
+        
+        self.build(goal_tile, game_map)
+        return True
+    
+    def build(self, goal_tile, game_map):
+        """
+        Ejecuta Dijkstra hacia afuera desde la casilla objetivo
+        """
+        self.goal_tile = goal_tile
+        self.game_map = game_map
+        self.map_version = game_map.version
+        self.width = width = game_map.width
+        self.height = height = game_map.height
+        self.rebuilds += 1
+        
+        size = width * height
+        distance = [math.inf] * size
+        next_index = [-1] * size
+        self.distance = distance
+        self.next_index = next_index
+        
+        goal_x, goal_y = goal_tile
+        if not (0 <= goal_x < width and 0 <= goal_y < height):
+            return
+        
+        walkable = game_map.walkable
+        diagonal = math.sqrt(2)
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        goal = goal_y * width + goal_x
+        distance[goal] = 0
+        next_index[goal] = goal
+        open_heap = [(0, goal)]
+        
+        while open_heap:
+            dist, current = heappop(open_heap)
+            if dist > distance[current]:
+                continue  # Entrada obsoleta
+            
+            cx = current % width
+            cy = current // width
+            for dx, dy in self.DIRECTIONS:
+                nx = cx + dx
+                ny = cy + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                neighbor = ny * width + nx
+                if not walkable[neighbor]:
+                    continue
+                
+                new_dist = dist + (1 if dx == 0 or dy == 0 else diagonal)
+                if new_dist < distance[neighbor]:
+                    distance[neighbor] = new_dist
+                    next_index[neighbor] = current
+                    heappush(open_heap, (new_dist, neighbor))
+    
+    def next_step(self, position):
+        """
+        Devuelve la posición (en píxeles) de la siguiente casilla hacia el jugador
+        
+        Retorna None si la posición está fuera del mapa o no puede llegar.
+        """
+        x = int(position[0] // self.grid_size)
+        y = int(position[1] // self.grid_size)
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        
+        step = self.next_index[y * self.width + x]
+        if step < 0:
+            return None
+        
+        return ((step % self.width) * self.grid_size,
+                (step // self.width) * self.grid_size)
+    
+    def distance_to_goal(self, position):
+        """
+        Devuelve el costo (en casillas) desde una posición hasta el jugador
+        """
+        x = int(position[0] // self.grid_size)
+        y = int(position[1] // self.grid_size)
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return math.inf
+        return self.distance[y * self.width + x]
\ No newline at end of file
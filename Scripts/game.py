@@ -11,6 +11,17 @@ from scripts.player import Player
 from scripts.enemy import Enemy
 from scripts.bullet import Bullet
 from scripts.game_map import GameMap
+from scripts.flow_field import FlowField
+from scripts.cooperative import CooperativePlanner
+from scripts.bt_batch import BatchBehavior
+from scripts.ai_lod import AILevelOfDetail
+from scripts.enemy_pool import EnemyPool
+from scripts.path_scheduler import PathScheduler
+from scripts.path_workers import PathWorkerPool
+from scripts.path_cache import PathCache
+from scripts.line_of_sight import Raycaster
+from scripts.landmarks import LandmarkTable
+from scripts.nav_mesh import NavMesh
 from scripts.sound_manager import SoundManager
 from scripts.sprite_manager import SpriteManager
 
@@ -31,6 +42,34 @@ class Game:
         self.sound_manager = SoundManager()
         self.sprite_manager = SpriteManager()
         self.game_map = GameMap()
+        if Config.USE_LANDMARKS:
+            self.game_map.landmarks = LandmarkTable(self.game_map)
+        if Config.USE_NAV_MESH:
+            self.game_map.nav_mesh = NavMesh(self.game_map)
+        # Una sola forma de perseguir; el planificador cooperativo usa el campo
+        # de flujo como heurística, pero los enemigos no lo siguen
+        chase = Config.CHASE_PATHFINDING
+        if chase not in Enemy.CHASE_MODES:
+            raise ValueError(f"Modo de persecución desconocido: {chase}")
+        self.flow_field = FlowField() if chase in ("flow_field", "cooperative") else None
+        self.cooperative = CooperativePlanner(self.flow_field) if chase == "cooperative" else None
+        self.chase_field = self.flow_field if chase == "flow_field" else None
+        pool = PathWorkerPool() if Config.PATHFINDING_WORKERS > 0 else None
+        self.path_cache = PathCache()
+        self.path_scheduler = PathScheduler(pool=pool, cache=self.path_cache)
+        self.raycaster = Raycaster()
+        self.ai_lod = AILevelOfDetail() if Config.USE_AI_LOD else None
+        self.enemy_pool = EnemyPool() if Config.USE_ENEMY_POOL else None
+        # El lote lee el estado de los enemigos del pool; se apaga al perfilar
+        # (no recorre los nodos instrumentados)
+        self.behavior_profiler = Enemy.get_behavior_profiler()
+        self.show_behavior_profile = False
+        tree = Enemy.get_behavior_tree()
+        sources = self.enemy_pool.behavior_inputs() if self.enemy_pool else {}
+        self.behavior_batch = (BatchBehavior(self.enemy_pool, tree, Enemy.get_behavior_tracker(), sources)
+                               if Config.USE_BATCH_BEHAVIOR_TREE and self.enemy_pool and
+                               not self.behavior_profiler and BatchBehavior.supports(tree, sources)
+                               else None)
         
         # Cargar imagen de fondo
         self.background = None
@@ -118,6 +157,8 @@ class Game:
                 return "QUIT"
             elif event.key == pygame.K_SPACE:
                 self.player_shoot()
+            elif event.key == pygame.K_F3 and self.behavior_profiler:
+                self.show_behavior_profile = not self.show_behavior_profile
         
         elif event.type == pygame.JOYBUTTONDOWN:
             if self.gamepad and event.button == 0:  # Botón A
@@ -141,14 +182,46 @@ class Game:
         # Actualizar entidades
         self.player.update(dt)
         
+        # Campo de flujo compartido: solo se recalcula si el jugador cambia de casilla
+        if self.flow_field:
+            self.flow_field.update(self.player.rect.center, self.game_map)
+        
+        # Reloj de la tabla de reservas de los enemigos que persiguen
+        if self.cooperative:
+            self.cooperative.update(dt, self.player.rect.center, self.game_map)
+        
+        # Visibilidad del jugador para todos los enemigos cercanos en un solo lote
+        self.update_visibility()
+        
+        # Frecuencias de la IA de cada enemigo según su distancia al jugador
+        if self.ai_lod:
+            self.ai_lod.update(dt, self.enemies, self.player.rect.center)
+        
+        # Con el pool los temporizadores y el movimiento de todos los enemigos
+        # se avanzan en lote y update solo ejecuta la IA de cada uno
+        if self.enemy_pool:
+            self.enemy_pool.advance_timers(dt)
+        
+        # Árbol de comportamiento de todos los enemigos a los que les toca, en un lote
+        if self.behavior_batch:
+            self.behavior_batch.tick(self.player.rect.center, self.game_map)
+        
         for enemy in self.enemies[:]:
-            enemy.update(dt, self.player.rect.center, self.game_map)
+            enemy.update(dt, self.player.rect.center, self.game_map,
+                         self.chase_field, self.path_scheduler, self.cooperative,
+                         self.behavior_batch is not None)
             
             # El enemigo dispara al jugador
-            if enemy.can_shoot():
-                bullet = enemy.shoot(self.player.rect.center)
-                if bullet:
-                    self.enemy_bullets.append(bullet)
+            if not self.enemy_pool and enemy.can_shoot():
+                self.enemy_shoot(enemy)
+        
+        if self.enemy_pool:
+            self.enemy_pool.integrate(dt)
+            for enemy in self.enemy_pool.ready_to_shoot():
+                self.enemy_shoot(enemy)
+        
+        # Avanzar las búsquedas A* pendientes con el presupuesto del frame
+        self.path_scheduler.update(dt)
         
         for bullet in self.bullets[:]:
             bullet.update(dt)
@@ -182,6 +255,27 @@ class Game:
         
         return None
     
+    def update_visibility(self):
+        """
+        Calcula qué enemigos dentro de su rango de visión ven al jugador
+        """
+        player_pos = self.player.rect.center
+        if self.enemy_pool:
+            self.enemy_pool.update_visibility(player_pos, self.game_map, self.raycaster)
+            return
+        
+        nearby = []
+        for enemy in self.enemies:
+            if enemy.distance_to_player(player_pos) <= enemy.sight_range:
+                nearby.append(enemy)
+            else:
+                enemy.player_visible = False
+        
+        visible = self.raycaster.visible_from([enemy.rect.center for enemy in nearby],
+                                              player_pos, self.game_map)
+        for enemy, can_see in zip(nearby, visible):
+            enemy.player_visible = can_see
+    
     def update_background_parallax(self):
         """
         Actualiza el efecto parallax del fondo basado en la posición del jugador
@@ -242,6 +336,14 @@ class Game:
             self.bullets.append(bullet)
             self.sound_manager.play_sound("shoot")
     
+    def enemy_shoot(self, enemy):
+        """
+        Un enemigo dispara al jugador
+        """
+        bullet = enemy.shoot(self.player.rect.center)
+        if bullet:
+            self.enemy_bullets.append(bullet)
+    
     def spawn_enemy(self):
         """
         Genera un nuevo enemigo en una posición aleatoria
@@ -263,13 +365,20 @@ class Game:
         
         # Crear enemigo básico
         try:
-            enemy = Enemy(x, y, self.sprite_manager)
+            if self.enemy_pool:
+                enemy = self.enemy_pool.spawn(x, y, self.sprite_manager, game_map=self.game_map)
+            else:
+                enemy = Enemy(x, y, self.sprite_manager, game_map=self.game_map)
             self.enemies.append(enemy)
         except Exception as e:
             print(f"Error creando enemigo: {e}")
             # Crear enemigo mínimo de respaldo
             enemy = Enemy(x, y)
             self.enemies.append(enemy)
+        
+        # Los que aparecen fuera de la pantalla empiezan en una banda lejana
+        if self.ai_lod:
+            self.ai_lod.register(enemy, self.player.rect.center)
     
     def check_collisions(self):
         """
@@ -284,6 +393,11 @@ class Game:
                     
                     if enemy.health <= 0:
                         self.enemies.remove(enemy)
+                        if self.enemy_pool:
+                            self.enemy_pool.release(enemy)
+                        self.path_scheduler.cancel(enemy)
+                        if self.cooperative:
+                            self.cooperative.release(enemy)
                         self.enemies_killed += 1
                         self.score += 100
                         self.sound_manager.play_sound("enemy_death")
@@ -335,6 +449,10 @@ class Game:
         
         # Renderizar UI
         self.render_ui()
+        
+        # Perfil del árbol de comportamiento (F3)
+        if self.show_behavior_profile:
+            self.behavior_profiler.render(self.screen)
     
     def render_ui(self):
         """
@@ -396,6 +514,15 @@ class Game:
         health_percent_rect = health_percent_text.get_rect(center=(bar_x + health_bar_width // 2, bar_y + health_bar_height // 2))
         self.screen.blit(health_percent_text, health_percent_rect)
     
+    def shutdown(self):
+        """
+        Libera los recursos de la partida (procesos de pathfinding) y guarda
+        el perfil del árbol de comportamiento si está activo
+        """
+        self.path_scheduler.shutdown()
+        if self.behavior_profiler:
+            self.behavior_profiler.dump(Config.BEHAVIOR_TREE_PROFILE_FILE)
+    
     def show_game_over(self):
         """
         Muestra la pantalla de game over mejorada
@@ -4,6 +4,7 @@
 
 import pygame
 import random
+from collections import deque
 from scripts.config import Config
 
 class GameMap:
@@ -11,13 +12,43 @@ class GameMap:
     Clase que maneja el mapa del juego
     """
     
-    def __init__(self):
-        self.width = Config.MAP_WIDTH
-        self.height = Config.MAP_HEIGHT
+    # Vecinos de una casilla (8 direcciones, igual que el A*)
+    NEIGHBORS = (
+        (-1, -1), (-1, 0), (-1, 1),
+        (0, -1),           (0, 1),
+        (1, -1),  (1, 0),  (1, 1)
+    )
+    
+    def __init__(self, width=None, height=None, obstacle_chance=0.1):
+        self.width = width or Config.MAP_WIDTH
+        self.height = height or Config.MAP_HEIGHT
         self.tile_size = Config.TILE_SIZE
+        self.obstacle_chance = obstacle_chance
         
         # Generar mapa básico
         self.tiles = self.generate_map()
+        
+        # Rejilla plana de transitabilidad (índice y * width + x) para el pathfinding
+        self.walkable = self.build_walkable_grid()
+        
+        # Componentes conexas de casillas libres: etiqueta por casilla (-1 si es
+        # obstáculo) y cantidad de casillas de cada etiqueta
+        self.components = []
+        self.component_sizes = {}
+        self.next_label = 0
+        self.build_components()
+        
+        # Contador de versión: aumenta con cada cambio de casillas
+        self.version = 0
+        
+        # Funciones (grid_x, grid_y) a las que se avisa de cada cambio
+        self.listeners = []
+        
+        # Tabla de landmarks opcional (LandmarkTable) para la heurística del A*
+        self.landmarks = None
+        
+        # Malla de navegación opcional (NavMesh) que usan los enemigos en lugar del A*
+        self.nav_mesh = None
     
     def generate_map(self):
         """
@@ -29,7 +60,7 @@ class GameMap:
             row = []
             for x in range(self.width):
                 # Crear obstáculos aleatorios
-                if random.random() < 0.1:  # 10% de probabilidad
+                if random.random() < self.obstacle_chance:  # 10% por defecto
                     row.append(1)  # Obstáculo
                 else:
                     row.append(0)  # Suelo libre
@@ -37,6 +68,207 @@ class GameMap:
         
         return tiles
     
+    def build_walkable_grid(self):
+        """
+        Construye la rejilla empaquetada de transitabilidad (1 = libre, 0 = obstáculo)
+        """
+        return bytearray(1 if tile == 0 else 0 for row in self.tiles for tile in row)
+    
+    def set_tile(self, grid_x, grid_y, value):
+        """
+        Cambia una celda del mapa manteniendo la rejilla de transitabilidad al día
+        """
+        index = grid_y * self.width + grid_x
+        was_walkable = self.walkable[index]
+        self.tiles[grid_y][grid_x] = value
+        self.walkable[index] = 1 if value == 0 else 0
+        self.version += 1
+        
+        if self.walkable[index] != was_walkable:
+            self.update_components(grid_x, grid_y)
+        
+        for listener in self.listeners:
+            listener(grid_x, grid_y)
+    
+    def add_listener(self, listener):
+        """
+        Registra una función que se llama con (grid_x, grid_y) al cambiar una celda
+        """
+        self.listeners.append(listener)
+    
+    def build_components(self):
+        """
+        Etiqueta todas las componentes conexas de casillas libres
+        """
+        self.components = [-1] * (self.width * self.height)
+        self.component_sizes = {}
+        self.next_label = 0
+        
+        for index, free in enumerate(self.walkable):
+            if free and self.components[index] == -1:
+                self.new_component(index)
+    
+    def new_component(self, index):
+        """
+        Asigna una etiqueta nueva a toda la región libre conectada con index
+        """
+        label = self.next_label
+        self.next_label += 1
+        self.component_sizes[label] = self.flood(index, label)
+        return label
+    
+    def flood(self, index, label):
+        """
+        Pone label a las casillas libres conectadas con index que tengan otra
+        etiqueta. Retorna cuántas cambió
+        """
+        width, height = self.width, self.height
+        walkable = self.walkable
+        components = self.components
+        components[index] = label
+        count = 1
+        queue = deque([index])
+        
+        while queue:
+            current = queue.popleft()
+            x = current % width
+            y = current // width
+            for dx, dy in self.NEIGHBORS:
+                nx = x + dx
+                ny = y + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    neighbor = ny * width + nx
+                    if walkable[neighbor] and components[neighbor] != label:
+                        components[neighbor] = label
+                        count += 1
+                        queue.append(neighbor)
+        return count
+    
+    def free_neighbors(self, grid_x, grid_y):
+        """
+        Índices de las casillas libres vecinas de (grid_x, grid_y)
+        """
+        neighbors = []
+        for dx, dy in self.NEIGHBORS:
+            nx = grid_x + dx
+            ny = grid_y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height and self.walkable[ny * self.width + nx]:
+                neighbors.append(ny * self.width + nx)
+        return neighbors
+    
+    def update_components(self, grid_x, grid_y):
+        """
+        Actualiza las componentes después de que una casilla cambió de estado
+        """
+        index = grid_y * self.width + grid_x
+        components = self.components
+        sizes = self.component_sizes
+        neighbors = self.free_neighbors(grid_x, grid_y)
+        
+        if self.walkable[index]:
+            labels = {components[neighbor] for neighbor in neighbors}
+            if not labels:
+                self.new_component(index)
+                return
+            # La casilla une a sus vecinas: las componentes menores pasan a la mayor
+            keep = max(labels, key=sizes.get)
+            for label in labels:
+                if label != keep:
+                    del sizes[label]
+            sizes[keep] += self.flood(index, keep)
+            return
+        
+        # Se bloqueó una casilla: su componente puede partirse
+        label = components[index]
+        components[index] = -1
+        sizes[label] -= 1
+        if not sizes[label]:
+            del sizes[label]
+        if self.ring_connected(neighbors):
+            return  # Las vecinas siguen conectadas entre sí alrededor de la casilla
+        
+        del sizes[label]
+        for neighbor in neighbors:
+            if components[neighbor] == label:
+                self.new_component(neighbor)
+    
+    def ring_connected(self, neighbors):
+        """
+        Verifica si las casillas libres alrededor de una casilla están conectadas
+        entre sí sin pasar por ella
+        """
+        if len(neighbors) <= 1:
+            return True
+        width = self.width
+        pending = set(neighbors)
+        stack = [pending.pop()]
+        while stack:
+            current = stack.pop()
+            cx, cy = current % width, current // width
+            for other in list(pending):
+                if abs(other % width - cx) <= 1 and abs(other // width - cy) <= 1:
+                    pending.discard(other)
+                    stack.append(other)
+        return not pending
+    
+    def component_labels(self, grid_x, grid_y):
+        """
+        Componentes a las que se puede llegar desde una casilla de inicio
+        
+        Si la casilla es libre es solo la suya; si es un obstáculo o está fuera
+        del mapa (como permite el A*) son las de sus vecinas libres.
+        """
+        if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
+            label = self.components[grid_y * self.width + grid_x]
+            if label != -1:
+                return {label}
+        return {self.components[neighbor] for neighbor in self.free_neighbors(grid_x, grid_y)}
+    
+    def is_reachable(self, start_tile, goal_tile):
+        """
+        Verifica en O(1) si hay camino entre dos casillas
+        """
+        goal_x, goal_y = goal_tile
+        if not (0 <= goal_x < self.width and 0 <= goal_y < self.height):
+            return False
+        label = self.components[goal_y * self.width + goal_x]
+        return label != -1 and label in self.component_labels(*start_tile)
+    
+    def nearest_reachable(self, start_tile, goal_tile):
+        """
+        Casilla alcanzable desde start_tile más cercana a goal_tile, o None
+        
+        Busca por anillos cuadrados alrededor del objetivo hasta que ningún
+        anillo más lejano pueda tener una casilla más cercana.
+        """
+        labels = self.component_labels(*start_tile)
+        if not labels:
+            return None
+        
+        width, height = self.width, self.height
+        components = self.components
+        goal_x = min(max(goal_tile[0], 0), width - 1)
+        goal_y = min(max(goal_tile[1], 0), height - 1)
+        best = None
+        best_distance = float("inf")
+        
+        for radius in range(max(width, height)):
+            if radius * radius > best_distance:
+                break
+            for y in range(goal_y - radius, goal_y + radius + 1):
+                if not 0 <= y < height:
+                    continue
+                # En las filas interiores solo los dos extremos son del anillo
+                edge = y in (goal_y - radius, goal_y + radius)
+                xs = range(goal_x - radius, goal_x + radius + 1) if edge else (goal_x - radius, goal_x + radius)
+                for x in xs:
+                    if 0 <= x < width and components[y * width + x] in labels:
+                        distance = (x - goal_x) ** 2 + (y - goal_y) ** 2
+                        if distance < best_distance:
+                            best = (x, y)
+                            best_distance = distance
+        return best
+    
     def is_walkable(self, grid_x, grid_y):
         """
         Verifica si una celda es transitable
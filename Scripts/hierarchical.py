@@ -0,0 +1,463 @@
+# Pathfinding jerárquico (HPA*) para mapas grandes - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+import heapq
+import math
+from scripts.config import Config
+from scripts.astar import AStar
+
+class HierarchicalPlanner:
+    """
+    Planificador jerárquico HPA* sobre un GameMap
+    
+    La rejilla se divide en clusters de cluster_size x cluster_size casillas.
+    En cada borde entre clusters se crean entradas (pares de casillas que
+    cruzan el borde) y dentro de cada cluster se precalcula el costo entre
+    sus entradas. Una consulta busca primero en ese grafo abstracto, mucho
+    más pequeño, y luego refina cada tramo con una búsqueda local dentro de
+    un solo cluster.
+    
+    Cambiar una casilla solo reconstruye los bordes que toca y marca como
+    pendientes los clusters afectados; los costos internos se recalculan
+    cuando una búsqueda los necesita (o todos juntos con precompute()).
+    """
+    
+    def __init__(self, game_map, cluster_size=None):
+        self.game_map = game_map
+        self.cluster_size = cluster_size or Config.HPA_CLUSTER_SIZE
+        self.grid_size = Config.TILE_SIZE
+        self.width = game_map.width
+        self.height = game_map.height
+        self.clusters_x = -(-self.width // self.cluster_size)
+        self.clusters_y = -(-self.height // self.cluster_size)
+        
+        self.straight = float(self.grid_size)
+        self.diagonal = math.sqrt(2 * self.grid_size * self.grid_size)
+        
+        self.border_links = {}   # borde -> [(casilla a, casilla b, costo)]
+        self.inter = {}          # nodo -> {nodo vecino en otro cluster: costo}
+        self.intra = {}          # nodo -> {nodo del mismo cluster: costo}
+        self.cluster_nodes = {}  # cluster -> nodos con los que se calcularon sus costos
+        self.dirty = set()       # clusters con costos internos pendientes
+        
+        self.astar = AStar(mode="astar")  # Para consultas cortas o fuera de la rejilla
+        self.nodes_expanded = 0
+        self.clusters_rebuilt = 0
+        
+        self.build()
+        game_map.add_listener(self.on_tile_changed)
+    
+    # Construcción del grafo abstracto
+    
+    def build(self):
+        """
+        Crea las entradas de todos los bordes y marca todos los clusters
+        """
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                if cx + 1 < self.clusters_x:
+                    self.build_border(("v", cx, cy))
+                if cy + 1 < self.clusters_y:
+                    self.build_border(("h", cx, cy))
+                if cx + 1 < self.clusters_x and cy + 1 < self.clusters_y:
+                    self.build_border(("c", cx, cy))
+                self.dirty.add((cx, cy))
+    
+    def precompute(self):
+        """
+        Calcula ya los costos internos de todos los clusters pendientes
+        """
+        for cluster in list(self.dirty):
+            self.ensure_cluster(cluster)
+    
+    def free(self, x, y):
+        """
+        Verifica si una casilla está dentro del mapa y es transitable
+        """
+        return (0 <= x < self.width and 0 <= y < self.height and
+                self.game_map.walkable[y * self.width + x])
+    
+    def build_border(self, key):
+        """
+        (Re)calcula las entradas de un borde
+        
+        "v": borde vertical entre (cx, cy) y (cx + 1, cy)
+        "h": borde horizontal entre (cx, cy) y (cx, cy + 1)
+        "c": esquina común de los cuatro clusters con (cx, cy) arriba a la izquierda
+        """
+        for a, b, _ in self.border_links.get(key, ()):
+            self.unlink(a, b)
+        
+        kind, cx, cy = key
+        cs = self.cluster_size
+        free = self.free
+        links = []
+        
+        if kind == "c":
+            # Cruces diagonales en la esquina que no tienen un camino recto alternativo
+            x = (cx + 1) * cs - 1
+            y = (cy + 1) * cs - 1
+            if free(x, y) and free(x + 1, y + 1) and not (free(x + 1, y) or free(x, y + 1)):
+                links.append((self.index(x, y), self.index(x + 1, y + 1), self.diagonal))
+            if free(x + 1, y) and free(x, y + 1) and not (free(x, y) or free(x + 1, y + 1)):
+                links.append((self.index(x + 1, y), self.index(x, y + 1), self.diagonal))
+        else:
+            # Casillas a cada lado del borde, recorriéndolo
+            if kind == "v":
+                x = (cx + 1) * cs - 1
+                start = cy * cs
+                length = min(cs, self.height - start)
+                side_a = [(x, start + i) for i in range(length)]
+                side_b = [(x + 1, start + i) for i in range(length)]
+            else:
+                y = (cy + 1) * cs - 1
+                start = cx * cs
+                length = min(cs, self.width - start)
+                side_a = [(start + i, y) for i in range(length)]
+                side_b = [(start + i, y + 1) for i in range(length)]
+            
+            crossing = [free(*side_a[i]) and free(*side_b[i]) for i in range(length)]
+            
+            # Un tramo continuo de cruces rectos da una o dos entradas
+            i = 0
+            while i < length:
+                if not crossing[i]:
+                    i += 1
+                    continue
+                run_start = i
+                while i < length and crossing[i]:
+                    i += 1
+                run_end = i - 1
+                if run_end - run_start + 1 >= Config.HPA_WIDE_ENTRANCE:
+                    chosen = (run_start, run_end)
+                else:
+                    chosen = ((run_start + run_end) // 2,)
+                for j in chosen:
+                    links.append((self.index(*side_a[j]), self.index(*side_b[j]), self.straight))
+            
+            # Cruces diagonales cuyas casillas no forman parte de ningún cruce recto
+            for i in range(length):
+                for j in (i - 1, i + 1):
+                    if not (0 <= j < length) or crossing[i] or crossing[j]:
+                        continue
+                    if free(*side_a[i]) and free(*side_b[j]):
+                        links.append((self.index(*side_a[i]), self.index(*side_b[j]),
+                                      self.diagonal))
+        
+        self.border_links[key] = links
+        for a, b, cost in links:
+            self.inter.setdefault(a, {})[b] = cost
+            self.inter.setdefault(b, {})[a] = cost
+    
+    def unlink(self, a, b):
+        """
+        Quita la conexión entre dos nodos de clusters distintos
+        """
+        for node, other in ((a, b), (b, a)):
+            edges = self.inter.get(node)
+            if edges is not None:
+                edges.pop(other, None)
+                if not edges:
+                    del self.inter[node]
+    
+    def on_tile_changed(self, x, y):
+        """
+        Reconstruye solo los bordes que toca la casilla y marca sus clusters
+        """
+        cs = self.cluster_size
+        cx, cy = x // cs, y // cs
+        lx, ly = x % cs, y % cs
+        touched = {(cx, cy)}
+        
+        borders = []
+        if lx == 0 and cx > 0:
+            borders.append(("v", cx - 1, cy))
+        if lx == cs - 1 and cx + 1 < self.clusters_x:
+            borders.append(("v", cx, cy))
+        if ly == 0 and cy > 0:
+            borders.append(("h", cx, cy - 1))
+        if ly == cs - 1 and cy + 1 < self.clusters_y:
+            borders.append(("h", cx, cy))
+        for corner_x in (cx - 1 if lx == 0 else None, cx if lx == cs - 1 else None):
+            for corner_y in (cy - 1 if ly == 0 else None, cy if ly == cs - 1 else None):
+                if (corner_x is not None and corner_y is not None and
+                        0 <= corner_x < self.clusters_x - 1 and
+                        0 <= corner_y < self.clusters_y - 1):
+                    borders.append(("c", corner_x, corner_y))
+        
+        for key in borders:
+            self.build_border(key)
+            kind, bx, by = key
+            if kind == "v":
+                touched.update(((bx, by), (bx + 1, by)))
+            elif kind == "h":
+                touched.update(((bx, by), (bx, by + 1)))
+            else:
+                touched.update(((bx, by), (bx + 1, by), (bx, by + 1), (bx + 1, by + 1)))
+        
+        self.dirty.update(touched)
+    
+    def ensure_cluster(self, cluster):
+        """
+        Calcula los costos internos de un cluster si están pendientes
+        """
+        if cluster not in self.dirty:
+            return
+        self.dirty.discard(cluster)
+        self.clusters_rebuilt += 1
+        
+        for node in self.cluster_nodes.get(cluster, ()):
+            self.intra.pop(node, None)
+        
+        nodes = self.collect_nodes(cluster)
+        self.cluster_nodes[cluster] = nodes
+        
+        targets = set(nodes)
+        for node in nodes:
+            distance, _ = self.search_cluster(node, cluster, targets)
+            self.intra[node] = {other: distance[other] for other in nodes
+                                if other != node and other in distance}
+    
+    def collect_nodes(self, cluster):
+        """
+        Nodos abstractos de un cluster (extremos de las entradas de sus bordes)
+        """
+        cx, cy = cluster
+        keys = (("v", cx - 1, cy), ("v", cx, cy), ("h", cx, cy - 1), ("h", cx, cy),
+                ("c", cx - 1, cy - 1), ("c", cx, cy - 1), ("c", cx - 1, cy), ("c", cx, cy))
+        nodes = []
+        for key in keys:
+            for a, b, _ in self.border_links.get(key, ()):
+                for node in (a, b):
+                    if self.cluster_of(node) == cluster and node not in nodes:
+                        nodes.append(node)
+        return nodes
+    
+    # Utilidades
+    
+    def index(self, x, y):
+        """
+        Índice plano de una casilla
+        """
+        return y * self.width + x
+    
+    def cluster_of(self, index):
+        """
+        Cluster (cx, cy) al que pertenece una casilla
+        """
+        return ((index % self.width) // self.cluster_size,
+                (index // self.width) // self.cluster_size)
+    
+    def search_cluster(self, source, cluster, targets=(), goal=-1):
+        """
+        Dijkstra limitado a un cluster desde source
+        
+        Trabaja con arreglos locales del tamaño del cluster. Termina al asentar
+        goal o todos los targets. Retorna (distancias, padres) de las casillas
+        asentadas, indexados por casilla global.
+        """
+        cs = self.cluster_size
+        cx, cy = cluster
+        x0, y0 = cx * cs, cy * cs
+        local_w = min(x0 + cs, self.width) - x0
+        local_h = min(y0 + cs, self.height) - y0
+        width = self.width
+        walkable = self.game_map.walkable
+        straight, diagonal = self.straight, self.diagonal
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        size = local_w * local_h
+        dist_of = [math.inf] * size
+        parent_of = [-1] * size
+        settled = bytearray(size)
+        
+        def to_local(index):
+            return (index // width - y0) * local_w + (index % width - x0)
+        
+        local_targets = {to_local(target) for target in targets}
+        local_goal = to_local(goal) if goal != -1 else -1
+        remaining = len(local_targets)
+        
+        local_source = to_local(source)
+        dist_of[local_source] = 0.0
+        open_heap = [(0.0, local_source)]
+        order = []
+        
+        while open_heap:
+            dist, current = heappop(open_heap)
+            if settled[current]:
+                continue
+            settled[current] = 1
+            order.append(current)
+            if current == local_goal:
+                break
+            if current in local_targets:
+                remaining -= 1
+                if remaining <= 0 and local_goal == -1:
+                    break
+            
+            lx = current % local_w
+            ly = current // local_w
+            row = (y0 + ly) * width + x0
+            for dx, dy in AStar.DIRECTIONS:
+                nx, ny = lx + dx, ly + dy
+                if not (0 <= nx < local_w and 0 <= ny < local_h):
+                    continue
+                neighbor = ny * local_w + nx
+                if settled[neighbor] or not walkable[row + dy * width + nx]:
+                    continue
+                new_dist = dist + (straight if dx == 0 or dy == 0 else diagonal)
+                if new_dist < dist_of[neighbor]:
+                    dist_of[neighbor] = new_dist
+                    parent_of[neighbor] = current
+                    heappush(open_heap, (new_dist, neighbor))
+        
+        def to_global(local):
+            return (y0 + local // local_w) * width + x0 + local % local_w
+        
+        distance = {}
+        parent = {}
+        for local in order:
+            index = to_global(local)
+            distance[index] = dist_of[local]
+            parent[index] = to_global(parent_of[local]) if parent_of[local] != -1 else -1
+        return distance, parent
+    
+    def local_path(self, a, b):
+        """
+        Camino (índices) entre dos casillas del mismo cluster, o [] si no hay
+        """
+        distance, parent = self.search_cluster(a, self.cluster_of(a), goal=b)
+        if b not in distance:
+            return []
+        path = []
+        while b != -1:
+            path.append(b)
+            b = parent[b]
+        return path[::-1]
+    
+    # Consultas
+    
+    def find_path(self, start, goal, game_map=None):
+        """
+        Encuentra un camino (casi óptimo) con la misma forma que AStar.find_path
+        """
+        gs = self.grid_size
+        sx, sy = int(start[0] // gs), int(start[1] // gs)
+        gx, gy = int(goal[0] // gs), int(goal[1] // gs)
+        self.nodes_expanded = 0
+        
+        # Objetivo en otra componente: se descarta o se acerca antes de buscar
+        goal_tile = self.astar.resolve_goal((sx, sy), (gx, gy), self.game_map)
+        if goal_tile is None:
+            return []
+        gx, gy = goal_tile
+        goal = (gx * gs, gy * gs)
+        
+        if (sx, sy) == (gx, gy):
+            return [(sx * gs, sy * gs)]
+        
+        # Consultas cortas (donde las entradas obligan a desviarse) o que empiezan
+        # fuera de la rejilla van directo con el A* plano
+        short = max(abs(gx - sx), abs(gy - sy)) <= self.cluster_size
+        if short or not (0 <= sx < self.width and 0 <= sy < self.height):
+            path = self.astar.find_path(start, goal, self.game_map)
+            self.nodes_expanded = self.astar.nodes_expanded
+            return path
+        if not self.free(gx, gy):
+            return []
+        
+        source = self.index(sx, sy)
+        target = self.index(gx, gy)
+        source_cluster = self.cluster_of(source)
+        target_cluster = self.cluster_of(target)
+        
+        abstract = self.search_abstract(source, target, source_cluster, target_cluster)
+        if not abstract:
+            return []
+        
+        # Refinar cada tramo del camino abstracto
+        path = [abstract[0]]
+        for a, b in zip(abstract, abstract[1:]):
+            if self.cluster_of(a) == self.cluster_of(b):
+                path.extend(self.local_path(a, b)[1:])
+            else:
+                path.append(b)
+        return self.to_pixels(path)
+    
+    def search_abstract(self, source, target, source_cluster, target_cluster):
+        """
+        A* sobre el grafo abstracto con el inicio y el objetivo insertados
+        """
+        self.ensure_cluster(source_cluster)
+        self.ensure_cluster(target_cluster)
+        
+        source_nodes = set(self.cluster_nodes[source_cluster])
+        if source_cluster == target_cluster:
+            # En el mismo cluster también se considera el camino local directo
+            source_nodes.add(target)
+        distance, _ = self.search_cluster(source, source_cluster, source_nodes)
+        source_links = {node: distance[node] for node in source_nodes if node in distance}
+        
+        target_nodes = set(self.cluster_nodes[target_cluster])
+        distance, _ = self.search_cluster(target, target_cluster, target_nodes)
+        target_links = {node: distance[node] for node in target_nodes if node in distance}
+        
+        width = self.width
+        gs = self.grid_size
+        tx, ty = target % width, target // width
+        
+        def heuristic(node):
+            dx = (node % width - tx) * gs
+            dy = (node // width - ty) * gs
+            return math.sqrt(dx * dx + dy * dy)
+        
+        g_score = {source: 0.0}
+        parent = {source: -1}
+        closed = set()
+        counter = 0
+        open_heap = [(heuristic(source), counter, source)]
+        
+        while open_heap:
+            _, _, current = heapq.heappop(open_heap)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.nodes_expanded += 1
+            
+            if current == target:
+                path = []
+                while current != -1:
+                    path.append(current)
+                    current = parent[current]
+                return path[::-1]
+            
+            if current == source:
+                edges = list(source_links.items())
+            else:
+                self.ensure_cluster(self.cluster_of(current))
+                edges = list(self.intra.get(current, {}).items())
+            edges.extend(self.inter.get(current, {}).items())
+            if current in target_links:
+                edges.append((target, target_links[current]))
+            
+            for neighbor, cost in edges:
+                if neighbor in closed:
+                    continue
+                g = g_score[current] + cost
+                if g < g_score.get(neighbor, math.inf):
+                    g_score[neighbor] = g
+                    parent[neighbor] = current
+                    counter += 1
+                    heapq.heappush(open_heap, (g + heuristic(neighbor), counter, neighbor))
+        
+        return []
+    
+    def to_pixels(self, indices):
+        """
+        Convierte índices de casilla a posiciones en píxeles
+        """
+        gs = self.grid_size
+        return [((index % self.width) * gs, (index // self.width) * gs) for index in indices]
\ No newline at end of file
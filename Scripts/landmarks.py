@@ -0,0 +1,164 @@
+# Heurística de landmarks (ALT) - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+import json
+import math
+import random
+import zlib
+from array import array
+from scripts.config import Config
+from scripts.flow_field import FlowField
+
+class LandmarkTable:
+    """
+    Distancias exactas desde K casillas "landmark" a todas las demás
+    
+    Por la desigualdad triangular |d(L, objetivo) - d(L, n)| nunca supera la
+    distancia real de n al objetivo, así que el máximo sobre los landmarks
+    (y la distancia euclidiana) es una heurística admisible y mucho más
+    informada que la euclidiana en mapas con muchos obstáculos.
+    
+    Las distancias se guardan en casillas como float32 (array 'f'), una tabla
+    por landmark. Bloquear casillas solo alarga las distancias reales y la
+    heurística sigue siendo válida; si se libera alguna la tabla queda
+    obsoleta y deja de usarse hasta llamar a build().
+    """
+    
+    # Margen (en casillas) que compensa el redondeo de float32
+    EPSILON = 0.002
+    
+    def __init__(self, game_map, count=None, seed=0, build=True):
+        self.game_map = game_map
+        self.count = count or Config.LANDMARK_COUNT
+        self.seed = seed
+        self.grid_size = game_map.tile_size
+        self.landmarks = []   # Índices de las casillas landmark
+        self.distances = []   # Un array('f') por landmark
+        self.stale = False
+        
+        game_map.add_listener(self.on_tile_changed)
+        if build:
+            self.build()
+    
+    def build(self):
+        """
+        Elige los landmarks (el más lejano de los anteriores, cada vez) y
+        calcula sus distancias
+        """
+        game_map = self.game_map
+        self.landmarks = []
+        self.distances = []
+        self.stale = False
+        
+        sizes = game_map.component_sizes
+        if not sizes:
+            return
+        largest = max(sizes, key=sizes.get)
+        free = [index for index, label in enumerate(game_map.components) if label == largest]
+        
+        # Primer landmark: el punto más lejano de una casilla cualquiera
+        field = FlowField()
+        start = random.Random(self.seed).choice(free)
+        field.build((start % game_map.width, start // game_map.width), game_map)
+        nearest = field.distance
+        
+        for _ in range(min(self.count, len(free))):
+            landmark = max(free, key=nearest.__getitem__)
+            field.build((landmark % game_map.width, landmark // game_map.width), game_map)
+            self.landmarks.append(landmark)
+            self.distances.append(array('f', field.distance))
+            # Distancia de cada casilla a su landmark más cercano
+            nearest = [min(a, b) for a, b in zip(nearest, field.distance)]
+    
+    def on_tile_changed(self, grid_x, grid_y):
+        """
+        Marca la tabla como obsoleta si se liberó una casilla
+        """
+        if self.game_map.walkable[grid_y * self.game_map.width + grid_x]:
+            self.stale = True
+    
+    def is_valid(self):
+        """
+        Verifica si la tabla se puede usar como heurística
+        """
+        return bool(self.landmarks) and not self.stale
+    
+    def make_heuristic(self, goal_index, start_index=-1):
+        """
+        Crea la función h(index, euclidiana) para un objetivo
+        
+        Devuelve el máximo entre la cota de los landmarks y la distancia
+        euclidiana que ya calculó el A*, en píxeles. Si se conoce el inicio solo
+        se usan los Config.LANDMARK_ACTIVE landmarks con mejor cota para él.
+        """
+        scale = self.grid_size
+        epsilon = self.EPSILON
+        pairs = [(distances, distances[goal_index]) for distances in self.distances
+                 if distances[goal_index] != math.inf]
+        if start_index != -1:
+            pairs.sort(key=lambda pair: -abs(pair[0][start_index] - pair[1]))
+            pairs = pairs[:Config.LANDMARK_ACTIVE]
+        
+        def heuristic(index, euclidean):
+            bound = 0.0
+            for distances, goal_distance in pairs:
+                difference = distances[index] - goal_distance
+                if difference < 0:
+                    difference = -difference
+                if difference > bound:
+                    bound = difference
+            bound = (bound - epsilon) * scale
+            return bound if bound > euclidean else euclidean
+        
+        return heuristic
+    
+    @staticmethod
+    def checksum(game_map):
+        """
+        Huella de la rejilla de transitabilidad para validar tablas guardadas
+        """
+        return zlib.crc32(bytes(game_map.walkable))
+    
+    def save(self, path):
+        """
+        Guarda la tabla: una línea JSON de cabecera y luego los arrays binarios
+        """
+        header = {
+            'width': self.game_map.width,
+            'height': self.game_map.height,
+            'checksum': self.checksum(self.game_map),
+            'landmarks': self.landmarks
+        }
+        with open(path, "wb") as file:
+            file.write(json.dumps(header).encode("utf-8") + b"\n")
+            for distances in self.distances:
+                distances.tofile(file)
+    
+    @classmethod
+    def load(cls, path, game_map):
+        """
+        Carga una tabla guardada para game_map
+        
+        Retorna None si el archivo no existe, está incompleto o fue calculado
+        para otro mapa.
+        """
+        size = game_map.width * game_map.height
+        distances = []
+        try:
+            with open(path, "rb") as file:
+                header = json.loads(file.readline().decode("utf-8"))
+                if (header['width'] != game_map.width or header['height'] != game_map.height or
+                        header['checksum'] != cls.checksum(game_map)):
+                    return None
+                for _ in header['landmarks']:
+                    table = array('f')
+                    table.fromfile(file, size)
+                    distances.append(table)
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+        
+        table = cls(game_map, count=len(distances), build=False)
+        table.landmarks = header['landmarks']
+        table.distances = distances
+        return table
\ No newline at end of file
@@ -0,0 +1,118 @@
+# Línea de vista por casillas - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+from scripts.config import Config
+
+class Raycaster:
+    """
+    Línea de vista con DDA por casillas (Amanatides-Woo)
+    
+    En lugar de avanzar píxel a píxel recorre solo las casillas que cruza el
+    segmento, consultando directamente la rejilla plana de transitabilidad
+    (y * width + x) del mapa. Las posiciones se dan en píxeles.
+    """
+    
+    def __init__(self, grid_size=None):
+        self.grid_size = grid_size or Config.TILE_SIZE
+        self._open_grid = bytearray()
+        
+        # Estadísticas
+        self.rays_cast = 0
+        self.tiles_visited = 0
+    
+    def get_grid(self, game_map=None):
+        """
+        Devuelve (ancho, alto, transitabilidad); sin mapa toda la pantalla es libre
+        """
+        if game_map:
+            return game_map.width, game_map.height, game_map.walkable
+        
+        width = -(-Config.SCREEN_WIDTH // self.grid_size)
+        height = -(-Config.SCREEN_HEIGHT // self.grid_size)
+        if len(self._open_grid) != width * height:
+            self._open_grid = bytearray(b"\x01") * (width * height)
+        return width, height, self._open_grid
+    
+    def line_of_sight(self, start, end, game_map=None):
+        """
+        Verifica si hay línea de vista directa entre dos puntos
+        """
+        width, height, walkable = self.get_grid(game_map)
+        return self.cast(start[0], start[1], end[0], end[1], width, height, walkable)
+    
+    def visible_from(self, sources, target, game_map=None):
+        """
+        Consulta en lote qué puntos de sources tienen línea de vista con target
+        
+        Retorna una lista de booleanos en el mismo orden que sources.
+        """
+        width, height, walkable = self.get_grid(game_map)
+        tx, ty = target
+        cast = self.cast
+        return [cast(x, y, tx, ty, width, height, walkable) for x, y in sources]
+    
+    def cast(self, x0, y0, x1, y1, width, height, walkable):
+        """
+        Recorre las casillas entre (x0, y0) y (x1, y1). Retorna False si alguna
+        de las intermedias está bloqueada o si un extremo está fuera de la
+        rejilla. Las casillas de los extremos no se comprueban: el jugador no
+        choca con los obstáculos y puede estar sobre uno
+        """
+        gs = self.grid_size
+        tile_x, tile_y = int(x0 // gs), int(y0 // gs)
+        end_x, end_y = int(x1 // gs), int(y1 // gs)
+        self.rays_cast += 1
+        
+        if not (0 <= tile_x < width and 0 <= tile_y < height and
+                0 <= end_x < width and 0 <= end_y < height):
+            return False
+        
+        dx = x1 - x0
+        dy = y1 - y0
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        abs_dx = abs(dx)
+        abs_dy = abs(dy)
+        
+        # Distancia (en cada eje) hasta el próximo borde de casilla. Se comparan
+        # next_x / abs_dx y next_y / abs_dy multiplicando en cruz, así las
+        # esquinas exactas se detectan igual en ambos sentidos del rayo
+        next_x = (tile_x + 1) * gs - x0 if step_x > 0 else x0 - tile_x * gs
+        next_y = (tile_y + 1) * gs - y0 if step_y > 0 else y0 - tile_y * gs
+        
+        visited = 0
+        while tile_x != end_x or tile_y != end_y:
+            # Al llegar a la columna (o fila) final solo se avanza en el otro eje
+            if tile_x == end_x:
+                cross = 1
+            elif tile_y == end_y:
+                cross = -1
+            else:
+                cross = next_x * abs_dy - next_y * abs_dx
+            
+            if cross < 0:
+                tile_x += step_x
+                next_x += gs
+            elif cross > 0:
+                tile_y += step_y
+                next_y += gs
+            else:
+                # Pasa justo por una esquina: se bloquea solo si ambos lados lo están
+                if (not walkable[tile_y * width + tile_x + step_x] and
+                        not walkable[(tile_y + step_y) * width + tile_x]):
+                    self.tiles_visited += visited
+                    return False
+                tile_x += step_x
+                tile_y += step_y
+                next_x += gs
+                next_y += gs
+            
+            visited += 1
+            if (not walkable[tile_y * width + tile_x] and
+                    (tile_x != end_x or tile_y != end_y)):
+                self.tiles_visited += visited
+                return False
+        
+        self.tiles_visited += visited
+        return True
\ No newline at end of file
@@ -0,0 +1,420 @@
+# Malla de navegación de rectángulos - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+import heapq
+import math
+from scripts.astar import AStar
+
+class NavMesh:
+    """
+    Malla de navegación construida con rectángulos de casillas libres
+    
+    Las casillas libres del GameMap se agrupan en rectángulos (se extiende
+    cada uno a la derecha y luego hacia abajo todo lo posible) y los
+    rectángulos vecinos se conectan con portales: el tramo de borde que
+    comparten, o un punto cuando solo se tocan en diagonal. Una consulta
+    busca sobre ese grafo, mucho más pequeño que la rejilla, y el algoritmo
+    del embudo convierte el corredor de rectángulos en un camino recto.
+    
+    Las posiciones se manejan en casillas, como la esquina superior
+    izquierda del enemigo. Cada portal es el paso de una casilla entre el
+    borde de un rectángulo y el del vecino, y se guarda como el tramo de
+    borde de cada lado; así el cuerpo del enemigo nunca sale de las casillas
+    libres (salvo en las diagonales, igual que el A*) y los puntos del camino
+    caen en casillas enteras.
+    
+    Cambiar una casilla solo rehace los rectángulos que la tocan y los
+    portales de alrededor. find_path tiene la misma forma que AStar.find_path.
+    """
+    
+    # Vecinos en cruz: se disuelven al liberar una casilla para poder unirla
+    SIDES = ((1, 0), (-1, 0), (0, 1), (0, -1))
+    
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.grid_size = game_map.tile_size
+        self.width = game_map.width
+        self.height = game_map.height
+        
+        self.rect_of = []     # Rectángulo de cada casilla (-1 si es obstáculo)
+        self.rects = []       # id -> (x0, y0, x1, y1) o None si el id está libre
+        self.free_ids = []    # ids de rectángulos borrados para reutilizar
+        self.links = []       # id -> {rectángulo vecino: (ax, ay, bx, by) del borde propio}
+        
+        self.astar = AStar()  # Para consultas que empiezan fuera de la malla
+        self.nodes_expanded = 0
+        self.rects_rebuilt = 0
+        
+        self.build()
+        game_map.add_listener(self.on_tile_changed)
+    
+    # Construcción
+    
+    def build(self):
+        """
+        Construye la malla completa
+        """
+        self.rect_of = [-1] * (self.width * self.height)
+        self.rects = []
+        self.free_ids = []
+        self.links = []
+        
+        created = self.decompose(0, 0, self.width, self.height)
+        for rect in created:
+            self.link_rect(rect)
+    
+    def decompose(self, left, top, right, bottom):
+        """
+        Cubre con rectángulos las casillas libres sin rectángulo de la zona.
+        Retorna los ids creados
+        """
+        width, height = self.width, self.height
+        walkable = self.game_map.walkable
+        rect_of = self.rect_of
+        created = []
+        
+        for y in range(top, bottom):
+            row = y * width
+            x = left
+            while x < right:
+                rect = rect_of[row + x]
+                if rect != -1:
+                    # Saltar el resto del rectángulo que ya cubre esta fila
+                    x = self.rects[rect][2]
+                    continue
+                if not walkable[row + x]:
+                    x += 1
+                    continue
+                
+                # Extender a la derecha y luego hacia abajo mientras la fila siga libre
+                x1 = x + 1
+                while x1 < width and walkable[row + x1] and rect_of[row + x1] == -1:
+                    x1 += 1
+                span = x1 - x
+                y1 = y + 1
+                while y1 < height:
+                    start = y1 * width + x
+                    if (walkable.find(0, start, start + span) != -1 or
+                            rect_of[start:start + span].count(-1) != span):
+                        break
+                    y1 += 1
+                
+                created.append(self.add_rect(x, y, x1, y1))
+                x = x1
+        
+        self.rects_rebuilt += len(created)
+        return created
+    
+    def add_rect(self, x0, y0, x1, y1):
+        """
+        Registra un rectángulo y marca sus casillas
+        """
+        if self.free_ids:
+            rect = self.free_ids.pop()
+            self.rects[rect] = (x0, y0, x1, y1)
+            self.links[rect] = {}
+        else:
+            rect = len(self.rects)
+            self.rects.append((x0, y0, x1, y1))
+            self.links.append({})
+        
+        width = self.width
+        for y in range(y0, y1):
+            start = y * width
+            self.rect_of[start + x0:start + x1] = [rect] * (x1 - x0)
+        return rect
+    
+    def remove_rect(self, rect):
+        """
+        Borra un rectángulo, sus casillas y sus portales
+        """
+        x0, y0, x1, y1 = self.rects[rect]
+        width = self.width
+        for y in range(y0, y1):
+            start = y * width
+            self.rect_of[start + x0:start + x1] = [-1] * (x1 - x0)
+        self.unlink_rect(rect)
+        self.rects[rect] = None
+        self.free_ids.append(rect)
+    
+    def unlink_rect(self, rect):
+        """
+        Quita los portales de un rectángulo en ambos sentidos
+        """
+        for neighbor in self.links[rect]:
+            self.links[neighbor].pop(rect, None)
+        self.links[rect] = {}
+    
+    def link_rect(self, rect):
+        """
+        Busca los rectángulos vecinos recorriendo el borde y crea los portales
+        
+        Dos rectángulos solo pueden compartir un tramo de borde, así que basta
+        con el primer y el último tramo de cada vecino en cada lado.
+        """
+        x0, y0, x1, y1 = self.rects[rect]
+        width, height = self.width, self.height
+        rect_of = self.rect_of
+        links = self.links
+        self.unlink_rect(rect)
+        
+        # vecino -> (borde propio, borde del vecino), cada uno como (ax, ay, bx, by)
+        found = {}
+        # Lados izquierdo y derecho: portales verticales
+        for x, own_x in ((x0 - 1, x0), (x1, x1 - 1)):
+            if 0 <= x < width:
+                for y in range(y0, y1):
+                    neighbor = rect_of[y * width + x]
+                    if neighbor != -1:
+                        first = found[neighbor][0][1] if neighbor in found else y
+                        found[neighbor] = ((own_x, first, own_x, y), (x, first, x, y))
+        # Lados de arriba y abajo: portales horizontales
+        for y, own_y in ((y0 - 1, y0), (y1, y1 - 1)):
+            if 0 <= y < height:
+                for x in range(x0, x1):
+                    neighbor = rect_of[y * width + x]
+                    if neighbor != -1:
+                        first = found[neighbor][0][0] if neighbor in found else x
+                        found[neighbor] = ((first, own_y, x, own_y), (first, y, x, y))
+        
+        # Esquinas que solo se tocan en diagonal (ambos lados bloqueados)
+        for x, y, dx, dy in ((x0, y0, -1, -1), (x1 - 1, y0, 1, -1),
+                             (x0, y1 - 1, -1, 1), (x1 - 1, y1 - 1, 1, 1)):
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            neighbor = rect_of[ny * width + nx]
+            if (neighbor != -1 and rect_of[y * width + nx] == -1 and
+                    rect_of[ny * width + x] == -1):
+                found[neighbor] = ((x, y, x, y), (nx, ny, nx, ny))
+        
+        for neighbor, (own, other) in found.items():
+            links[rect][neighbor] = own
+            links[neighbor][rect] = other
+    
+    def on_tile_changed(self, x, y):
+        """
+        Rehace los rectángulos que tocan la casilla y los portales de alrededor
+        """
+        width, height = self.width, self.height
+        index = y * width + x
+        dissolved = set()
+        if self.rect_of[index] != -1:
+            dissolved.add(self.rect_of[index])
+        if self.game_map.walkable[index]:
+            # Casilla liberada: se disuelven sus vecinos para poder unirla a ellos
+            for dx, dy in self.SIDES:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and self.rect_of[ny * width + nx] != -1:
+                    dissolved.add(self.rect_of[ny * width + nx])
+        
+        left, top, right, bottom = x, y, x + 1, y + 1
+        for rect in dissolved:
+            x0, y0, x1, y1 = self.rects[rect]
+            left, top = min(left, x0), min(top, y0)
+            right, bottom = max(right, x1), max(bottom, y1)
+            self.remove_rect(rect)
+        
+        created = self.decompose(left, top, right, bottom)
+        
+        # Los portales en diagonal de los rectángulos cercanos dependen de la casilla
+        nearby = set(created)
+        for ny in range(max(0, y - 1), min(height, y + 2)):
+            for nx in range(max(0, x - 1), min(width, x + 2)):
+                if self.rect_of[ny * width + nx] != -1:
+                    nearby.add(self.rect_of[ny * width + nx])
+        for rect in nearby:
+            self.link_rect(rect)
+    
+    # Consultas
+    
+    def find_path(self, start, goal, game_map=None):
+        """
+        Encuentra un camino con la misma forma que AStar.find_path
+        
+        El primer punto es la casilla de inicio y el último la del objetivo;
+        los de en medio son los extremos de los portales donde el camino gira.
+        """
+        gs = self.grid_size
+        width = self.width
+        sx, sy = int(start[0] // gs), int(start[1] // gs)
+        gx, gy = int(goal[0] // gs), int(goal[1] // gs)
+        self.nodes_expanded = 0
+        
+        # Objetivo en otra componente: se descarta o se acerca antes de buscar
+        goal_tile = self.astar.resolve_goal((sx, sy), (gx, gy), self.game_map)
+        if goal_tile is None:
+            return []
+        gx, gy = goal_tile
+        
+        if (sx, sy) == (gx, gy):
+            return [(sx * gs, sy * gs)]
+        if not (0 <= gx < width and 0 <= gy < self.height) or self.rect_of[gy * width + gx] == -1:
+            return []
+        
+        # Inicio fuera de la rejilla o sobre un obstáculo: A* sobre la rejilla
+        if not (0 <= sx < width and 0 <= sy < self.height) or self.rect_of[sy * width + sx] == -1:
+            path = self.astar.find_path(start, (gx * gs, gy * gs), self.game_map)
+            self.nodes_expanded = self.astar.nodes_expanded
+            return path
+        
+        source = self.rect_of[sy * width + sx]
+        target = self.rect_of[gy * width + gx]
+        corridor = self.search(source, target, (sx, sy), (gx, gy))
+        if not corridor:
+            return []
+        
+        points = self.string_pull(corridor, (sx, sy), (gx, gy))
+        return [(px * gs, py * gs) for px, py in points]
+    
+    def search(self, source, target, start, goal):
+        """
+        A* sobre los portales. Retorna la lista de rectángulos del corredor
+        
+        Cada nodo es el cruce de un rectángulo a un vecino, así que un mismo
+        rectángulo se puede atravesar desde varios lados. El punto de cruce es
+        el del borde que queda en la recta hacia el objetivo (o el extremo más
+        cercano a ella).
+        """
+        if source == target:
+            return [source]
+        goal_x, goal_y = goal
+        links = self.links
+        
+        def crossing(px, py, a, b):
+            # Punto de entrada al borde de b: donde lo corta la recta hacia el
+            # objetivo, limitado a los extremos del portal
+            ax, ay, bx, by = links[b][a]
+            if ax == bx and ay != by:
+                y = py if goal_x == px else py + (goal_y - py) * (ax - px) / (goal_x - px)
+                return ax, min(max(y, ay), by)
+            if ay == by and ax != bx:
+                x = px if goal_y == py else px + (goal_x - px) * (ay - py) / (goal_y - py)
+                return min(max(x, ax), bx), ay
+            return ax, ay
+        
+        g_score = {}
+        parent = {}
+        entry = {}
+        counter = 0
+        open_heap = []
+        for neighbor in links[source]:
+            nx, ny = crossing(start[0], start[1], source, neighbor)
+            g = math.hypot(nx - start[0], ny - start[1])
+            key = (source, neighbor)
+            g_score[key] = g
+            parent[key] = None
+            entry[key] = (nx, ny)
+            counter += 1
+            heapq.heappush(open_heap, (g + math.hypot(nx - goal_x, ny - goal_y), counter, key))
+        
+        closed = set()
+        while open_heap:
+            _, _, current = heapq.heappop(open_heap)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.nodes_expanded += 1
+            
+            rect = current[1]
+            if rect == target:
+                corridor = [rect]
+                while current is not None:
+                    corridor.append(current[0])
+                    current = parent[current]
+                return corridor[::-1]
+            
+            px, py = entry[current]
+            for neighbor in links[rect]:
+                key = (rect, neighbor)
+                if neighbor == current[0] or key in closed:
+                    continue
+                nx, ny = crossing(px, py, rect, neighbor)
+                g = g_score[current] + math.hypot(nx - px, ny - py)
+                if g < g_score.get(key, math.inf):
+                    g_score[key] = g
+                    entry[key] = (nx, ny)
+                    parent[key] = current
+                    counter += 1
+                    heapq.heappush(open_heap, (g + math.hypot(nx - goal_x, ny - goal_y),
+                                               counter, key))
+        
+        return []
+    
+    def string_pull(self, corridor, start, goal):
+        """
+        Algoritmo del embudo sobre los portales del corredor
+        """
+        portals = [(start, start)]
+        for a, b in zip(corridor, corridor[1:]):
+            portals.extend(self.oriented_portal(a, b))
+        portals.append((goal, goal))
+        
+        def area(a, b, c):
+            # Doble del área con signo del triángulo abc
+            return (c[0] - a[0]) * (b[1] - a[1]) - (b[0] - a[0]) * (c[1] - a[1])
+        
+        points = [start]
+        apex = left = right = start
+        apex_index = left_index = right_index = 0
+        i = 1
+        while i < len(portals):
+            new_left, new_right = portals[i]
+            
+            # Cerrar el lado derecho del embudo
+            if area(apex, right, new_right) <= 0:
+                if apex == right or area(apex, left, new_right) > 0:
+                    right, right_index = new_right, i
+                else:
+                    # El derecho cruzó al izquierdo: el izquierdo es un punto del camino
+                    if left != points[-1]:
+                        points.append(left)
+                    apex, apex_index = left, left_index
+                    right, right_index = apex, apex_index
+                    i = apex_index + 1
+                    continue
+            
+            # Cerrar el lado izquierdo del embudo
+            if area(apex, left, new_left) >= 0:
+                if apex == left or area(apex, right, new_left) < 0:
+                    left, left_index = new_left, i
+                else:
+                    if right != points[-1]:
+                        points.append(right)
+                    apex, apex_index = right, right_index
+                    left, left_index = apex, apex_index
+                    i = apex_index + 1
+                    continue
+            
+            i += 1
+        
+        if goal != points[-1]:
+            points.append(goal)
+        return points
+    
+    def oriented_portal(self, a, b):
+        """
+        Bordes de salida de a y de entrada a b como (izquierdo, derecho) según
+        el sentido de avance
+        """
+        ax, ay, bx, by = self.links[a][b]
+        cx, cy, dx, dy = self.links[b][a]
+        # Sentido de avance: de un borde al otro
+        forward_x = (cx + dx - ax - bx) / 2
+        forward_y = (cy + dy - ay - by) / 2
+        if forward_x * (by - ay) - forward_y * (bx - ax) < 0:
+            return ((ax, ay), (bx, by)), ((cx, cy), (dx, dy))
+        return ((bx, by), (ax, ay)), ((dx, dy), (cx, cy))
+    
+    def get_stats(self):
+        """
+        Devuelve el tamaño de la malla
+        """
+        rects = sum(1 for rect in self.rects if rect is not None)
+        portals = sum(len(links) for links in self.links) // 2
+        return {
+            'rects': rects,
+            'portals': portals,
+            'rects_rebuilt': self.rects_rebuilt
+        }
\ No newline at end of file
@@ -0,0 +1,82 @@
+# Caché LRU de caminos - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+from collections import OrderedDict
+from scripts.config import Config
+
+class PathCache:
+    """
+    Caché LRU acotada de caminos A*
+    
+    La clave es (casilla inicio, casilla objetivo, versión del mapa), así que
+    cualquier cambio en el mapa deja obsoletas las entradas anteriores sin
+    tener que recorrerlas. Los caminos guardados se comparten entre quienes
+    los piden y no deben modificarse.
+    """
+    
+    def __init__(self, capacity=None):
+        self.capacity = capacity or Config.PATH_CACHE_SIZE
+        self.grid_size = Config.TILE_SIZE
+        self.entries = OrderedDict()
+        self.game_map = None
+        
+        # Estadísticas
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def make_key(self, start, goal, game_map=None, version=None):
+        """
+        Construye la clave de una consulta (version: la del mapa con que se
+        calculó el camino, por defecto la actual)
+        """
+        if game_map is not self.game_map:
+            # La caché es de un solo mapa
+            self.entries.clear()
+            self.game_map = game_map
+        
+        return (int(start[0] // self.grid_size), int(start[1] // self.grid_size),
+                int(goal[0] // self.grid_size), int(goal[1] // self.grid_size),
+                getattr(game_map, "version", 0) if version is None else version)
+    
+    def get(self, start, goal, game_map=None):
+        """
+        Devuelve el camino guardado o None si no está
+        """
+        key = self.make_key(start, goal, game_map)
+        path = self.entries.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+        
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return path
+    
+    def put(self, start, goal, game_map, path, version=None):
+        """
+        Guarda un camino (también los vacíos: objetivo inalcanzable). Un camino
+        calculado con una versión anterior del mapa se guarda con esa versión,
+        así que nunca se entrega para la actual
+        """
+        key = self.make_key(start, goal, game_map, version)
+        self.entries[key] = path
+        self.entries.move_to_end(key)
+        
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+    
+    def get_stats(self):
+        """
+        Devuelve las estadísticas de la caché
+        """
+        total = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0
+        }
\ No newline at end of file
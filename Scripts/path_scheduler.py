@@ -0,0 +1,276 @@
+# Planificador de búsquedas de caminos - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+from collections import deque
+from scripts.config import Config
+from scripts.astar import AStar, SearchWorkspace
+
+class PathRequest:
+    """
+    Solicitud de camino compartida por todos los enemigos con el mismo
+    inicio y objetivo (en casillas)
+    """
+    
+    def __init__(self, key, start, goal, game_map, submitted_at):
+        self.key = key              # (casilla inicio, casilla objetivo)
+        self.start = start
+        self.goal = goal
+        self.game_map = game_map
+        self.version = getattr(game_map, "version", 0)  # Versión del mapa al pedirla
+        self.search = None          # Búsqueda incremental (modo por frames)
+        self.future = None          # Resultado del pool de procesos
+        self.requesters = []
+        self.distance = float("inf")  # Menor distancia al jugador entre los solicitantes
+        self.staleness = 0.0          # Mayor antigüedad del camino actual
+        self.submitted_at = submitted_at
+
+class PathScheduler:
+    """
+    Planificador central de búsquedas A*
+    
+    Los enemigos envían solicitudes con submit() y reciben el camino con
+    set_path(). Las solicitudes se atienden por prioridad (cercanía al jugador
+    y antigüedad del camino actual), las que comparten inicio y objetivo se
+    fusionan en una sola búsqueda y una solicitud nueva del mismo enemigo
+    reemplaza a la anterior.
+    
+    Cada frame se expanden como máximo node_budget nodos en total, y cada
+    búsqueda avanza a lo sumo slice_nodes nodos por turno. Si la cola se llena
+    se descartan las solicitudes menos prioritarias, así que bajo carga la IA
+    se degrada poco a poco en lugar de provocar picos en el frame.
+    
+    Con una PathCache los caminos ya conocidos se entregan al instante y los
+    nuevos se guardan al terminar.
+    
+    Si se le pasa un PathWorkerPool las búsquedas se envían a los procesos
+    trabajadores en orden de prioridad y los enemigos siguen su camino
+    anterior hasta que el resultado está listo.
+    """
+    
+    def __init__(self, node_budget=None, slice_nodes=None, max_pending=None, pool=None,
+                 cache=None):
+        self.node_budget = node_budget or Config.PATHFINDING_NODE_BUDGET
+        self.slice_nodes = slice_nodes or Config.PATHFINDING_SLICE_NODES
+        self.max_pending = max_pending or Config.PATHFINDING_MAX_PENDING
+        self.staleness_weight = Config.PATHFINDING_STALENESS_WEIGHT
+        self.grid_size = Config.TILE_SIZE
+        self.astar = AStar()
+        self.cache = cache
+        self.pool = pool
+        if pool:
+            self.max_in_flight = max(1, pool.workers) * Config.PATHFINDING_JOBS_PER_WORKER
+        
+        self.pending = {}         # clave -> PathRequest
+        self.by_requester = {}    # solicitante -> PathRequest
+        self.workspaces = []      # Arreglos libres para reutilizar
+        self.time = 0.0
+        self.nodes_last_frame = 0
+        
+        # Contadores
+        self.queued = 0
+        self.merged = 0
+        self.served = 0
+        self.dropped = 0
+    
+    def submit(self, requester, start, goal, game_map=None, distance=0.0, staleness=0.0):
+        """
+        Envía una solicitud de camino
+        
+        distance es la distancia del solicitante al jugador y staleness el
+        tiempo (en segundos) desde que recibió su último camino.
+        """
+        key = (self.to_tile(start), self.to_tile(goal))
+        
+        previous = self.by_requester.get(requester)
+        if previous is not None:
+            if previous.key == key:
+                # Misma búsqueda: solo se recalcula su prioridad (el solicitante
+                # pudo acercarse al jugador o llevar más tiempo esperando)
+                if len(previous.requesters) == 1:
+                    previous.distance = distance
+                    previous.staleness = staleness
+                else:
+                    previous.distance = min(previous.distance, distance)
+                    previous.staleness = max(previous.staleness, staleness)
+                return previous
+            # La solicitud nueva reemplaza a la anterior
+            self.remove_requester(requester)
+            self.dropped += 1
+        
+        if self.cache:
+            path = self.cache.get(start, goal, game_map)
+            if path is not None:
+                requester.set_path(path)
+                self.served += 1
+                return None
+        
+        request = self.pending.get(key)
+        if request is None:
+            request = PathRequest(key, start, goal, game_map, self.time)
+            if not self.pool:
+                workspace = self.workspaces.pop() if self.workspaces else SearchWorkspace()
+                request.search = self.astar.start_search(start, goal, game_map, workspace)
+            self.pending[key] = request
+            self.queued += 1
+        else:
+            self.merged += 1
+        
+        request.requesters.append(requester)
+        request.distance = min(request.distance, distance)
+        request.staleness = max(request.staleness, staleness)
+        self.by_requester[requester] = request
+        
+        if len(self.pending) > self.max_pending:
+            self.drop_request(max(self.pending.values(), key=self.priority))
+        
+        return request
+    
+    def to_tile(self, position):
+        """
+        Convierte una posición en píxeles a casilla
+        """
+        return (int(position[0] // self.grid_size), int(position[1] // self.grid_size))
+    
+    def priority(self, request):
+        """
+        Prioridad de una solicitud (menor = más urgente)
+        """
+        waited = self.time - request.submitted_at
+        return request.distance - self.staleness_weight * (request.staleness + waited)
+    
+    def is_pending(self, requester):
+        """
+        Verifica si el solicitante tiene una búsqueda en curso
+        """
+        return requester in self.by_requester
+    
+    def cancel(self, requester):
+        """
+        Descarta las búsquedas pendientes de un solicitante (p. ej. enemigo muerto)
+        """
+        if requester in self.by_requester:
+            self.remove_requester(requester)
+    
+    def remove_requester(self, requester):
+        """
+        Quita un solicitante de su solicitud y la elimina si queda vacía
+        """
+        request = self.by_requester.pop(requester)
+        request.requesters.remove(requester)
+        if not request.requesters:
+            self.finish(request)
+    
+    def drop_request(self, request):
+        """
+        Descarta una solicitud completa avisando a sus solicitantes
+        """
+        self.finish(request)
+        for requester in request.requesters:
+            del self.by_requester[requester]
+            requester.path_request_dropped()
+            self.dropped += 1
+    
+    def finish(self, request):
+        """
+        Saca la solicitud de la cola y recicla sus arreglos
+        """
+        del self.pending[request.key]
+        if request.search:
+            self.workspaces.append(request.search.workspace)
+        if request.future:
+            request.future.cancel()
+    
+    def deliver(self, request, path, version):
+        """
+        Entrega el camino a todos los solicitantes de una solicitud. version es
+        la del mapa con que se calculó (la caché lo guarda con esa)
+        """
+        self.finish(request)
+        if self.cache:
+            self.cache.put(request.start, request.goal, request.game_map, path, version)
+        for requester in request.requesters:
+            del self.by_requester[requester]
+            requester.set_path(path)
+            self.served += 1
+    
+    def update(self, dt=0.0):
+        """
+        Avanza las búsquedas pendientes sin pasar del presupuesto del frame
+        """
+        self.time += dt
+        if self.pool:
+            return self.update_pool()
+        
+        budget = self.node_budget
+        queue = deque(sorted(self.pending.values(), key=self.priority))
+        
+        while budget > 0 and queue:
+            request = queue.popleft()
+            search = request.search
+            budget -= max(1, search.step(min(self.slice_nodes, budget)))
+            
+            if search.done:
+                # Si el mapa cambió durante la búsqueda se entrega igual, pero
+                # queda en la caché con la versión con que empezó
+                self.deliver(request, search.path, request.version)
+            else:
+                queue.append(request)
+        
+        self.nodes_last_frame = self.node_budget - budget
+        return self.nodes_last_frame
+    
+    def update_pool(self):
+        """
+        Envía al pool las solicitudes más prioritarias y entrega las terminadas
+        """
+        in_flight = sum(1 for request in self.pending.values() if request.future)
+        waiting = sorted((request for request in self.pending.values() if not request.future),
+                         key=self.priority)
+        for request in waiting[:max(0, self.max_in_flight - in_flight)]:
+            request.future = self.pool.submit(request.start, request.goal, request.game_map)
+        
+        for request in list(self.pending.values()):
+            future = request.future
+            if not future or not future.done():
+                continue
+            if future.cancelled():
+                # Cancelada al reiniciar los procesos: se reenvía
+                request.future = None
+                continue
+            current = getattr(request.game_map, "version", 0)
+            try:
+                version, path = future.result()
+            except Exception as e:
+                # El trabajador falló (o el pool se cayó): se busca aquí mismo
+                print(f"✗ Error en la búsqueda del pool: {e!r}")
+                version = current
+                path = self.astar.find_path(request.start, request.goal, request.game_map)
+            if version != current:
+                # Calculado con una versión vieja del mapa: se reenvía
+                request.future = None
+            else:
+                self.deliver(request, path, version)
+        
+        self.nodes_last_frame = 0
+        return 0
+    
+    def shutdown(self):
+        """
+        Cierra el pool de procesos si lo hay
+        """
+        if self.pool:
+            self.pool.shutdown()
+    
+    def get_stats(self):
+        """
+        Devuelve los contadores del planificador
+        """
+        return {
+            'pending': len(self.pending),
+            'queued': self.queued,
+            'merged': self.merged,
+            'served': self.served,
+            'dropped': self.dropped,
+            'nodes_last_frame': self.nodes_last_frame
+        }
\ No newline at end of file
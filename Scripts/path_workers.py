@@ -0,0 +1,172 @@
+# Pool de procesos para pathfinding - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+import copy
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from scripts.config import Config
+from scripts.astar import AStar
+from scripts.game_map import GameMap
+
+class GridSnapshot:
+    """
+    Copia de solo lectura de la rejilla de transitabilidad de un GameMap
+    
+    Tiene los mismos atributos que usa AStar (width, height, walkable,
+    version y componentes conexas), así que se puede pasar como game_map a
+    find_path.
+    """
+    
+    # Mismas consultas de alcanzabilidad que GameMap
+    NEIGHBORS = GameMap.NEIGHBORS
+    free_neighbors = GameMap.free_neighbors
+    component_labels = GameMap.component_labels
+    is_reachable = GameMap.is_reachable
+    nearest_reachable = GameMap.nearest_reachable
+    
+    # Etiquetado de componentes de GameMap (para aplicar cambios)
+    build_components = GameMap.build_components
+    new_component = GameMap.new_component
+    flood = GameMap.flood
+    
+    def __init__(self, game_map):
+        self.width = game_map.width
+        self.height = game_map.height
+        self.walkable = bytes(game_map.walkable)
+        self.components = list(game_map.components)
+        self.version = game_map.version
+    
+    def apply(self, edits, version):
+        """
+        Copia de la rejilla con los cambios (índice, libre) aplicados, como
+        versión version del mapa
+        """
+        snapshot = copy.copy(self)
+        walkable = bytearray(self.walkable)
+        for index, free in edits:
+            walkable[index] = free
+        snapshot.walkable = bytes(walkable)
+        snapshot.version = version
+        snapshot.build_components()
+        return snapshot
+
+# Estado de cada proceso trabajador
+_worker_base = None   # Rejilla con la que arrancó
+_worker_grid = None   # Rejilla de la última versión recibida
+_worker_astar = None
+
+def _init_worker(grid):
+    """
+    Inicializa un proceso trabajador con su copia de la rejilla
+    """
+    global _worker_base, _worker_grid, _worker_astar
+    _worker_base = grid
+    _worker_grid = grid
+    _worker_astar = AStar()
+
+def _find_path_in_worker(start, goal, version, edits):
+    """
+    Ejecuta A* dentro del trabajador con la rejilla de version (la inicial
+    más los cambios edits). Retorna (versión, camino)
+    """
+    global _worker_grid
+    if _worker_grid.version != version:
+        _worker_grid = _worker_base.apply(edits, version)
+    return version, _worker_astar.find_path(start, goal, _worker_grid)
+
+class PathWorkerPool:
+    """
+    Ejecuta búsquedas A* en un ProcessPoolExecutor fuera del game loop
+    
+    Cada trabajador guarda una copia de solo lectura de la rejilla. Los
+    cambios de casillas posteriores viajan con cada búsqueda (junto con la
+    versión del mapa) y el trabajador los aplica a su copia, así que editar
+    el mapa no reinicia los procesos; solo se reinician con una rejilla nueva
+    cuando se acumulan más de max_edits cambios. Cada resultado lleva la
+    versión con que se calculó. Con workers=0 las búsquedas se hacen de forma
+    síncrona al enviarlas (modo determinista), pero igual se entregan como
+    Future.
+    """
+    
+    def __init__(self, workers=None, max_edits=None):
+        self.workers = Config.PATHFINDING_WORKERS if workers is None else workers
+        self.max_edits = Config.PATHFINDING_WORKER_MAX_EDITS if max_edits is None else max_edits
+        self.executor = None
+        self.grid = None      # Rejilla con la que arrancaron los trabajadores
+        self.local = None     # Rejilla actual para el modo síncrono
+        self.edits = {}       # Índice -> libre, cambios desde self.grid
+        self.game_map = None
+        self.astar = AStar()
+        
+        # Estadísticas
+        self.restarts = 0
+    
+    def update_map(self, game_map):
+        """
+        Se engancha a un mapa nuevo (rejilla nueva y procesos nuevos) o, si ya
+        hay demasiados cambios pendientes, reinicia los procesos
+        """
+        if game_map is not self.game_map:
+            self.game_map = game_map
+            game_map.add_listener(self.tile_changed)
+            self.restart()
+            return True
+        if len(self.edits) > self.max_edits:
+            self.restart()
+            return True
+        return False
+    
+    def tile_changed(self, grid_x, grid_y):
+        """
+        Anota un cambio de casilla del mapa (listener de GameMap)
+        """
+        index = grid_y * self.game_map.width + grid_x
+        self.edits[index] = self.game_map.walkable[index]
+    
+    def restart(self):
+        """
+        Toma una rejilla nueva del mapa y, con procesos, reemplaza el pool
+        """
+        self.grid = GridSnapshot(self.game_map)
+        self.local = self.grid
+        self.edits = {}
+        if self.workers > 0:
+            if self.executor:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.restarts += 1
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                initializer=_init_worker,
+                                                initargs=(self.grid,))
+    
+    def submit(self, start, goal, game_map):
+        """
+        Envía una búsqueda y devuelve un Future con (versión del mapa, camino)
+        """
+        self.update_map(game_map)
+        version = game_map.version
+        
+        if self.executor:
+            try:
+                return self.executor.submit(_find_path_in_worker, start, goal, version,
+                                            tuple(self.edits.items()))
+            except BrokenProcessPool:
+                # Un proceso murió: se sigue en modo síncrono
+                print("✗ Pool de pathfinding caído: búsquedas en el game loop")
+                self.shutdown()
+                self.workers = 0
+        
+        # Modo síncrono
+        if self.local.version != version:
+            self.local = self.grid.apply(self.edits.items(), version)
+        future = Future()
+        future.set_result((version, self.astar.find_path(start, goal, self.local)))
+        return future
+    
+    def shutdown(self):
+        """
+        Cierra los procesos trabajadores
+        """
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
\ No newline at end of file
@@ -0,0 +1,681 @@
+# Benchmark del pathfinding - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+"""
+Compara el A* original (listas abiertas/cerradas) con el motor actual basado
+en heap y arreglos planos. Verifica además que ambos devuelven el mismo camino.
+
+También mide el costo de N enemigos persiguiendo al jugador con un A* por
+enemigo frente a un único campo de flujo compartido, y el costo de repetir
+consultas con la caché LRU de caminos. Por último compara el A* clásico
+con Jump Point Search en mapas abiertos y con obstáculos, el planificador
+jerárquico (HPA*) con el A* plano en mapas grandes, D* Lite con el A* desde
+cero durante una persecución, la línea de vista píxel a píxel con el DDA
+por casillas, el rechazo de objetivos inalcanzables con las componentes
+conexas del mapa, la heurística de landmarks (ALT) con la euclidiana, el
+A* casilla por casilla con el Lazy Theta* any-angle, la malla de
+navegación de rectángulos con ambos, y la persecución con el campo de flujo
+frente a las reservas cooperativas (WHCA*).
+
+Uso:
+    python -m scripts.pathfinding_benchmark
+"""
+
+import math
+import os
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+from scripts.config import Config
+from scripts.astar import AStar, DStarLite, Node
+from scripts.flow_field import FlowField
+from scripts.path_cache import PathCache
+from scripts.hierarchical import HierarchicalPlanner
+from scripts.game_map import GameMap
+from scripts.line_of_sight import Raycaster
+from scripts.landmarks import LandmarkTable
+from scripts.nav_mesh import NavMesh
+from scripts.cooperative import CooperativePlanner
+
+class ListAStar(AStar):
+    """
+    A* original basado en listas, conservado como referencia para el benchmark
+    """
+    
+    def get_neighbors(self, position, game_map=None):
+        """
+        Igual que AStar.get_neighbors pero con los límites del mapa recibido
+        """
+        if game_map is None:
+            return super().get_neighbors(position)
+        
+        x, y = position
+        neighbors = []
+        for dx, dy in self.DIRECTIONS:
+            new_x = x + dx * self.grid_size
+            new_y = y + dy * self.grid_size
+            if (0 <= new_x < game_map.width * self.grid_size and
+                0 <= new_y < game_map.height * self.grid_size):
+                neighbors.append((new_x, new_y))
+        return neighbors
+    
+    def find_path(self, start, goal, game_map=None):
+        """
+        Versión original de find_path: min() sobre la lista abierta y búsqueda
+        lineal en la lista cerrada
+        """
+        start_grid = (int(start[0] // self.grid_size) * self.grid_size,
+                     int(start[1] // self.grid_size) * self.grid_size)
+        goal_grid = (int(goal[0] // self.grid_size) * self.grid_size,
+                    int(goal[1] // self.grid_size) * self.grid_size)
+        
+        start_node = Node(start_grid)
+        goal_node = Node(goal_grid)
+        
+        open_list = [start_node]
+        closed_list = []
+        open_dict = {start_grid: start_node}
+        self.nodes_expanded = 0
+        
+        while open_list:
+            current_node = min(open_list, key=lambda n: n.f)
+            
+            open_list.remove(current_node)
+            del open_dict[current_node.position]
+            closed_list.append(current_node)
+            self.nodes_expanded += 1
+            
+            if current_node == goal_node:
+                return self.reconstruct_path(current_node)
+            
+            for neighbor_pos in self.get_neighbors(current_node.position, game_map):
+                if game_map and not game_map.is_walkable(neighbor_pos[0] // self.grid_size,
+                                                         neighbor_pos[1] // self.grid_size):
+                    continue
+                
+                if any(node.position == neighbor_pos for node in closed_list):
+                    continue
+                
+                neighbor_node = Node(neighbor_pos, current_node)
+                neighbor_node.g = current_node.g + self.heuristic(current_node.position, neighbor_pos)
+                neighbor_node.h = self.heuristic(neighbor_pos, goal_grid)
+                neighbor_node.f = neighbor_node.g + neighbor_node.h
+                
+                if neighbor_pos in open_dict:
+                    existing_node = open_dict[neighbor_pos]
+                    if neighbor_node.g < existing_node.g:
+                        existing_node.parent = current_node
+                        existing_node.g = neighbor_node.g
+                        existing_node.f = neighbor_node.f
+                else:
+                    open_list.append(neighbor_node)
+                    open_dict[neighbor_pos] = neighbor_node
+        
+        return []
+    
+    def line_of_sight(self, start, end, game_map=None):
+        """
+        Versión original: Bresenham en píxeles con is_walkable en cada píxel
+        """
+        x0, y0 = start
+        x1, y1 = end
+        
+        dx = abs(x1 - x0)
+        dy = abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx - dy
+        
+        x, y = x0, y0
+        
+        while True:
+            if not self.is_walkable((x, y), game_map):
+                return False
+            
+            if x == x1 and y == y1:
+                break
+            
+            e2 = 2 * err
+            if e2 > -dy:
+                err -= dy
+                x += sx
+            if e2 < dx:
+                err += dx
+                y += sy
+        
+        return True
+
+
+def build_queries(game_map, count, seed):
+    """
+    Genera pares (inicio, objetivo) en píxeles sobre casillas transitables
+    """
+    rng = random.Random(seed)
+    tile = game_map.tile_size
+    free = [(x, y) for y in range(game_map.height) for x in range(game_map.width)
+            if game_map.is_walkable(x, y)]
+    queries = []
+    for _ in range(count):
+        sx, sy = rng.choice(free)
+        gx, gy = rng.choice(free)
+        queries.append(((sx * tile, sy * tile), (gx * tile, gy * tile)))
+    return queries
+
+def time_queries(astar, queries, game_map):
+    """
+    Ejecuta las consultas y devuelve (segundos totales, caminos)
+    """
+    paths = []
+    begin = time.perf_counter()
+    for start, goal in queries:
+        paths.append(astar.find_path(start, goal, game_map))
+    return time.perf_counter() - begin, paths
+
+def run(sizes=((32, 24), (64, 48), (128, 96), (256, 192), (512, 512)),
+        queries_per_size=20, legacy_limit=128 * 96, seed=7):
+    """
+    Ejecuta el benchmark e imprime una tabla con los resultados
+    """
+    print(f"{'grid':>10} {'lista (ms)':>12} {'heap (ms)':>12} {'speedup':>9} {'iguales':>8}")
+    for width, height in sizes:
+        random.seed(seed)
+        game_map = GameMap(width, height)
+        queries = build_queries(game_map, queries_per_size, seed)
+        
+        heap_time, heap_paths = time_queries(AStar(mode="astar"), queries, game_map)
+        heap_ms = heap_time * 1000 / len(queries)
+        
+        if width * height <= legacy_limit:
+            list_time, list_paths = time_queries(ListAStar(), queries, game_map)
+            list_ms = list_time * 1000 / len(queries)
+            speedup = f"{list_time / heap_time:8.1f}x"
+            same = "sí" if list_paths == heap_paths else "NO"
+            list_col = f"{list_ms:12.2f}"
+        else:
+            speedup = "-".rjust(9)
+            same = "-"
+            list_col = "-".rjust(12)
+        
+        print(f"{width:>4}x{height:<5} {list_col} {heap_ms:12.2f} {speedup} {same:>8}")
+
+def run_flow_field(enemy_counts=(10, 100, 500), seed=7):
+    """
+    Compara N búsquedas A* hacia el jugador con un campo de flujo compartido
+    """
+    random.seed(seed)
+    game_map = GameMap()
+    queries = build_queries(game_map, max(enemy_counts) + 1, seed)
+    player = queries[0][1]
+    
+    print(f"{'enemigos':>10} {'A* (ms)':>12} {'flujo (ms)':>12}")
+    for count in enemy_counts:
+        starts = [start for start, _ in queries[1:count + 1]]
+        
+        astar = AStar(mode="astar")
+        begin = time.perf_counter()
+        for start in starts:
+            astar.find_path(start, player, game_map)
+        astar_ms = (time.perf_counter() - begin) * 1000
+        
+        flow_field = FlowField()
+        begin = time.perf_counter()
+        flow_field.update(player, game_map)
+        for start in starts:
+            flow_field.next_step(start)
+        flow_ms = (time.perf_counter() - begin) * 1000
+        
+        print(f"{count:>10} {astar_ms:12.2f} {flow_ms:12.2f}")
+
+def run_cache(distinct=3, repeats=100, seed=7):
+    """
+    Mide consultas repetidas (como las de patrulla) con y sin caché
+    """
+    random.seed(seed)
+    game_map = GameMap()
+    queries = build_queries(game_map, distinct, seed) * repeats
+    
+    plain_time, _ = time_queries(AStar(), queries, game_map)
+    cache = PathCache()
+    cached_time, _ = time_queries(AStar(cache), queries, game_map)
+    
+    print(f"{'consultas':>10} {'sin caché (us)':>15} {'con caché (us)':>15}")
+    print(f"{len(queries):>10} {plain_time * 1e6 / len(queries):15.1f} "
+          f"{cached_time * 1e6 / len(queries):15.1f}")
+    print(cache.get_stats())
+
+def run_jps(sizes=((64, 48), (256, 192)), densities=(0.0, 0.1, 0.25),
+            queries_per_map=20, seed=7):
+    """
+    Compara nodos expandidos y tiempo entre A* clásico y JPS
+    """
+    print(f"{'grid':>10} {'obst.':>6} {'nodos A*':>10} {'nodos JPS':>10} "
+          f"{'A* (ms)':>9} {'JPS (ms)':>9}")
+    for width, height in sizes:
+        for density in densities:
+            random.seed(seed)
+            game_map = GameMap(width, height, density)
+            queries = build_queries(game_map, queries_per_map, seed)
+            
+            results = []
+            for mode in ("astar", "jps"):
+                astar = AStar(mode=mode)
+                nodes = 0
+                begin = time.perf_counter()
+                for start, goal in queries:
+                    astar.find_path(start, goal, game_map)
+                    nodes += astar.nodes_expanded
+                elapsed = time.perf_counter() - begin
+                results.append((nodes / len(queries), elapsed * 1000 / len(queries)))
+            
+            (astar_nodes, astar_ms), (jps_nodes, jps_ms) = results
+            print(f"{width:>4}x{height:<5} {density:>6.0%} {astar_nodes:10.0f} {jps_nodes:10.0f} "
+                  f"{astar_ms:9.2f} {jps_ms:9.2f}")
+
+def path_cost(path):
+    """
+    Longitud de un camino en píxeles
+    """
+    return sum(math.dist(a, b) for a, b in zip(path, path[1:]))
+
+def run_hpa(sizes=((128, 128), (256, 256), (512, 512)), queries_per_map=10, seed=7):
+    """
+    Compara HPA* con el A* plano: construcción, consultas y calidad del camino
+    """
+    print(f"{'grid':>10} {'entradas (s)':>13} {'costos (s)':>11} {'A* (ms)':>9} "
+          f"{'HPA* (ms)':>10} {'costo':>7} {'casilla (ms)':>13}")
+    for width, height in sizes:
+        random.seed(seed)
+        game_map = GameMap(width, height)
+        queries = build_queries(game_map, queries_per_map, seed)
+        
+        begin = time.perf_counter()
+        planner = HierarchicalPlanner(game_map)
+        build_s = time.perf_counter() - begin
+        begin = time.perf_counter()
+        planner.precompute()
+        precompute_s = time.perf_counter() - begin
+        
+        flat_time, flat_paths = time_queries(AStar(mode="astar"), queries, game_map)
+        hpa_time, hpa_paths = time_queries(planner, queries, game_map)
+        ratios = [path_cost(h) / path_cost(f) for f, h in zip(flat_paths, hpa_paths)
+                  if f and path_cost(f) > 0]
+        
+        # Cambiar una casilla y volver a consultar: solo se reconstruyen sus clusters
+        x, y = width // 2, height // 2
+        begin = time.perf_counter()
+        game_map.set_tile(x, y, 1 - game_map.tiles[y][x])
+        planner.precompute()
+        tile_ms = (time.perf_counter() - begin) * 1000
+        
+        print(f"{width:>4}x{height:<5} {build_s:13.2f} {precompute_s:11.2f} "
+              f"{flat_time * 1000 / len(queries):9.2f} {hpa_time * 1000 / len(queries):10.2f} "
+              f"{sum(ratios) / max(1, len(ratios)):7.3f} {tile_ms:13.2f}")
+
+def run_dstar(sizes=((64, 64), (128, 128), (256, 256)), densities=(0.0, 0.1, 0.25),
+              steps=40, seed=7):
+    """
+    Persecución a lo largo del mapa: el objetivo da un paso y el perseguidor
+    vuelve a planificar en cada paso (A* desde cero contra D* Lite)
+    """
+    print(f"{'grid':>10} {'obst.':>6} {'nodos A*':>10} {'nodos D*':>10} "
+          f"{'A* (ms)':>9} {'D* (ms)':>9} {'reinicios':>10}")
+    for width, height in sizes:
+        for density in densities:
+            random.seed(seed)
+            game_map = GameMap(width, height, density)
+            tile = game_map.tile_size
+            rng = random.Random(seed)
+            game_map.set_tile(2, 2, 0)
+            game_map.set_tile(width - 3, height - 3, 0)
+            chaser = (2 * tile, 2 * tile)
+            target = ((width - 3) * tile, (height - 3) * tile)
+            
+            astar = AStar(mode="astar")
+            replanner = DStarLite()
+            astar_nodes = replanner_nodes = 0
+            astar_time = replanner_time = 0.0
+            for _ in range(steps):
+                # El objetivo se mueve a una casilla vecina
+                tx, ty = target[0] // tile, target[1] // tile
+                options = [(tx + dx, ty + dy) for dx, dy in AStar.DIRECTIONS
+                           if game_map.is_walkable(tx + dx, ty + dy)]
+                if options:
+                    x, y = rng.choice(options)
+                    target = (x * tile, y * tile)
+                
+                begin = time.perf_counter()
+                astar.find_path(chaser, target, game_map)
+                astar_time += time.perf_counter() - begin
+                astar_nodes += astar.nodes_expanded
+                
+                begin = time.perf_counter()
+                path = replanner.find_path(chaser, target, game_map)
+                replanner_time += time.perf_counter() - begin
+                replanner_nodes += replanner.nodes_expanded
+                
+                # El perseguidor avanza una casilla por su camino
+                if len(path) > 1:
+                    chaser = path[1]
+            
+            print(f"{width:>4}x{height:<5} {density:>6.0%} {astar_nodes:10d} {replanner_nodes:10d} "
+                  f"{astar_time * 1000:9.1f} {replanner_time * 1000:9.1f} {replanner.resets:10d}")
+
+def run_line_of_sight(enemy_counts=(10, 100, 500), densities=(0.1, 0.25), seed=7):
+    """
+    Compara la línea de vista original (píxel a píxel) con el DDA por casillas,
+    uno por uno y en lote, para N enemigos mirando al jugador
+    """
+    print(f"{'obst.':>6} {'enemigos':>9} {'píxeles (ms)':>13} {'DDA (ms)':>9} "
+          f"{'lote (ms)':>10} {'coinciden':>10}")
+    for density in densities:
+        random.seed(seed)
+        game_map = GameMap(obstacle_chance=density)
+        rng = random.Random(seed)
+        reference = ListAStar()
+        raycaster = Raycaster()
+        tile = game_map.tile_size
+        
+        def random_point():
+            # Un punto cualquiera dentro de una casilla libre
+            x, y = game_map.get_random_walkable_position()
+            return (x + rng.randrange(tile), y + rng.randrange(tile))
+        
+        player = random_point()
+        for count in enemy_counts:
+            enemies = [random_point() for _ in range(count)]
+            
+            begin = time.perf_counter()
+            expected = [reference.line_of_sight(enemy, player, game_map) for enemy in enemies]
+            pixel_ms = (time.perf_counter() - begin) * 1000
+            
+            begin = time.perf_counter()
+            single = [raycaster.line_of_sight(enemy, player, game_map) for enemy in enemies]
+            single_ms = (time.perf_counter() - begin) * 1000
+            
+            begin = time.perf_counter()
+            batch = raycaster.visible_from(enemies, player, game_map)
+            batch_ms = (time.perf_counter() - begin) * 1000
+            
+            assert single == batch
+            agree = sum(a == b for a, b in zip(expected, batch)) / count
+            print(f"{density:>6.0%} {count:9d} {pixel_ms:13.2f} {single_ms:9.2f} "
+                  f"{batch_ms:10.2f} {agree:10.1%}")
+        
+        # El jugador no choca con los obstáculos: parado sobre uno, el enemigo
+        # de la casilla libre de al lado lo sigue viendo (y al revés)
+        width = game_map.width
+        blocked = next(i for i, free in enumerate(game_map.walkable)
+                       if not free and i % width > 0 and game_map.walkable[i - 1])
+        target = ((blocked % width) * tile + tile // 2, (blocked // width) * tile + tile // 2)
+        neighbor = (target[0] - tile, target[1])
+        assert raycaster.line_of_sight(neighbor, target, game_map)
+        assert raycaster.visible_from([neighbor], target, game_map) == [True]
+        assert raycaster.line_of_sight(target, neighbor, game_map)
+        print(f"{density:>6.0%} jugador sobre un obstáculo: visible desde la casilla vecina")
+
+def run_unreachable(sizes=((64, 48), (256, 192)), densities=(0.1, 0.3), queries_per_map=20, seed=7):
+    """
+    Objetivos inalcanzables (obstáculos o zonas encerradas): A* inundando la
+    rejilla contra el rechazo inmediato por componentes conexas
+    """
+    print(f"{'grid':>10} {'obst.':>6} {'nodos sin comp.':>16} {'sin comp. (ms)':>15} "
+          f"{'con comp. (ms)':>15}")
+    for width, height in sizes:
+        for density in densities:
+            random.seed(seed)
+            game_map = GameMap(width, height, density)
+            rng = random.Random(seed)
+            tile = game_map.tile_size
+            start = max(game_map.component_sizes, key=game_map.component_sizes.get)
+            starts = [i for i, label in enumerate(game_map.components) if label == start]
+            others = [i for i, label in enumerate(game_map.components) if label != start]
+            queries = []
+            for _ in range(queries_per_map):
+                a, b = rng.choice(starts), rng.choice(others)
+                queries.append((((a % width) * tile, (a // width) * tile),
+                                ((b % width) * tile, (b // width) * tile)))
+            
+            # La misma rejilla sin información de componentes
+            plain = SimpleNamespace(width=width, height=height, walkable=game_map.walkable,
+                                    version=game_map.version)
+            astar = AStar(mode="astar")
+            nodes = 0
+            begin = time.perf_counter()
+            for a, b in queries:
+                astar.find_path(a, b, plain)
+                nodes += astar.nodes_expanded
+            plain_ms = (time.perf_counter() - begin) * 1000 / len(queries)
+            
+            snap = Config.PATHFINDING_SNAP_GOAL
+            Config.PATHFINDING_SNAP_GOAL = False
+            begin = time.perf_counter()
+            for a, b in queries:
+                assert astar.find_path(a, b, game_map) == []
+            indexed_ms = (time.perf_counter() - begin) * 1000 / len(queries)
+            Config.PATHFINDING_SNAP_GOAL = snap
+            
+            print(f"{width:>4}x{height:<5} {density:>6.0%} {nodes / len(queries):16.0f} "
+                  f"{plain_ms:15.2f} {indexed_ms:15.3f}")
+
+def build_walled_map(width, height, seed, spacing=6):
+    """
+    Mapa con muros horizontales de una sola abertura cada spacing filas
+    
+    Obliga a grandes desvíos, el caso donde la heurística euclidiana es peor.
+    """
+    random.seed(seed)
+    game_map = GameMap(width, height, 0.05)
+    rng = random.Random(seed)
+    for y in range(spacing - 2, height - 2, spacing):
+        gap = rng.randrange(width)
+        for x in range(width):
+            if abs(x - gap) > 1:
+                game_map.tiles[y][x] = 1
+    game_map.walkable = game_map.build_walkable_grid()
+    game_map.build_components()
+    return game_map
+
+def run_landmarks(sizes=((128, 96), (256, 192)), queries_per_map=20, seed=7):
+    """
+    Compara nodos expandidos y tiempo del A* con la heurística euclidiana y
+    con landmarks (ALT), más el costo de precalcular y guardar/cargar la tabla
+    """
+    print(f"{'mapa':>8} {'grid':>10} {'nodos eucl.':>12} {'nodos ALT':>10} {'eucl. (ms)':>11} "
+          f"{'ALT (ms)':>9} {'tabla (s)':>10} {'carga (ms)':>11} {'KB':>7}")
+    for width, height in sizes:
+        random.seed(seed)
+        layouts = (("aleatorio", GameMap(width, height, 0.25)),
+                   ("muros", build_walled_map(width, height, seed)))
+        for name, game_map in layouts:
+            queries = build_queries(game_map, queries_per_map, seed)
+            astar = AStar(mode="astar")
+            
+            results = []
+            for use_landmarks in (False, True):
+                if use_landmarks:
+                    begin = time.perf_counter()
+                    game_map.landmarks = LandmarkTable(game_map)
+                    build_s = time.perf_counter() - begin
+                nodes = 0
+                begin = time.perf_counter()
+                for start, goal in queries:
+                    astar.find_path(start, goal, game_map)
+                    nodes += astar.nodes_expanded
+                results.append((nodes / len(queries),
+                                (time.perf_counter() - begin) * 1000 / len(queries)))
+            
+            # Guardar y volver a cargar la tabla junto al mapa
+            path = os.path.join(tempfile.gettempdir(), "hv_landmarks.bin")
+            game_map.landmarks.save(path)
+            begin = time.perf_counter()
+            assert LandmarkTable.load(path, game_map) is not None
+            load_ms = (time.perf_counter() - begin) * 1000
+            size_kb = os.path.getsize(path) / 1024
+            os.remove(path)
+            
+            (plain_nodes, plain_ms), (alt_nodes, alt_ms) = results
+            print(f"{name:>8} {width:>4}x{height:<5} {plain_nodes:12.0f} {alt_nodes:10.0f} "
+                  f"{plain_ms:11.2f} {alt_ms:9.2f} {build_s:10.2f} {load_ms:11.2f} {size_kb:7.0f}")
+
+def run_theta(sizes=((64, 48), (256, 192)), densities=(0.0, 0.1, 0.25), queries_per_map=20, seed=7):
+    """
+    Compara el A* casilla por casilla con Lazy Theta*: nodos, tiempo, puntos
+    del camino y largo del camino
+    """
+    print(f"{'grid':>10} {'obst.':>6} {'nodos A*':>9} {'nodos θ*':>9} {'A* (ms)':>8} "
+          f"{'θ* (ms)':>8} {'puntos A*':>10} {'puntos θ*':>10} {'largo θ*/A*':>12}")
+    for width, height in sizes:
+        for density in densities:
+            random.seed(seed)
+            game_map = GameMap(width, height, density)
+            queries = build_queries(game_map, queries_per_map, seed)
+            
+            results = []
+            for mode in ("astar", "theta"):
+                astar = AStar(mode=mode)
+                nodes = 0
+                paths = []
+                begin = time.perf_counter()
+                for start, goal in queries:
+                    paths.append(astar.find_path(start, goal, game_map))
+                    nodes += astar.nodes_expanded
+                elapsed = (time.perf_counter() - begin) * 1000 / len(queries)
+                results.append((nodes / len(queries), elapsed, paths))
+            
+            (grid_nodes, grid_ms, grid_paths), (theta_nodes, theta_ms, theta_paths) = results
+            ratios = [path_cost(t) / path_cost(a) for a, t in zip(grid_paths, theta_paths)
+                      if a and path_cost(a) > 0]
+            grid_points = sum(len(path) for path in grid_paths) / len(queries)
+            theta_points = sum(len(path) for path in theta_paths) / len(queries)
+            print(f"{width:>4}x{height:<5} {density:>6.0%} {grid_nodes:9.0f} {theta_nodes:9.0f} "
+                  f"{grid_ms:8.2f} {theta_ms:8.2f} {grid_points:10.1f} {theta_points:10.1f} "
+                  f"{sum(ratios) / max(1, len(ratios)):12.3f}")
+
+def run_nav_mesh(sizes=((64, 48), (256, 192)), densities=(0.0, 0.05, 0.1, 0.25),
+                 queries_per_map=20, seed=7):
+    """
+    Compara la malla de navegación con el A* y con Lazy Theta*: tamaño de la
+    malla, nodos, tiempo por consulta, largo del camino y costo de cambiar
+    una casilla
+    """
+    print(f"{'grid':>10} {'obst.':>6} {'rect.':>6} {'malla (ms)':>11} {'nodos A*':>9} "
+          f"{'nodos malla':>12} {'A* (ms)':>8} {'θ* (ms)':>8} {'malla (ms)':>11} "
+          f"{'largo/A*':>9} {'largo/θ*':>9} {'casilla (ms)':>13}")
+    for width, height in sizes:
+        for density in densities:
+            random.seed(seed)
+            game_map = GameMap(width, height, density)
+            queries = build_queries(game_map, queries_per_map, seed)
+            
+            begin = time.perf_counter()
+            mesh = NavMesh(game_map)
+            build_ms = (time.perf_counter() - begin) * 1000
+            
+            results = []
+            for planner in (AStar(mode="astar"), AStar(mode="theta"), mesh):
+                nodes = 0
+                paths = []
+                begin = time.perf_counter()
+                for start, goal in queries:
+                    paths.append(planner.find_path(start, goal, game_map))
+                    nodes += planner.nodes_expanded
+                elapsed = (time.perf_counter() - begin) * 1000 / len(queries)
+                results.append((nodes / len(queries), elapsed, paths))
+            
+            (grid_nodes, grid_ms, grid_paths), (_, theta_ms, theta_paths), \
+                (mesh_nodes, mesh_ms, mesh_paths) = results
+            ratios = []
+            for reference in (grid_paths, theta_paths):
+                values = [path_cost(m) / path_cost(r) for r, m in zip(reference, mesh_paths)
+                          if r and path_cost(r) > 0]
+                ratios.append(sum(values) / max(1, len(values)))
+            
+            # Cambiar una casilla: solo se rehacen los rectángulos de alrededor
+            x, y = width // 2, height // 2
+            begin = time.perf_counter()
+            game_map.set_tile(x, y, 1 - game_map.tiles[y][x])
+            tile_ms = (time.perf_counter() - begin) * 1000
+            
+            print(f"{width:>4}x{height:<5} {density:>6.0%} {mesh.get_stats()['rects']:6d} "
+                  f"{build_ms:11.2f} {grid_nodes:9.0f} {mesh_nodes:12.0f} {grid_ms:8.2f} "
+                  f"{theta_ms:8.2f} {mesh_ms:11.2f} {ratios[0]:9.3f} {ratios[1]:9.3f} "
+                  f"{tile_ms:13.2f}")
+
+def run_cooperative(chaser_counts=(50, 100, 200), size=(64, 48), density=0.1, steps=60, seed=7):
+    """
+    Persecución por pasos de casilla: cada perseguidor toma el siguiente paso
+    del campo de flujo o del planificador cooperativo (WHCA*). Se mide el
+    tiempo por paso y cuántos enemigos terminan apilados en la misma casilla
+    """
+    print(f"{'enemigos':>9} {'modo':>7} {'ms/paso':>8} {'us/enemigo':>11} "
+          f"{'apilados':>9} {'máx. casilla':>13} {'replans':>8} {'esperas':>8}")
+    gs = Config.TILE_SIZE
+    for count in chaser_counts:
+        random.seed(seed)
+        game_map = GameMap(size[0], size[1], density)
+        width = game_map.width
+        rng = random.Random(seed)
+        free = [index for index, label in enumerate(game_map.components)
+                if label != -1 and game_map.component_sizes[label] == max(game_map.component_sizes.values())]
+        goal = rng.choice(free)
+        starts = [rng.choice(free) for _ in range(count)]
+        
+        for mode in ("flujo", "WHCA*"):
+            field = FlowField()
+            field.update(((goal % width) * gs, (goal // width) * gs), game_map)
+            planner = CooperativePlanner(field) if mode == "WHCA*" else None
+            agents = [object() for _ in range(count)]
+            positions = [((index % width) * gs, (index // width) * gs) for index in starts]
+            
+            stacked = 0
+            worst = 0
+            elapsed = 0.0
+            for _ in range(steps):
+                begin = time.perf_counter()
+                if planner:
+                    planner.update(planner.step_time)
+                    moves = [planner.next_step(agent, position, game_map)
+                             for agent, position in zip(agents, positions)]
+                else:
+                    moves = [field.next_step(position) for position in positions]
+                elapsed += time.perf_counter() - begin
+                positions = [move or position for move, position in zip(moves, positions)]
+                
+                # Enemigos de más en casillas ocupadas por varios
+                occupancy = {}
+                for position in positions:
+                    occupancy[position] = occupancy.get(position, 0) + 1
+                stacked += len(positions) - len(occupancy)
+                worst = max(worst, max(occupancy.values()))
+            
+            stats = planner.get_stats() if planner else {'replans': 0, 'waits': 0}
+            print(f"{count:>9} {mode:>7} {elapsed * 1000 / steps:8.2f} "
+                  f"{elapsed * 1e6 / steps / count:11.1f} {stacked / steps:9.1f} {worst:13d} "
+                  f"{stats['replans']:8d} {stats['waits']:8d}")
+
+if __name__ == "__main__":
+    run()
+    print()
+    run_flow_field()
+    print()
+    run_cache()
+    print()
+    run_jps()
+    print()
+    run_hpa()
+    print()
+    run_dstar()
+    print()
+    run_line_of_sight()
+    print()
+    run_unreachable()
+    print()
+    run_landmarks()
+    print()
+    run_theta()
+    print()
+    run_nav_mesh()
+    print()
+    run_cooperative()
\ No newline at end of file
@@ -0,0 +1,219 @@
+# Suite de regresión del pathfinding - HV Warriors
+# Autor: Hensly Manuel Vidal Rosario
+# Matrícula: 23-MISN-2-007
+
+"""
+Ejecuta un conjunto fijo de consultas sobre mapas generados con semilla
+(varios tamaños y densidades de obstáculos) y guarda en JSON, por motor y
+mapa, los nodos expandidos, el largo de los caminos y la latencia p50/p99
+por consulta. Si se indica un resultado anterior se comparan ambos y se
+reportan las métricas que empeoraron más que el umbral.
+
+No abre ninguna ventana, así que se puede correr sin pantalla.
+
+Uso:
+    python -m scripts.pathfinding_regression --output resultados.json
+    python -m scripts.pathfinding_regression --baseline anterior.json --threshold 0.15
+"""
+
+import os
+
+# Sin pantalla ni audio: solo se usa la lógica del mapa
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+from scripts.astar import AStar
+from scripts.hierarchical import HierarchicalPlanner
+from scripts.nav_mesh import NavMesh
+from scripts.game_map import GameMap
+from scripts.pathfinding_benchmark import build_queries, path_cost
+
+# Configuración por defecto de la suite
+DEFAULT_SIZES = ((32, 24), (64, 48), (128, 96), (256, 192))
+DEFAULT_DENSITIES = (0.0, 0.1, 0.25)
+DEFAULT_ENGINES = AStar.MODES + ("hpa", "navmesh")
+DEFAULT_QUERIES = 25
+DEFAULT_REPEATS = 3
+DEFAULT_SEED = 7
+DEFAULT_THRESHOLD = 0.10
+
+# Métricas que se comparan entre ejecuciones (mayor = peor)
+COMPARED_METRICS = ("p50_ms", "p99_ms", "nodes_expanded", "path_length")
+
+def build_map(width, height, density, seed):
+    """
+    Genera un GameMap reproducible
+    """
+    random.seed(seed)
+    return GameMap(width, height, density)
+
+def create_engine(name, game_map):
+    """
+    Crea el motor de pathfinding indicado ("astar", "jps", "theta", "hpa" o "navmesh")
+    """
+    if name == "hpa":
+        planner = HierarchicalPlanner(game_map)
+        planner.precompute()
+        return planner
+    if name == "navmesh":
+        return NavMesh(game_map)
+    return AStar(mode=name)
+
+def percentile(values, percent):
+    """
+    Percentil por rango más cercano
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def measure(engine, queries, game_map, repeats):
+    """
+    Ejecuta las consultas y devuelve sus métricas
+    """
+    latencies = []
+    nodes = 0
+    length = 0.0
+    found = 0
+    
+    for start, goal in queries:
+        # La latencia de la consulta es la mejor de las repeticiones (menos ruido)
+        best = math.inf
+        for _ in range(repeats):
+            begin = time.perf_counter()
+            path = engine.find_path(start, goal, game_map)
+            best = min(best, (time.perf_counter() - begin) * 1000)
+        latencies.append(best)
+        
+        # Los nodos y el camino son deterministas: se cuentan una sola vez
+        nodes += engine.nodes_expanded
+        if path:
+            found += 1
+            length += path_cost(path)
+    
+    return {
+        'queries': len(queries),
+        'found': found,
+        'nodes_expanded': nodes / len(queries),
+        'path_length': length / max(1, found),
+        'p50_ms': percentile(latencies, 50),
+        'p99_ms': percentile(latencies, 99),
+        'mean_ms': sum(latencies) / len(latencies)
+    }
+
+def result_key(engine, width, height, density):
+    """
+    Clave de un caso en el JSON de resultados
+    """
+    return f"{engine}:{width}x{height}:{density:g}"
+
+def run_suite(sizes=DEFAULT_SIZES, densities=DEFAULT_DENSITIES, engines=DEFAULT_ENGINES,
+              queries=DEFAULT_QUERIES, repeats=DEFAULT_REPEATS, seed=DEFAULT_SEED, log=print):
+    """
+    Ejecuta todos los casos y devuelve los resultados listos para guardar en JSON
+    """
+    results = {}
+    for width, height in sizes:
+        for density in densities:
+            game_map = build_map(width, height, density, seed)
+            query_set = build_queries(game_map, queries, seed)
+            for name in engines:
+                metrics = measure(create_engine(name, game_map), query_set, game_map, repeats)
+                key = result_key(name, width, height, density)
+                results[key] = metrics
+                if log:
+                    log(f"{key:>22} nodos {metrics['nodes_expanded']:9.0f}  "
+                        f"p50 {metrics['p50_ms']:8.2f} ms  p99 {metrics['p99_ms']:8.2f} ms")
+    
+    return {
+        'meta': {
+            'seed': seed,
+            'queries': queries,
+            'repeats': repeats,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        'results': results
+    }
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compara dos ejecuciones y devuelve las regresiones
+    
+    Cada regresión es (caso, métrica, valor anterior, valor actual, cambio
+    relativo). Solo se comparan los casos presentes en ambas.
+    """
+    regressions = []
+    for key, metrics in current['results'].items():
+        previous = baseline['results'].get(key)
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = previous.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else (math.inf if new > old else 0.0)
+            if change > threshold:
+                regressions.append((key, metric, old, new, change))
+    return regressions
+
+def parse_sizes(text):
+    """
+    Convierte "64x48,128x96" en ((64, 48), (128, 96))
+    """
+    return tuple(tuple(int(value) for value in size.split("x")) for size in text.split(","))
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos. Retorna 1 si hubo regresiones
+    """
+    parser = argparse.ArgumentParser(description="Suite de regresión del pathfinding")
+    parser.add_argument("--output", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="empeoramiento relativo tolerado (0.10 = 10%%)")
+    parser.add_argument("--sizes", type=parse_sizes, default=DEFAULT_SIZES,
+                        help="tamaños de mapa, p. ej. 64x48,256x192")
+    parser.add_argument("--densities", type=lambda text: tuple(float(v) for v in text.split(",")),
+                        default=DEFAULT_DENSITIES, help="densidades de obstáculos, p. ej. 0,0.1")
+    parser.add_argument("--engines", type=lambda text: tuple(text.split(",")),
+                        default=DEFAULT_ENGINES, help="motores: astar, jps, theta, hpa, navmesh")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+    
+    current = run_suite(args.sizes, args.densities, args.engines, args.queries,
+                        args.repeats, args.seed)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+        print(f"Resultados guardados en {args.output}")
+    
+    if not args.baseline:
+        return 0
+    
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    regressions = compare(current, baseline, args.threshold)
+    if not regressions:
+        print(f"Sin regresiones (umbral {args.threshold:.0%})")
+        return 0
+    
+    print(f"Regresiones (umbral {args.threshold:.0%}):")
+    for key, metric, old, new, change in regressions:
+        print(f"  {key:>22} {metric:>15}: {old:.3f} -> {new:.3f} ({change:+.1%})")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -45,6 +45,8 @@ def main():
             if game_state == "MENU":
                 action = menu.handle_event(event)
                 if action == "START":
+                    if game:
+                        game.shutdown()
                     game = Game(screen)
                     game_state = "PLAYING"
                 elif action == "QUIT":
@@ -75,6 +77,7 @@ def main():
             if game:
                 action = game.show_game_over()
                 if action == "RESTART":
+                    game.shutdown()
                     game = Game(screen)
                     game_state = "PLAYING"
                 elif action == "MENU":
@@ -82,6 +85,8 @@ def main():
         
         pygame.display.flip()
     
+    if game:
+        game.shutdown()
     pygame.quit()
     sys.exit()
 